@@ -0,0 +1,364 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Creates the schema as it stood before migrations were introduced, spelled out
+here rather than derived from the models so that replaying history always
+builds the same tables. Tables that already exist are left alone, which makes
+this a no-op for their definitions on databases bootstrapped with
+create_all(); the columns and indexes added to the models since then are
+applied separately and idempotently, so those databases catch up too:
+
+- users.phone_hash, the HMAC lookup key for phone numbers
+- territories.path, the materialized hierarchy path, backfilled from parent_id
+- votes.tallied and the partial index over votes not yet folded into totals
+- the (created_at, id) keyset pagination indexes and the territory_id indexes
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum types as created by SQLAlchemy, which stores member names.
+ENUMS = {
+    "userrole": ("UNVERIFIED", "GEDER", "SUPPORTER"),
+    "userstatus": ("PASSIVE", "ACTIVE"),
+    "endorsementstatus": ("PENDING", "APPROVED", "REJECTED", "REVOKED"),
+    "territorytype": ("ELECTORAL_DISTRICT", "REGION", "MUNICIPALITY"),
+    "groupstatus": ("FORMING", "ACTIVE", "INACTIVE"),
+    "electiontype": ("ATISTAVI", "ORMOTSDAATISTAVI", "ASISTAVI", "ATASISTAVI", "PARLIAMENTARY"),
+    "electionscopetype": ("ATEULI", "ORMOTSDAATEULI", "ASEULI", "ATASEULI", "NATIONAL"),
+    "electionstatus": ("SCHEDULED", "ACTIVE", "COMPLETED", "CANCELLED"),
+    "sosstatus": ("PENDING", "VERIFIED", "ESCALATED", "RESOLVED", "REJECTED"),
+    "sospriority": ("LOW", "NORMAL", "HIGH", "CRITICAL"),
+    "hierarchylevel": ("ATEULI", "ORMOTSDAATEULI", "ASEULI", "ATASEULI", "MEDIA"),
+    "initiativecategory": ("EDUCATION", "INFRASTRUCTURE", "SOCIAL", "ECONOMIC", "OTHER"),
+    "initiativestatus": ("DRAFT", "ACTIVE", "ACHIEVED", "ASSIGNED", "COMPLETED", "REJECTED"),
+    "arbitrationstatus": ("PENDING", "ASSIGNED", "IN_PROGRESS", "RESOLVED", "APPEALED"),
+}
+
+TABLES = (
+    "territories",
+    "users",
+    "ataseulis",
+    "aseulis",
+    "ormotsdaateulis",
+    "ateulis",
+    "ged_verifications",
+    "device_fingerprints",
+    "endorsements",
+    "elections",
+    "election_candidates",
+    "votes",
+    "sos_signals",
+    "sos_escalations",
+    "initiatives",
+    "initiative_supports",
+    "arbitration_cases",
+    "audit_logs",
+    "notifications",
+)
+
+BACKFILL_TERRITORY_PATHS = """
+WITH RECURSIVE tree (id, path) AS (
+    SELECT id, '/' || id || '/' FROM territories WHERE parent_id IS NULL
+    UNION ALL
+    SELECT t.id, tree.path || t.id || '/'
+    FROM territories t JOIN tree ON t.parent_id = tree.id
+)
+UPDATE territories SET path = tree.path
+FROM tree
+WHERE territories.id = tree.id AND territories.path IS NULL
+"""
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_territories_path "
+    "ON territories (path text_pattern_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_territory_id ON users (territory_id)",
+    "CREATE INDEX IF NOT EXISTS ix_ateulis_territory_id ON ateulis (territory_id)",
+    "CREATE INDEX IF NOT EXISTS idx_votes_untallied "
+    "ON votes (election_id, candidate_id) WHERE NOT tallied",
+    "CREATE INDEX IF NOT EXISTS idx_elections_created_at_id ON elections (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_sos_signals_created_at_id ON sos_signals (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_initiatives_created_at_id ON initiatives (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_arbitration_cases_created_at_id "
+    "ON arbitration_cases (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at_id ON audit_logs (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_user_created_at_id "
+    "ON notifications (user_id, created_at, id)",
+)
+
+
+def _enum(name: str) -> postgresql.ENUM:
+    return postgresql.ENUM(*ENUMS[name], name=name, create_type=False)
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _fk(column: str, target: str, nullable: bool = True, **kwargs) -> sa.Column:
+    return sa.Column(
+        column, postgresql.UUID(as_uuid=True), sa.ForeignKey(f"{target}.id"),
+        nullable=nullable, **kwargs,
+    )
+
+
+def _group_columns(*columns: sa.Column) -> list[sa.Column]:
+    return [
+        sa.Column("name", sa.String(200), nullable=True),
+        _fk("territory_id", "territories", nullable=False),
+        *columns,
+        sa.Column("member_count", sa.Integer(), nullable=True),
+        sa.Column("status", _enum("groupstatus"), nullable=False),
+    ]
+
+
+def _create_baseline_tables(existing: set[str]) -> None:
+    def create_table(name: str, *columns, **kwargs) -> None:
+        if name not in existing:
+            op.create_table(name, *_base_columns(), *columns, **kwargs)
+
+    create_table(
+        "territories",
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("name_en", sa.String(200), nullable=True),
+        sa.Column("type", _enum("territorytype"), nullable=False),
+        _fk("parent_id", "territories"),
+        sa.Column("code", sa.String(50), unique=True, nullable=True),
+    )
+    create_table(
+        "users",
+        sa.Column("phone_number", sa.String(20), unique=True, nullable=False),
+        sa.Column("phone_verified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("personal_id_hash", sa.String(255), unique=True, nullable=False),
+        sa.Column("role", _enum("userrole"), nullable=False),
+        sa.Column("status", _enum("userstatus"), nullable=True),
+        sa.Column("is_diaspora", sa.Boolean(), nullable=True),
+        _fk("territory_id", "territories"),
+        # References ateulis, which references users; the key is added below.
+        sa.Column("ateuli_id", postgresql.UUID(as_uuid=True), nullable=True),
+        _fk("tavdebi_id", "users"),
+        sa.Column("constitution_agreed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("onboarding_completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("onboarding_motivation", sa.Text(), nullable=True),
+    )
+    create_table(
+        "ataseulis",
+        *_group_columns(
+            _fk("atasistavi_id", "users"),
+            sa.Column("aseuli_count", sa.Integer(), nullable=True),
+        ),
+        sa.Column("budget_amount", sa.Numeric(15, 2), nullable=True),
+    )
+    create_table(
+        "aseulis",
+        *_group_columns(
+            _fk("asistavi_id", "users"),
+            _fk("ataseuli_id", "ataseulis"),
+            sa.Column("ormotsdaateuli_count", sa.Integer(), nullable=True),
+        ),
+    )
+    create_table(
+        "ormotsdaateulis",
+        *_group_columns(
+            _fk("leader_id", "users"),
+            _fk("aseuli_id", "aseulis"),
+            sa.Column("ateuli_count", sa.Integer(), nullable=True),
+        ),
+    )
+    create_table(
+        "ateulis",
+        *_group_columns(
+            _fk("atistavi_id", "users"),
+            _fk("ormotsdaateuli_id", "ormotsdaateulis"),
+        ),
+    )
+    if "users" not in existing:
+        op.create_foreign_key("users_ateuli_id_fkey", "users", "ateulis", ["ateuli_id"], ["id"])
+
+    create_table(
+        "ged_verifications",
+        _fk("user_id", "users", nullable=False, unique=True),
+        sa.Column("ged_number", sa.String(50), unique=True, nullable=False),
+        sa.Column("verified_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("verified_by", sa.String(100), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    create_table(
+        "device_fingerprints",
+        _fk("user_id", "users", nullable=False),
+        sa.Column("fingerprint_hash", sa.String(255), nullable=False),
+        sa.Column("device_type", sa.String(50), nullable=True),
+        sa.Column("device_model", sa.String(100), nullable=True),
+        sa.Column("os_version", sa.String(50), nullable=True),
+        sa.Column("app_version", sa.String(50), nullable=True),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_blocked", sa.Boolean(), nullable=True),
+    )
+    create_table(
+        "endorsements",
+        _fk("geder_id", "users", nullable=False),
+        _fk("supporter_id", "users", nullable=False, unique=True),
+        sa.Column("status", _enum("endorsementstatus"), nullable=False),
+        sa.Column("requested_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("approved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("revocation_reason", sa.Text(), nullable=True),
+        sa.Column("penalty_applied", sa.Boolean(), nullable=True),
+    )
+    create_table(
+        "elections",
+        sa.Column("election_type", _enum("electiontype"), nullable=False),
+        sa.Column("scope_type", _enum("electionscopetype"), nullable=False),
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("title", sa.String(300), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("starts_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ends_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", _enum("electionstatus"), nullable=False),
+        _fk("winner_id", "users"),
+        sa.Column("total_votes", sa.Integer(), nullable=True),
+    )
+    create_table(
+        "election_candidates",
+        _fk("election_id", "elections", nullable=False),
+        _fk("user_id", "users", nullable=False),
+        sa.Column("statement", sa.Text(), nullable=True),
+        sa.Column("vote_count", sa.Integer(), nullable=True),
+        sa.Column("registered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("election_id", "user_id", name="unique_candidate_per_election"),
+    )
+    create_table(
+        "votes",
+        _fk("election_id", "elections", nullable=False),
+        _fk("voter_id", "users", nullable=False),
+        _fk("candidate_id", "election_candidates", nullable=False),
+        sa.Column("vote_hash", sa.String(255), nullable=False),
+        sa.Column("cast_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("election_id", "voter_id", name="unique_vote_per_election"),
+    )
+    create_table(
+        "sos_signals",
+        _fk("reporter_id", "users", nullable=False),
+        sa.Column("title", sa.String(300), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("location", sa.String(300), nullable=True),
+        sa.Column("moral_filter_response", sa.Text(), nullable=False),
+        sa.Column("status", _enum("sosstatus"), nullable=False),
+        sa.Column("priority", _enum("sospriority"), nullable=False),
+        _fk("verifier_id", "users"),
+        sa.Column("verified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("verification_notes", sa.Text(), nullable=True),
+        sa.Column("current_level", _enum("hierarchylevel"), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    create_table(
+        "sos_escalations",
+        _fk("signal_id", "sos_signals", nullable=False),
+        sa.Column("from_level", _enum("hierarchylevel"), nullable=False),
+        sa.Column("to_level", _enum("hierarchylevel"), nullable=False),
+        _fk("escalated_by_id", "users", nullable=False),
+        sa.Column("escalated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+    )
+    create_table(
+        "initiatives",
+        _fk("creator_id", "users", nullable=False),
+        sa.Column("title", sa.String(300), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("category", _enum("initiativecategory"), nullable=False),
+        sa.Column("scope_type", _enum("electionscopetype"), nullable=False),
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("target_support", sa.Integer(), nullable=False),
+        sa.Column("current_support", sa.Integer(), nullable=True),
+        sa.Column("status", _enum("initiativestatus"), nullable=False),
+        _fk("assigned_to_id", "users"),
+        sa.Column("assigned_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    create_table(
+        "initiative_supports",
+        _fk("initiative_id", "initiatives", nullable=False),
+        _fk("supporter_id", "users", nullable=False),
+        sa.Column("comment", sa.Text(), nullable=True),
+        sa.Column("supported_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("initiative_id", "supporter_id", name="unique_support_per_initiative"),
+    )
+    create_table(
+        "arbitration_cases",
+        sa.Column("case_number", sa.String(50), unique=True, nullable=False),
+        _fk("plaintiff_id", "users", nullable=False),
+        _fk("defendant_id", "users", nullable=False),
+        _fk("arbitrator_id", "users"),
+        sa.Column("title", sa.String(300), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("status", _enum("arbitrationstatus"), nullable=False),
+        sa.Column("resolution", sa.Text(), nullable=True),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    create_table(
+        "audit_logs",
+        _fk("user_id", "users"),
+        sa.Column("action", sa.String(100), nullable=False),
+        sa.Column("entity_type", sa.String(100), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("old_values", sa.JSON(), nullable=True),
+        sa.Column("new_values", sa.JSON(), nullable=True),
+        sa.Column("ip_address", postgresql.INET(), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+    )
+    create_table(
+        "notifications",
+        _fk("user_id", "users", nullable=False),
+        sa.Column("type", sa.String(100), nullable=False),
+        sa.Column("title", sa.String(300), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def upgrade() -> None:
+    for name, values in ENUMS.items():
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(
+            f"DO $$ BEGIN CREATE TYPE {name} AS ENUM ({labels}); "
+            "EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+        )
+    _create_baseline_tables(set(sa.inspect(op.get_bind()).get_table_names()))
+
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS phone_hash VARCHAR(255) UNIQUE")
+
+    op.execute("ALTER TABLE territories ADD COLUMN IF NOT EXISTS path TEXT")
+    op.execute(BACKFILL_TERRITORY_PATHS)
+    op.execute("ALTER TABLE territories ALTER COLUMN path SET NOT NULL")
+
+    # Votes cast before folding existed were never added to vote_count, so
+    # they start out untallied and the folder counts them.
+    op.execute("ALTER TABLE votes ADD COLUMN IF NOT EXISTS tallied BOOLEAN NOT NULL DEFAULT false")
+
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+    for name in ENUMS:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
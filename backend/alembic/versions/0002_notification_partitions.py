@@ -0,0 +1,132 @@
+"""monthly partitions for notifications
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Turns notifications into a table range-partitioned by month on created_at and
+installs ensure_notification_partitions(months_ahead, since), which creates any
+missing monthly partition from the month of `since` up to `months_ahead`
+months from now. The application calls it at startup and then periodically
+(see app.services.notifications.run_partition_maintainer), so partitions always
+exist ahead of the rows that need them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, created_at, updated_at, deleted_at, user_id, type, title, message, data, read_at"
+
+# created_at is the partition key, so it has to be part of the primary key.
+CREATE_PARTITIONED = """
+CREATE TABLE notifications (
+    id UUID NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    deleted_at TIMESTAMPTZ,
+    user_id UUID NOT NULL REFERENCES users (id),
+    type VARCHAR(100) NOT NULL,
+    title VARCHAR(300) NOT NULL,
+    message TEXT NOT NULL,
+    data JSON,
+    read_at TIMESTAMPTZ,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at)
+"""
+
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION ensure_notification_partitions(
+    months_ahead integer DEFAULT 3,
+    since timestamptz DEFAULT now()
+) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    lower_bound timestamptz := date_trunc('month', since AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    last_bound timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        + make_interval(months => months_ahead);
+    upper_bound timestamptz;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE lower_bound <= last_bound LOOP
+        upper_bound := lower_bound + interval '1 month';
+        partition_name := 'notifications_' || to_char(lower_bound AT TIME ZONE 'UTC', 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                partition_name, lower_bound, upper_bound
+            );
+            created := created + 1;
+        END IF;
+        lower_bound := upper_bound;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_notifications_user_created_at_id "
+    "ON notifications (user_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_unread "
+    "ON notifications (user_id) WHERE read_at IS NULL",
+)
+
+
+def _is_partitioned(bind) -> bool:
+    return bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = to_regclass('notifications'))"
+    )).scalar()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.execute(ENSURE_PARTITIONS)
+
+    if _is_partitioned(bind):
+        op.execute(f"SELECT ensure_notification_partitions({MONTHS_AHEAD})")
+        return
+
+    # Existing plain table: move its rows into a partitioned copy.
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    op.execute(
+        "ALTER TABLE notifications_unpartitioned "
+        "RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey"
+    )
+    op.execute("DROP INDEX IF EXISTS idx_notifications_user_created_at_id")
+    op.execute("DROP INDEX IF EXISTS idx_notifications_unread")
+    op.execute(CREATE_PARTITIONED)
+    for statement in INDEXES:
+        op.execute(statement)
+
+    op.execute(
+        "SELECT ensure_notification_partitions("
+        f"{MONTHS_AHEAD}, COALESCE((SELECT min(created_at) FROM notifications_unpartitioned), now()))"
+    )
+    op.execute(
+        f"INSERT INTO notifications ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM notifications_unpartitioned"
+    )
+    op.execute("DROP TABLE notifications_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("CREATE TABLE notifications (LIKE notifications_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO notifications SELECT * FROM notifications_partitioned")
+    op.execute("DROP TABLE notifications_partitioned")
+    op.execute("ALTER TABLE notifications ADD PRIMARY KEY (id)")
+    op.execute("ALTER TABLE notifications ADD FOREIGN KEY (user_id) REFERENCES users (id)")
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute("DROP FUNCTION IF EXISTS ensure_notification_partitions(integer, timestamptz)")
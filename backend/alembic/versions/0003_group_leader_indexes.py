@@ -0,0 +1,36 @@
+"""indexes on group leader columns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+Lets authentication check whether a user leads any group with four index
+probes, for the leader rate-limit tier.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEADER_COLUMNS = (
+    ("ateulis", "atistavi_id"),
+    ("ormotsdaateulis", "leader_id"),
+    ("aseulis", "asistavi_id"),
+    ("ataseulis", "atasistavi_id"),
+)
+
+
+def upgrade() -> None:
+    for table, column in LEADER_COLUMNS:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})")
+
+
+def downgrade() -> None:
+    for table, column in LEADER_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
@@ -0,0 +1,42 @@
+"""user name search
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+Adds users.full_name and its normalized form users.search_name, with a
+text_pattern_ops index for prefix matches and a pg_trgm GIN index for
+substring and similarity matches. The trigram index lives here rather than
+on the model because it needs the pg_trgm extension.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS full_name VARCHAR(200)")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS search_name TEXT")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_search_name_prefix "
+        "ON users (search_name text_pattern_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_search_name_trgm "
+        "ON users USING gin (search_name gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_users_search_name_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_users_search_name_prefix")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS search_name")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS full_name")
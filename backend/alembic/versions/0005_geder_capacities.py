@@ -0,0 +1,82 @@
+"""per-GeDer endorsement capacity
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+Adds geder_capacities, the maintained count of places each GeDer has left,
+with partial indexes for listing available GeDers by remaining capacity or
+in random order, and backfills it from the endorsements table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS geder_capacities (
+            id UUID PRIMARY KEY,
+            geder_id UUID NOT NULL UNIQUE REFERENCES users (id),
+            territory_id UUID REFERENCES territories (id),
+            approved_count INTEGER NOT NULL DEFAULT 0,
+            pending_count INTEGER NOT NULL DEFAULT 0,
+            remaining INTEGER NOT NULL,
+            penalized BOOLEAN NOT NULL DEFAULT false,
+            sample_key DOUBLE PRECISION NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            deleted_at TIMESTAMPTZ
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_geder_capacities_territory_remaining "
+        "ON geder_capacities (territory_id, remaining) WHERE NOT penalized"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_geder_capacities_territory_sample "
+        "ON geder_capacities (territory_id, sample_key) "
+        "WHERE NOT penalized AND remaining > 0"
+    )
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO geder_capacities (
+                id, geder_id, territory_id, approved_count, pending_count,
+                remaining, penalized, sample_key
+            )
+            SELECT
+                gen_random_uuid(), u.id, u.territory_id,
+                coalesce(e.approved, 0), coalesce(e.pending, 0),
+                greatest(0, :limit - coalesce(e.approved, 0) - coalesce(e.pending, 0)),
+                coalesce(e.penalized, false), random()
+            FROM users u
+            LEFT JOIN (
+                SELECT
+                    geder_id,
+                    count(*) FILTER (WHERE status = 'APPROVED') AS approved,
+                    count(*) FILTER (WHERE status = 'PENDING') AS pending,
+                    bool_or(penalty_applied) AS penalized
+                FROM endorsements
+                GROUP BY geder_id
+            ) e ON e.geder_id = u.id
+            WHERE u.role = 'GEDER'
+            ON CONFLICT (geder_id) DO NOTHING
+            """
+        ).bindparams(limit=settings.ENDORSEMENT_LIMIT_PER_GEDER)
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS geder_capacities")
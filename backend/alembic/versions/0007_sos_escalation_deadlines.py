@@ -0,0 +1,63 @@
+"""SOS escalation deadlines
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+Adds sos_signals.escalate_at with a partial index over the signals that
+still have a deadline, which the escalation scheduler loads instead of
+sweeping the table, and backfills it for open signals from their last
+escalation (or creation) and priority. Escalations made by the scheduler
+have no user, so escalated_by_id becomes nullable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE sos_signals ADD COLUMN IF NOT EXISTS escalate_at TIMESTAMPTZ")
+    op.execute("ALTER TABLE sos_escalations ALTER COLUMN escalated_by_id DROP NOT NULL")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sos_signals_escalate_at ON sos_signals (escalate_at) "
+        "WHERE escalate_at IS NOT NULL"
+    )
+    op.execute(
+        sa.text(
+            """
+            UPDATE sos_signals s
+            SET escalate_at = coalesce(
+                (SELECT max(e.escalated_at) FROM sos_escalations e WHERE e.signal_id = s.id),
+                s.created_at
+            ) + make_interval(secs => CASE s.priority
+                WHEN 'CRITICAL' THEN :critical
+                WHEN 'HIGH' THEN :high
+                WHEN 'NORMAL' THEN :normal
+                ELSE :low
+            END)
+            WHERE s.escalate_at IS NULL
+              AND s.deleted_at IS NULL
+              AND s.status IN ('PENDING', 'VERIFIED', 'ESCALATED')
+              AND s.current_level <> 'MEDIA'
+            """
+        ).bindparams(
+            critical=settings.SOS_ESCALATE_CRITICAL_SECONDS,
+            high=settings.SOS_ESCALATE_HIGH_SECONDS,
+            normal=settings.SOS_ESCALATE_NORMAL_SECONDS,
+            low=settings.SOS_ESCALATE_LOW_SECONDS,
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_sos_signals_escalate_at")
+    op.execute("ALTER TABLE sos_signals DROP COLUMN IF EXISTS escalate_at")
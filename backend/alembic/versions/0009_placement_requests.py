@@ -0,0 +1,39 @@
+"""queue for Ateuli placement
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+Adds users.placement_requested_at, set by POST /ateulis/placement, and
+narrows idx_users_unplaced to the queued users: the placement job no longer
+places everyone without an Ateuli, so members who left a group stay out.
+Nobody is queued by this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS placement_requested_at TIMESTAMPTZ")
+    op.execute("DROP INDEX IF EXISTS idx_users_unplaced")
+    op.execute(
+        "CREATE INDEX idx_users_unplaced ON users (territory_id, id) "
+        "WHERE placement_requested_at IS NOT NULL AND ateuli_id IS NULL AND deleted_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_users_unplaced")
+    op.execute(
+        "CREATE INDEX idx_users_unplaced ON users (territory_id, id) "
+        "WHERE ateuli_id IS NULL AND deleted_at IS NULL"
+    )
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS placement_requested_at")
@@ -15,8 +15,10 @@ from app.api.v1 import (
     notifications,
     statistics
 )
+from app.core.serialization import FastJSONResponse
 
-api_router = APIRouter()
+# Handlers that return plain data are encoded with orjson too.
+api_router = APIRouter(default_response_class=FastJSONResponse)
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
@@ -1,17 +1,22 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import CursorParams, paginate
+from app.core.serialization import FastJSONResponse, columns
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.models.arbitration import ArbitrationCase
+from app.schemas import ArbitrationCaseOut, Page
 
 router = APIRouter()
 
 @router.post("/")
 async def create_case(
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -20,23 +25,24 @@ async def create_case(
     # TODO: Implement logic
     return {"id": "new_id"}
 
-@router.get("/")
+@router.get("/", response_model=Page[ArbitrationCaseOut])
 async def read_cases(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    page: CursorParams = Depends()
 ) -> Any:
     """
     Retrieve arbitration cases.
     """
-    # TODO: Implement logic
-    return []
+    query = select(*columns(ArbitrationCaseOut, ArbitrationCase)).where(
+        ArbitrationCase.deleted_at.is_(None)
+    )
+    return FastJSONResponse(await paginate(db, query, ArbitrationCase, page))
 
 @router.post("/{case_id}/resolve")
 async def resolve_case(
     case_id: str,
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
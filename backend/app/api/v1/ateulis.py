@@ -1,17 +1,22 @@
+import uuid
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import audit_sink
 from app.core.database import get_db
+from app.core.principal import Principal, invalidate_principal
 from app.dependencies import get_current_user, get_current_geder
 from app.models.user import User
+from app.services import group_counters, placement
+from app.services.leaderboard import leaderboards
 
 router = APIRouter()
 
 @router.post("/")
 async def create_ateuli(
     data: dict,
-    current_user: User = Depends(get_current_geder),
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -20,10 +25,32 @@ async def create_ateuli(
     # TODO: Implement logic
     return {"id": "new_id"}
 
+@router.post("/placement")
+async def request_placement(
+    request: Request,
+    current_user: Principal = Depends(get_current_geder),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Ask to be placed into an Ateuli of your territory by the placement job.
+    """
+    user = await db.get(User, current_user.id, with_for_update=True)
+    if user is None:
+        # Deleted while its principal was still cached
+        raise HTTPException(status_code=404, detail="User not found")
+    if not await placement.request_placement(db, user):
+        raise HTTPException(status_code=400, detail="Already member of group")
+    await db.commit()
+    await audit_sink.record(
+        "ateuli.placement_requested", "user", entity_id=user.id, user_id=user.id,
+        request=request,
+    )
+    return {"status": "queued"}
+
 @router.get("/{ateuli_id}")
 async def read_ateuli(
     ateuli_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -34,32 +61,77 @@ async def read_ateuli(
 
 @router.post("/{ateuli_id}/join")
 async def join_ateuli(
-    ateuli_id: str,
-    current_user: User = Depends(get_current_geder),
+    ateuli_id: uuid.UUID,
+    request: Request,
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Join an ateuli.
     """
-    # TODO: Implement logic
-    return {"status": "joined"}
+    user = await db.get(User, current_user.id, with_for_update=True)
+    if user is None:
+        # Deleted while its principal was still cached
+        raise HTTPException(status_code=404, detail="User not found")
+    if user.ateuli_id is not None:
+        raise HTTPException(status_code=400, detail="Already member of group")
+
+    try:
+        member_count = await group_counters.apply_member_delta(db, ateuli_id, 1)
+    except group_counters.GroupNotFoundError:
+        raise HTTPException(status_code=404, detail="Ateuli not found")
+    except group_counters.GroupFullError:
+        raise HTTPException(status_code=400, detail="Group is full")
+
+    user.ateuli_id = ateuli_id
+    user.placement_requested_at = None
+    await db.commit()
+    await invalidate_principal(user.id)
+    await leaderboards.record_members(db, ateuli_id, 1)
+    await audit_sink.record(
+        "ateuli.join", "user", entity_id=user.id, user_id=user.id,
+        old_values={"ateuli_id": None}, new_values={"ateuli_id": str(ateuli_id)},
+        request=request,
+    )
+    return {"status": "joined", "member_count": member_count}
 
 @router.post("/{ateuli_id}/leave")
 async def leave_ateuli(
-    ateuli_id: str,
-    current_user: User = Depends(get_current_geder),
+    ateuli_id: uuid.UUID,
+    request: Request,
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Leave an ateuli.
     """
-    # TODO: Implement logic
-    return {"status": "left"}
+    user = await db.get(User, current_user.id, with_for_update=True)
+    if user is None:
+        # Deleted while its principal was still cached
+        raise HTTPException(status_code=404, detail="User not found")
+    if user.ateuli_id != ateuli_id:
+        raise HTTPException(status_code=400, detail="Not a member of this group")
+
+    try:
+        member_count = await group_counters.apply_member_delta(db, ateuli_id, -1)
+    except group_counters.GroupNotFoundError:
+        raise HTTPException(status_code=404, detail="Ateuli not found")
+
+    user.ateuli_id = None
+    await db.commit()
+    await invalidate_principal(user.id)
+    await leaderboards.record_members(db, ateuli_id, -1)
+    await audit_sink.record(
+        "ateuli.leave", "user", entity_id=user.id, user_id=user.id,
+        old_values={"ateuli_id": str(ateuli_id)}, new_values={"ateuli_id": None},
+        request=request,
+    )
+    return {"status": "left", "member_count": member_count}
 
 @router.get("/{ateuli_id}/members")
 async def read_ateuli_members(
     ateuli_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
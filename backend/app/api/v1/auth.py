@@ -1,16 +1,35 @@
+import uuid
+from datetime import datetime, timezone
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from jose import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.database import get_db
 from app.core import security
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.rate_limit import HOUR, RateLimit, limit_route
+from app.core.principal import Principal
+from app.core.revocation import revocations
+from app.dependencies import get_current_user, reusable_oauth2
+from app.schemas import LogoutIn, RefreshTokenIn, TokenPair
+from app.services import refresh_tokens, user_lookup
 
 router = APIRouter()
 
-@router.post("/send-verification-code")
+def _phone_key(request: Request) -> str:
+    # Keyed by the lookup digest so raw phone numbers never reach the store.
+    return security.hash_phone_number(request.query_params.get("phone_number", ""))
+
+@router.post(
+    "/send-verification-code",
+    dependencies=[Depends(limit_route(
+        "verification_code",
+        RateLimit(settings.RATE_LIMIT_VERIFICATION_CODES_PER_HOUR, HOUR),
+        _phone_key,
+    ))],
+)
 async def send_verification_code(
     phone_number: str,
     db: AsyncSession = Depends(get_db)
@@ -21,7 +40,7 @@ async def send_verification_code(
     # TODO: Implement SMS gateway integration
     return {"message": "Verification code sent"}
 
-@router.post("/verify-phone")
+@router.post("/verify-phone", response_model=TokenPair)
 async def verify_phone(
     phone_number: str,
     code: str,
@@ -31,36 +50,59 @@ async def verify_phone(
     Verify phone number with code and return JWT tokens.
     """
     # TODO: Validate code
-    # TODO: Create or update user
-    # TODO: Generate tokens
-    return {
-        "access_token": "token",
-        "refresh_token": "refresh_token",
-        "token_type": "bearer"
-    }
+    user = await user_lookup.get_user_by_phone(db, phone_number)
+    if user is None:
+        # TODO: Create user
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await user_lookup.upgrade_lookup_hashes(user, phone_number)
 
-@router.post("/refresh")
+    tokens = await refresh_tokens.issue(db, user.id)
+    await db.commit()
+    return TokenPair(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
+
+@router.post("/refresh", response_model=TokenPair)
 async def refresh_token(
-    refresh_token: str,
+    data: RefreshTokenIn,
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
-    Refresh access token using refresh token.
+    Exchange a refresh token for a new access and refresh token.
+
+    Each refresh token works once. Presenting one again ends the session
+    it belongs to, since someone else holds a copy.
     """
-    # TODO: Validate refresh token
-    # TODO: Generate new access token
-    return {
-        "access_token": "new_token",
-        "token_type": "bearer"
-    }
+    try:
+        tokens = await refresh_tokens.rotate(db, data.refresh_token)
+    except refresh_tokens.InvalidRefreshTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+    except refresh_tokens.RefreshTokenReuseError as exc:
+        await db.commit()
+        await revocations.revoke([exc.family_id], datetime.now(timezone.utc))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reused; session revoked"
+        )
+    await db.commit()
+    return TokenPair(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
 
 @router.post("/logout")
 async def logout(
-    current_user: User = Depends(get_current_user),
+    data: LogoutIn = LogoutIn(),
+    current_user: Principal = Depends(get_current_user),
+    token: str = Depends(reusable_oauth2),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
-    Logout user (invalidate refresh token).
+    Logout user: revoke this session's tokens, or every session's.
     """
-    # TODO: Invalidate refresh token
+    if data.all_sessions:
+        families = await refresh_tokens.revoke_user(db, current_user.id)
+    else:
+        # Already verified by get_current_user
+        family = jwt.get_unverified_claims(token).get("fam")
+        families = await refresh_tokens.revoke_family(db, uuid.UUID(family)) if family else []
+    await db.commit()
+    await revocations.revoke(families, datetime.now(timezone.utc))
     return {"message": "Logged out successfully"}
@@ -1,29 +1,39 @@
+import uuid
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.audit import audit_sink
+from app.core.database import get_db, get_read_db
+from app.core.pagination import CursorParams, paginate
+from app.core.serialization import FastJSONResponse, columns
+from app.core.http_cache import etag_matches
 from app.dependencies import get_current_user, get_current_active_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.models.election import Election
+from app.schemas import CastVoteOut, ElectionOut, Page
+from app.services import election_results, vote_tally
 
 router = APIRouter()
 
-@router.get("/")
+@router.get("/", response_model=Page[ElectionOut])
 async def read_elections(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    page: CursorParams = Depends()
 ) -> Any:
     """
     Retrieve elections.
     """
-    # TODO: Implement logic
-    return []
+    query = select(*columns(ElectionOut, Election)).where(
+        Election.deleted_at.is_(None)
+    )
+    return FastJSONResponse(await paginate(db, query, Election, page))
 
 @router.get("/{election_id}")
 async def read_election(
     election_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get election by ID.
@@ -35,7 +45,7 @@ async def read_election(
 async def register_candidate(
     election_id: str,
     statement: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -44,26 +54,58 @@ async def register_candidate(
     # TODO: Implement logic
     return {"status": "registered"}
 
-@router.post("/{election_id}/vote")
+@router.post("/{election_id}/vote", response_model=CastVoteOut)
 async def cast_vote(
-    election_id: str,
-    candidate_id: str,
-    current_user: User = Depends(get_current_user),
+    election_id: uuid.UUID,
+    candidate_id: uuid.UUID,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Cast a vote in an election.
     """
-    # TODO: Implement logic
-    return {"status": "voted"}
+    try:
+        vote = await vote_tally.cast_vote(db, election_id, candidate_id, current_user.id)
+    except vote_tally.CandidateNotFoundError:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    except vote_tally.ElectionNotActiveError:
+        raise HTTPException(status_code=400, detail="Election not active")
+    except vote_tally.NotEligibleError:
+        raise HTTPException(status_code=403, detail="Not eligible to vote in this election")
+    except vote_tally.AlreadyVotedError:
+        raise HTTPException(status_code=400, detail="Already voted in election")
+    await db.commit()
+
+    # The ballot itself stays out of the audit trail.
+    await audit_sink.record(
+        "election.vote", "election", entity_id=election_id, user_id=current_user.id,
+        request=request,
+    )
+    return {
+        "vote": {
+            "id": vote.id,
+            "election_id": vote.election_id,
+            "vote_hash": vote.vote_hash,
+            "cast_at": vote.cast_at,
+        }
+    }
 
 @router.get("/{election_id}/results")
 async def read_election_results(
-    election_id: str,
-    db: AsyncSession = Depends(get_db)
+    election_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get election results.
     """
-    # TODO: Implement logic
-    return {"results": []}
+    try:
+        snapshot = await election_results.get_snapshot(db, election_id)
+    except vote_tally.ElectionNotFoundError:
+        raise HTTPException(status_code=404, detail="Election not found")
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": snapshot.cache_control}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -1,39 +1,59 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.dependencies import get_current_user, get_current_geder
-from app.models.user import User
+from app.core.principal import Principal, invalidate_principal
+from app.core.serialization import FastJSONResponse
+from app.schemas import (
+    AvailableGeDer,
+    EndorsementRequested,
+    EndorsementRequestIn,
+    EndorsementRevokeIn,
+)
+from app.services import endorsements
+from app.services.leaderboard import leaderboards
+from app.utils.enums import LeaderboardMetric
 
 router = APIRouter()
 
-@router.get("/available-geders")
+@router.get("/available-geders", response_model=List[AvailableGeDer])
 async def read_available_geders(
-    territory_id: str = None,
-    db: AsyncSession = Depends(get_db)
+    territory_id: Optional[uuid.UUID] = None,
+    limit: int = Query(20, ge=1, le=100),
+    sample: bool = Query(False, description="Random GeDers instead of those with the most room"),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
-    Get list of GeDers available for endorsement.
+    Get list of GeDers available for endorsement. Without a territory,
+    diaspora GeDers are listed.
     """
-    # TODO: Implement logic
-    return []
+    geders = await endorsements.available_geders(db, territory_id, limit, sample)
+    return FastJSONResponse(geders)
 
-@router.post("/request")
+@router.post("/request", response_model=EndorsementRequested)
 async def request_endorsement(
-    data: dict,
-    current_user: User = Depends(get_current_user),
+    data: EndorsementRequestIn,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Request endorsement from a GeDer.
     """
-    # TODO: Implement logic
-    return {"status": "pending"}
+    try:
+        endorsement = await endorsements.request_endorsement(db, current_user.id, data.geder_id)
+    except endorsements.AlreadyEndorsedError:
+        raise HTTPException(status_code=400, detail="Endorsement already requested")
+    except endorsements.GeDerUnavailableError:
+        raise HTTPException(status_code=400, detail="GeDer is not available for endorsement")
+    await db.commit()
+    return {"id": endorsement.id, "status": endorsement.status}
 
 @router.get("/my-requests")
 async def read_my_requests(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -44,7 +64,7 @@ async def read_my_requests(
 
 @router.get("/pending-approvals")
 async def read_pending_approvals(
-    current_user: User = Depends(get_current_geder),
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -55,36 +75,77 @@ async def read_pending_approvals(
 
 @router.post("/{endorsement_id}/approve")
 async def approve_endorsement(
-    endorsement_id: str,
-    current_user: User = Depends(get_current_geder),
+    endorsement_id: uuid.UUID,
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Approve an endorsement request.
     """
-    # TODO: Implement logic
+    try:
+        endorsement, recruited = await endorsements.approve_endorsement(
+            db, endorsement_id, current_user.id
+        )
+    except endorsements.EndorsementNotFoundError:
+        raise HTTPException(status_code=404, detail="Endorsement not found")
+    except endorsements.InvalidEndorsementStateError:
+        raise HTTPException(status_code=400, detail="Endorsement cannot be approved")
+    await db.commit()
+    await invalidate_principal(endorsement.supporter_id)
+    await leaderboards.record_user(
+        db, LeaderboardMetric.ENDORSEMENTS, current_user.id, current_user.territory_id
+    )
+    if recruited:
+        await leaderboards.record_user(
+            db, LeaderboardMetric.MEMBERS_RECRUITED, current_user.id, current_user.territory_id
+        )
     return {"status": "approved"}
 
 @router.post("/{endorsement_id}/reject")
 async def reject_endorsement(
-    endorsement_id: str,
-    current_user: User = Depends(get_current_geder),
+    endorsement_id: uuid.UUID,
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Reject an endorsement request.
     """
-    # TODO: Implement logic
+    try:
+        await endorsements.reject_endorsement(
+            db, endorsement_id, current_user.id
+        )
+    except endorsements.EndorsementNotFoundError:
+        raise HTTPException(status_code=404, detail="Endorsement not found")
+    except endorsements.InvalidEndorsementStateError:
+        raise HTTPException(status_code=400, detail="Endorsement cannot be rejected")
+    await db.commit()
     return {"status": "rejected"}
 
 @router.post("/{endorsement_id}/revoke")
 async def revoke_endorsement(
-    endorsement_id: str,
-    current_user: User = Depends(get_current_geder),
+    endorsement_id: uuid.UUID,
+    data: Optional[EndorsementRevokeIn] = None,
+    current_user: Principal = Depends(get_current_geder),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Revoke an existing endorsement.
     """
-    # TODO: Implement logic
+    try:
+        endorsement, dropped = await endorsements.revoke_endorsement(
+            db, endorsement_id, current_user.id, reason=data.reason if data else None
+        )
+    except endorsements.EndorsementNotFoundError:
+        raise HTTPException(status_code=404, detail="Endorsement not found")
+    except endorsements.InvalidEndorsementStateError:
+        raise HTTPException(status_code=400, detail="Endorsement cannot be revoked")
+    await db.commit()
+    await invalidate_principal(endorsement.supporter_id)
+    await leaderboards.record_user(
+        db, LeaderboardMetric.ENDORSEMENTS, current_user.id, current_user.territory_id, -1
+    )
+    if dropped:
+        await leaderboards.record_user(
+            db, LeaderboardMetric.MEMBERS_RECRUITED, current_user.id, current_user.territory_id, -1
+        )
     return {"status": "revoked"}
@@ -0,0 +1,82 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import ReadSessionLocal
+from app.core.hub import BROADCAST_TOPIC, group_topic, hub, territory_topic, user_topic
+from app.core.principal import Principal
+from app.dependencies import authenticate
+from app.services.group_counters import chain_ids
+from app.services.territories import territory_snapshot
+from app.utils.enums import HierarchyLevel
+
+router = APIRouter()
+
+GROUP_LEVELS = (
+    HierarchyLevel.ATEULI,
+    HierarchyLevel.ORMOTSDAATEULI,
+    HierarchyLevel.ASEULI,
+    HierarchyLevel.ATASEULI,
+)
+
+
+async def connection_topics(db: AsyncSession, principal: Principal) -> list[str]:
+    """
+    Topics a user hears: their own, their territory and its ancestors, and
+    each group they belong to up the hierarchy.
+    """
+    topics = [BROADCAST_TOPIC, user_topic(principal.id)]
+    if principal.territory_id is not None:
+        snapshot = await territory_snapshot.get(db)
+        topics.append(territory_topic(principal.territory_id))
+        topics.extend(territory_topic(t.id) for t in snapshot.ancestors(principal.territory_id))
+    if principal.ateuli_id is not None:
+        chain = await chain_ids(db, principal.ateuli_id)
+        if chain is not None:
+            topics.extend(
+                group_topic(level, group_id)
+                for level, group_id in zip(GROUP_LEVELS, chain)
+                if group_id is not None
+            )
+    return topics
+
+
+@router.websocket("/ws")
+async def event_stream(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+):
+    """
+    Push `election.started`, `sos.new_signal`,
+    `initiative.support_threshold_reached` and `notification.new` events.
+
+    The token is checked once, on connect, and may be passed as `?token=` or
+    in the Authorization header.
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if token is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    # A short-lived session: an open one per socket would pin a pooled
+    # connection for the socket's whole lifetime.
+    async with ReadSessionLocal() as db:
+        try:
+            principal = await authenticate(db, token)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        topics = await connection_topics(db, principal)
+
+    await websocket.accept()
+    connection = hub.subscribe(websocket, principal.id, topics)
+    try:
+        while True:
+            # Clients have nothing to say; reading only notices disconnects.
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(connection)
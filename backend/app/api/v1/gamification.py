@@ -1,30 +1,74 @@
-from typing import Any
-from fastapi import APIRouter, Depends
+import uuid
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.serialization import FastJSONResponse
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.schemas import Leaderboard, Progress
+from app.services.leaderboard import group_board, leaderboards, names, user_board
+from app.utils.enums import HierarchyLevel, LeaderboardMetric
 
 router = APIRouter()
 
-@router.get("/progress")
+@router.get("/progress", response_model=Progress)
 async def read_progress(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Get user/group progress and gamification stats.
     """
-    # TODO: Implement logic
-    return {"level": 1}
+    neighbors = settings.LEADERBOARD_NEIGHBORS
+    rankings = {}
+    for metric in LeaderboardMetric:
+        rankings[metric.value] = {
+            "national": await leaderboards.standing(user_board(metric), current_user.id, neighbors),
+            "territory": (
+                await leaderboards.standing(
+                    user_board(metric, current_user.territory_id), current_user.id, neighbors
+                )
+                if current_user.territory_id is not None else None
+            ),
+        }
+    group = None
+    if current_user.ateuli_id is not None:
+        group = await leaderboards.standing(
+            group_board(HierarchyLevel.ATEULI), current_user.ateuli_id, neighbors
+        )
+        await names(db, group["neighbors"], HierarchyLevel.ATEULI)
 
-@router.get("/leaderboard")
+    await names(
+        db,
+        (e for r in rankings.values() for s in r.values() if s for e in s["neighbors"]),
+        None,
+    )
+    return FastJSONResponse({"rankings": rankings, "group": group})
+
+@router.get("/leaderboard", response_model=Leaderboard)
 async def read_leaderboard(
-    db: AsyncSession = Depends(get_db)
+    metric: LeaderboardMetric = LeaderboardMetric.ENDORSEMENTS,
+    level: Optional[HierarchyLevel] = Query(
+        None, description="Rank groups of this level by members instead of users by `metric`"
+    ),
+    territory_id: Optional[uuid.UUID] = None,
+    limit: int = Query(20, ge=1, le=settings.LEADERBOARD_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get leaderboard.
     """
-    # TODO: Implement logic
-    return []
+    if level is None:
+        key = user_board(metric, territory_id)
+    else:
+        key = group_board(level, territory_id)
+    entries = await leaderboards.top(key, offset, limit)
+    await names(db, entries, level)
+    return FastJSONResponse({
+        "entries": entries,
+        "total": await leaderboards.store.size(key),
+    })
@@ -2,15 +2,15 @@ from typing import Any, List
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 @router.get("/overview")
 async def read_hierarchy_overview(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get hierarchy overview statistics.
@@ -20,7 +20,7 @@ async def read_hierarchy_overview(
 
 @router.get("/my-position")
 async def read_my_position(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -1,17 +1,33 @@
+import uuid
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.config import settings
+from app.core.audit import audit_sink
+from app.core.database import get_db, get_read_db
+from app.core.hub import hub
+from app.core.pagination import CursorParams, paginate
+from app.core.serialization import FastJSONResponse, columns
+from app.core.rate_limit import DAY, RateLimit, limit_user
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.models.initiative import Initiative
+from app.schemas import InitiativeOut, InitiativeSupported, InitiativeSupportIn, Page
+from app.services import initiative_support
+from app.services.leaderboard import leaderboards
+from app.utils.enums import LeaderboardMetric
 
 router = APIRouter()
 
-@router.post("/")
+@router.post(
+    "/",
+    dependencies=[Depends(limit_user("initiative", RateLimit(settings.RATE_LIMIT_INITIATIVES_PER_DAY, DAY)))],
+)
 async def create_initiative(
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -20,35 +36,69 @@ async def create_initiative(
     # TODO: Implement logic
     return {"id": "new_id"}
 
-@router.get("/")
+@router.get("/", response_model=Page[InitiativeOut])
 async def read_initiatives(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    page: CursorParams = Depends()
 ) -> Any:
     """
     Retrieve initiatives.
     """
-    # TODO: Implement logic
-    return []
+    query = select(*columns(InitiativeOut, Initiative)).where(
+        Initiative.deleted_at.is_(None)
+    )
+    return FastJSONResponse(await paginate(db, query, Initiative, page))
 
-@router.post("/{initiative_id}/support")
+@router.post("/{initiative_id}/support", response_model=InitiativeSupported)
 async def support_initiative(
-    initiative_id: str,
-    current_user: User = Depends(get_current_user),
+    initiative_id: uuid.UUID,
+    request: Request,
+    data: InitiativeSupportIn = InitiativeSupportIn(),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Support an initiative.
     """
-    # TODO: Implement logic
-    return {"status": "supported"}
+    try:
+        result = await initiative_support.support_initiative(
+            db, initiative_id, current_user.id, data.comment
+        )
+    except initiative_support.InitiativeNotFoundError:
+        raise HTTPException(status_code=404, detail="Initiative not found")
+    except initiative_support.InitiativeClosedError:
+        raise HTTPException(status_code=400, detail="Initiative is not accepting support")
+    except initiative_support.AlreadySupportedError:
+        raise HTTPException(status_code=400, detail="Already supported this initiative")
+    await db.commit()
+
+    if result.threshold_reached:
+        event = initiative_support.threshold_event(result)
+        for topic in initiative_support.threshold_topics(result):
+            await hub.publish(topic, initiative_support.THRESHOLD_EVENT, event)
+    await leaderboards.record_user(
+        db, LeaderboardMetric.INITIATIVES_SUPPORTED, current_user.id, current_user.territory_id
+    )
+    await audit_sink.record(
+        "initiative.support", "initiative", entity_id=initiative_id, user_id=current_user.id,
+        request=request,
+    )
+    return FastJSONResponse({
+        "initiative": {
+            "id": result.initiative_id,
+            "current_support": result.current_support,
+            "target_support": result.target_support,
+            "progress_percentage": result.progress_percentage,
+            "status": result.status,
+        },
+        "support": {"id": result.support_id, "supported_at": result.supported_at},
+    })
 
 @router.post("/{initiative_id}/assign")
 async def assign_initiative(
     initiative_id: str,
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -1,33 +1,41 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.pagination import CursorParams, paginate
+from app.core.serialization import FastJSONResponse, columns
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.models.audit import Notification
+from app.schemas import NotificationOut, Page
+from app.services import notifications
 
 router = APIRouter()
 
-@router.get("/")
+@router.get("/", response_model=Page[NotificationOut])
 async def read_notifications(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    page: CursorParams = Depends()
 ) -> Any:
     """
     Get user notifications.
     """
-    # TODO: Implement logic
-    return []
+    query = select(*columns(NotificationOut, Notification)).where(
+        Notification.user_id == current_user.id,
+        Notification.deleted_at.is_(None),
+    )
+    return FastJSONResponse(await paginate(db, query, Notification, page))
 
 @router.post("/mark-all-read")
 async def mark_all_read(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Mark all notifications as read.
     """
-    # TODO: Implement logic
-    return {"status": "success"}
+    marked = await notifications.mark_all_read(db, current_user.id)
+    return {"status": "success", "marked": marked}
@@ -1,42 +1,66 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.hub import group_topic, hub
+from app.core.pagination import CursorParams, paginate
+from app.core.serialization import FastJSONResponse, columns
+from app.core.rate_limit import DAY, RateLimit, limit_user
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.models.sos import SOSSignal
+from app.schemas import SOSSignalIn, SOSSignalOut, Page
+from app.services import sos
+from app.services.sos_escalation import escalation_scheduler, signal_event
+from app.utils.enums import HierarchyLevel
 
 router = APIRouter()
 
-@router.post("/")
+@router.post(
+    "/",
+    dependencies=[Depends(limit_user("sos_signal", RateLimit(settings.RATE_LIMIT_SOS_PER_DAY, DAY)))],
+)
 async def create_signal(
-    data: dict,
-    current_user: User = Depends(get_current_user),
+    data: SOSSignalIn,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Create a new SOS signal.
     """
-    # TODO: Implement logic
-    return {"id": "new_id"}
+    signal = await sos.create_signal(db, current_user.id, data)
+    await db.commit()
+    if signal.escalate_at is not None:
+        escalation_scheduler.schedule(signal.id, signal.escalate_at, signal.priority)
+    if current_user.ateuli_id is not None:
+        await hub.publish(
+            group_topic(HierarchyLevel.ATEULI, current_user.ateuli_id),
+            "sos.new_signal",
+            signal_event(signal, escalated=False),
+        )
+    return {"id": signal.id, "status": signal.status}
 
-@router.get("/")
+@router.get("/", response_model=Page[SOSSignalOut])
 async def read_signals(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    page: CursorParams = Depends()
 ) -> Any:
     """
     Retrieve SOS signals.
     """
-    # TODO: Implement logic
-    return []
+    query = select(*columns(SOSSignalOut, SOSSignal)).where(
+        SOSSignal.deleted_at.is_(None)
+    )
+    return FastJSONResponse(await paginate(db, query, SOSSignal, page))
 
 @router.post("/{signal_id}/verify")
 async def verify_signal(
     signal_id: str,
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -49,7 +73,7 @@ async def verify_signal(
 async def escalate_signal(
     signal_id: str,
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
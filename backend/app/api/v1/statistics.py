@@ -2,13 +2,20 @@ from typing import Any
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.config import settings
+from app.core.database import get_read_db
+from app.core.http_cache import http_cache, time_window
 
 router = APIRouter()
 
 @router.get("/platform")
+@http_cache(
+    settings.HTTP_CACHE_STATISTICS_SECONDS,
+    time_window(settings.HTTP_CACHE_STATISTICS_SECONDS),
+    server_cache=True,
+)
 async def read_platform_stats(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get global platform statistics.
@@ -1,54 +1,112 @@
+import uuid
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.dependencies import get_current_user
+from app.config import settings
+from app.core.database import get_read_db
+from app.core.http_cache import http_cache, time_window
+from app.core.pagination import CursorParams, decode_cursor, encode_cursor, page_meta
+from app.core.serialization import FastJSONResponse, columns, row_dicts
+from app.models.group import Ateuli
 from app.models.user import User
+from app.schemas import AteuliOut, Page, TerritoryDetail, TerritoryOut, TerritoryStatistics
+from app.services.territories import territory_snapshot
 
 router = APIRouter()
 
-@router.get("/")
+async def _tree_version(db: AsyncSession) -> str:
+    return (await territory_snapshot.get(db)).revision
+
+@router.get("/", response_model=Page[TerritoryOut])
+@http_cache(settings.HTTP_CACHE_TERRITORIES_SECONDS, _tree_version, server_cache=True)
 async def read_territories(
-    db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_read_db),
+    page: CursorParams = Depends()
 ) -> Any:
     """
     Retrieve territories.
     """
-    # TODO: Implement logic
-    return []
+    snapshot = await territory_snapshot.get(db)
+    # Territories are paged by their materialized path, the snapshot's sort key.
+    after = decode_cursor(page.cursor)[0] if page.cursor else None
+    nodes = snapshot.page_after(after, page.per_page + 1)
+
+    next_cursor = None
+    if len(nodes) > page.per_page:
+        nodes = nodes[:page.per_page]
+        next_cursor = encode_cursor((nodes[-1].path,))
+    total = len(snapshot.ordered) if page.include_total else None
+    return FastJSONResponse({
+        "items": [node.dict() for node in nodes],
+        "meta": page_meta(page, next_cursor, total),
+    })
 
-@router.get("/{territory_id}")
+@router.get("/{territory_id}", response_model=TerritoryDetail)
+@http_cache(settings.HTTP_CACHE_TERRITORIES_SECONDS, _tree_version, server_cache=True)
 async def read_territory(
-    territory_id: str,
-    db: AsyncSession = Depends(get_db)
+    territory_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get territory by ID.
     """
-    # TODO: Implement logic
-    return {"id": territory_id}
+    snapshot = await territory_snapshot.get(db)
+    node = snapshot.get(territory_id)
+    if node is None:
+        raise HTTPException(status_code=404, detail="Territory not found")
+    return FastJSONResponse({
+        **node.dict(),
+        "ancestors": [a.dict() for a in snapshot.ancestors(territory_id)],
+        "children": [snapshot.get(c).dict() for c in node.children],
+    })
 
-@router.get("/{territory_id}/ateulis")
+@router.get("/{territory_id}/ateulis", response_model=List[AteuliOut])
 async def read_territory_ateulis(
-    territory_id: str,
-    db: AsyncSession = Depends(get_db)
+    territory_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get ateulis in territory.
     """
-    # TODO: Implement logic
-    return []
+    snapshot = await territory_snapshot.get(db)
+    territory_ids = snapshot.subtree_ids(territory_id)
+    if not territory_ids:
+        raise HTTPException(status_code=404, detail="Territory not found")
 
-@router.get("/{territory_id}/statistics")
+    result = await db.execute(
+        select(*columns(AteuliOut, Ateuli)).where(Ateuli.territory_id.in_(territory_ids))
+    )
+    return FastJSONResponse(row_dicts(result))
+
+@router.get("/{territory_id}/statistics", response_model=TerritoryStatistics)
+@http_cache(
+    settings.HTTP_CACHE_STATISTICS_SECONDS,
+    time_window(settings.HTTP_CACHE_STATISTICS_SECONDS),
+    server_cache=True,
+)
 async def read_territory_statistics(
-    territory_id: str,
-    db: AsyncSession = Depends(get_db)
+    territory_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Get territory statistics.
     """
-    # TODO: Implement logic
-    return {}
+    snapshot = await territory_snapshot.get(db)
+    territory_ids = snapshot.subtree_ids(territory_id)
+    if not territory_ids:
+        raise HTTPException(status_code=404, detail="Territory not found")
+
+    users = await db.scalar(
+        select(func.count()).select_from(User).where(User.territory_id.in_(territory_ids))
+    )
+    ateulis = await db.scalar(
+        select(func.count()).select_from(Ateuli).where(Ateuli.territory_id.in_(territory_ids))
+    )
+    return {
+        "territory_id": territory_id,
+        "territories": len(territory_ids),
+        "users": users,
+        "ateulis": ateulis,
+    }
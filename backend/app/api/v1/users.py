@@ -1,38 +1,61 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.http_cache import http_cache
+from app.core.principal import Principal
+from app.core.serialization import FastJSONResponse, columns
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.schemas import UserProfile, UserSearchResult
+from app.services import user_search
 
 router = APIRouter()
 
-@router.get("/me")
+async def _profile(db: AsyncSession, user_id: uuid.UUID) -> FastJSONResponse:
+    result = await db.execute(
+        select(*columns(UserProfile, User)).where(User.id == user_id)
+    )
+    user = result.first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return FastJSONResponse(user._asdict())
+
+async def _profile_version(current_user: Principal, db: AsyncSession) -> Optional[str]:
+    updated_at = await db.scalar(select(User.updated_at).where(User.id == current_user.id))
+    return None if updated_at is None else f"{current_user.id}:{updated_at.isoformat()}"
+
+@router.get("/me", response_model=UserProfile)
+@http_cache(settings.HTTP_CACHE_PROFILE_SECONDS, _profile_version, private=True)
 async def read_users_me(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Get current user profile.
     """
-    return current_user
+    return await _profile(db, current_user.id)
 
-@router.patch("/me")
+@router.patch("/me", response_model=UserProfile)
 async def update_user_me(
     user_in: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Update current user profile.
     """
     # TODO: Implement update logic
-    return current_user
+    return await _profile(db, current_user.id)
 
 @router.post("/me/complete-onboarding")
 async def complete_onboarding(
     data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -41,10 +64,22 @@ async def complete_onboarding(
     # TODO: Implement onboarding logic
     return {"status": "success"}
 
+@router.get("/search", response_model=List[UserSearchResult])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(settings.USER_SEARCH_MAX_RESULTS, ge=1, le=settings.USER_SEARCH_MAX_RESULTS),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """
+    Search users by name or phone.
+    """
+    return FastJSONResponse(await user_search.search_users(db, q, limit))
+
 @router.get("/{user_id}")
 async def read_user_by_id(
     user_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
@@ -52,15 +87,3 @@ async def read_user_by_id(
     """
     # TODO: Implement logic
     return {"id": user_id}
-
-@router.get("/search")
-async def search_users(
-    q: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-) -> Any:
-    """
-    Search users by name or phone.
-    """
-    # TODO: Implement search logic
-    return []
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from pydantic import AnyHttpUrl, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,16 +31,119 @@ class Settings(BaseSettings):
             path=info.data.get("POSTGRES_DB", ""),
         ).unicode_string()
 
+    # Read replica; read-only sessions use the primary when unset
+    DATABASE_REPLICA_URL: Optional[str] = None
+
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_USE_NULL_POOL: bool = False  # e.g. behind PgBouncer in transaction mode
+    DB_POOL_WARM_CONNECTIONS: int = 5  # opened at startup, up to DB_POOL_SIZE (0 disables)
+
+    # Background jobs (0 disables)
+    GROUP_COUNTER_RECONCILE_SECONDS: int = 3600
+    ELECTION_TALLY_FOLD_SECONDS: int = 5
+    ELECTION_RESULTS_REFRESH_SECONDS: int = 10
+    ELECTION_RESULTS_ACTIVE_TTL_SECONDS: int = 300
+    ELECTION_RESULTS_COMPLETED_TTL_SECONDS: int = 7 * 24 * 3600
+    NOTIFICATION_PARTITION_CHECK_SECONDS: int = 24 * 3600
+    # Opt-in: 0 leaves placement to manual joins
+    ATEULI_PLACEMENT_SECONDS: int = 0
+    SOS_ESCALATION_RESYNC_SECONDS: int = 30
+    LEADERBOARD_REBUILD_SECONDS: int = 3600
+    TOKEN_REVOCATION_RESYNC_SECONDS: int = 60
+    REFRESH_TOKEN_PURGE_SECONDS: int = 3600
+
+    # Audit log write-behind
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_FLUSH_TIMEOUT_SECONDS: float = 5.0
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 0.5
+    AUDIT_SPOOL_PATH: str = "audit_spool.jsonl"
+
+    # Metrics
+    SLOW_REQUEST_SECONDS: float = 0.0  # 0 disables the slow-request log
+    N_PLUS_ONE_THRESHOLD: int = 5
+    METRICS_MAX_CAPTURED_STATEMENTS: int = 100
+
+    # SOS escalation: how long a signal may wait at a level, by priority
+    SOS_ESCALATE_CRITICAL_SECONDS: int = 5 * 60
+    SOS_ESCALATE_HIGH_SECONDS: int = 30 * 60
+    SOS_ESCALATE_NORMAL_SECONDS: int = 4 * 3600
+    SOS_ESCALATE_LOW_SECONDS: int = 24 * 3600
+    SOS_ESCALATION_BATCH_SIZE: int = 500
+
+    # Leaderboards
+    RANKING_BACKEND: str = "redis"  # "redis" or "memory"
+    LEADERBOARD_MAX_LIMIT: int = 100
+    LEADERBOARD_NEIGHBORS: int = 2
+
+    # Ateuli placement
+    ATEULI_PLACEMENT_CHUNK_SIZE: int = 5000
+
+    # Endorsements
+    ENDORSEMENT_LIMIT_PER_GEDER: int = 10
+
+    # Notifications
+    NOTIFICATION_FANOUT_CHUNK_SIZE: int = 1000
+    NOTIFICATION_PARTITION_MONTHS_AHEAD: int = 3
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # Keys for the deterministic phone / personal ID lookup digests, by version.
+    # The current version is used for new digests; older ones are only used to
+    # find rows that have not been rehashed yet.
+    LOOKUP_HASH_KEYS: Dict[int, str] = {}
+    LOOKUP_HASH_KEY_VERSION: int = 1
+
+    # Thread pool for bcrypt and token signing, kept off the event loop
+    CRYPTO_MAX_WORKERS: int = 4
+    CRYPTO_MAX_QUEUE: int = 1000
+    CRYPTO_BATCH_SIZE: int = 32
+    CRYPTO_RETRY_AFTER_SECONDS: int = 1  # Retry-After sent when the queue is full
     
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
 
+    # Caching
+    CACHE_BACKEND: str = "redis"  # "redis" or "memory"
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_SHARED_TTL_SECONDS: int = 300
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    TERRITORY_SNAPSHOT_CHECK_SECONDS: int = 5
+    TERRITORY_SNAPSHOT_VERSION_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # HTTP caching (Cache-Control max-age)
+    HTTP_CACHE_TERRITORIES_SECONDS: int = 24 * 3600
+    HTTP_CACHE_PROFILE_SECONDS: int = 3600
+    HTTP_CACHE_STATISTICS_SECONDS: int = 300
+    HTTP_RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+
+    # WebSocket events
+    PUBSUB_BACKEND: str = "redis"  # "redis" or "memory"
+    WS_MAX_PENDING_MESSAGES: int = 64
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0
+
+    # Search
+    USER_SEARCH_MAX_RESULTS: int = 20
+
+    # Rate limiting
+    RATE_LIMIT_BACKEND: str = "redis"  # "redis" or "memory"
+    RATE_LIMIT_ANONYMOUS_PER_HOUR: int = 100
+    RATE_LIMIT_AUTHENTICATED_PER_HOUR: int = 1000
+    RATE_LIMIT_LEADER_PER_HOUR: int = 5000
+    RATE_LIMIT_VERIFICATION_CODES_PER_HOUR: int = 5
+    RATE_LIMIT_SOS_PER_DAY: int = 10
+    RATE_LIMIT_INITIATIVES_PER_DAY: int = 5
+
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
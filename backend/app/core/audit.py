@@ -0,0 +1,348 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional, Union
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import settings
+from app.models.audit import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_UUID_FIELDS = ("id", "user_id", "entity_id")
+_TIME_FIELDS = ("created_at", "updated_at")
+
+
+class AuditSink:
+    """
+    Write-behind pipeline for AuditLog rows.
+
+    `record()` puts the row on a bounded in-process queue and returns; a
+    single flusher task writes queued rows with one multi-row INSERT per batch
+    of up to `batch_size` rows or every `flush_interval` seconds, whichever
+    comes first.
+
+    Backpressure: when the queue is full, `record()` waits up to
+    `enqueue_timeout` seconds for room. If there is still none, or a batch
+    fails or takes longer than `flush_timeout` to write, the rows are appended
+    to the spool file and fsynced instead. Spooled rows are written back in the
+    background once flushes succeed again. A row is only dropped (and counted)
+    when the spool file cannot be written either. Spool lines that cannot be
+    parsed on replay (e.g. torn by a crash mid-write) are moved to
+    `<spool_path>.rejected` and counted.
+
+    Guarantees:
+    - Durability: a row is durable once it is committed or fsynced to the
+      spool. Rows still in the queue are flushed on graceful shutdown
+      (`stop()`) but are lost if the process is killed, so at most
+      `max_queue` rows, or one flush interval's worth, are at risk.
+    - Delivery is at least once. Spool replay may repeat a row whose batch
+      actually committed before timing out; on Postgres the primary key,
+      assigned at record time, makes the replay skip it.
+    - Ordering: within one worker, rows are written in the order recorded
+      unless they go through the spool, which writes them after newer rows.
+      There is no ordering across workers. `created_at` is taken when the
+      action is recorded, so it gives the true order of events either way.
+    """
+
+    def __init__(
+        self,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        flush_timeout: float,
+        enqueue_timeout: float,
+        spool_path: str,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+        self.enqueue_timeout = enqueue_timeout
+        self.spool_path = spool_path
+        self._session_factory = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch: list[dict[str, Any]] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._spool_pending = True
+        self._replay_seq = 0
+        self.recorded = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    def start(self, session_factory) -> asyncio.Task:
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="audit-sink")
+        return self._task
+
+    async def stop(self) -> None:
+        """
+        Stop the flusher and write out everything still queued.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # A flush in progress is shielded from the cancellation; let it finish.
+        if self._inflight is not None:
+            await asyncio.gather(self._inflight, return_exceptions=True)
+        batch, self._batch = self._batch, []
+        await self._flush(batch)
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    async def record(
+        self,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[uuid.UUID] = None,
+        user_id: Optional[uuid.UUID] = None,
+        old_values: Optional[dict[str, Any]] = None,
+        new_values: Optional[dict[str, Any]] = None,
+        request: Optional[Request] = None,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        row = {
+            "id": uuid.uuid4(),
+            "created_at": now,
+            "updated_at": now,
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "old_values": old_values,
+            "new_values": new_values,
+            "ip_address": request.client.host if request is not None and request.client else None,
+            "user_agent": request.headers.get("user-agent") if request is not None else None,
+        }
+        self.recorded += 1
+
+        if self._queue is None:
+            # Sink not running (scripts, tests): keep the row anyway.
+            await self._spool([row])
+            return
+        try:
+            await asyncio.wait_for(self._queue.put(row), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            await self._spool([row])
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _fill_batch(self) -> None:
+        # Rows are collected on self._batch rather than a local, so stop()
+        # can still flush them if it cancels the flusher while it waits.
+        self._batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+        while len(self._batch) < self.batch_size:
+            self._batch.extend(self._drain(self.batch_size - len(self._batch)))
+            remaining = deadline - time.monotonic()
+            if len(self._batch) >= self.batch_size or remaining <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        flushed = True
+        while True:
+            try:
+                if flushed and self._spool_pending:
+                    await self._replay_spool()
+                await self._fill_batch()
+                batch, self._batch = self._batch, []
+                self._inflight = asyncio.ensure_future(self._flush(batch))
+                flushed = await asyncio.shield(self._inflight)
+                self._inflight = None
+            except Exception:
+                # Keep the flusher alive; the spool is retried after the next
+                # successful flush.
+                logger.exception("Audit flusher iteration failed")
+                self._inflight = None
+                flushed = False
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        async with self._session_factory() as db:
+            if db.bind.dialect.name == "postgresql":
+                statement = pg_insert(AuditLog.__table__).values(rows).on_conflict_do_nothing()
+            else:
+                statement = insert(AuditLog.__table__).values(rows)
+            await db.execute(statement)
+            await db.commit()
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> bool:
+        if not batch:
+            return True
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._insert(batch), timeout=self.flush_timeout)
+        except Exception:
+            logger.warning("Audit flush of %d rows failed; spooling", len(batch), exc_info=True)
+            self.failed_batches += 1
+            await self._spool(batch)
+            return False
+
+        elapsed = time.perf_counter() - started_at
+        self.batches += 1
+        self.flushed += len(batch)
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+        return True
+
+    def _append_to_spool(self, rows: list[dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(jsonable_encoder(row)) + "\n" for row in rows)
+        with open(self.spool_path, "a", encoding="utf-8") as spool:
+            spool.write(lines)
+            spool.flush()
+            os.fsync(spool.fileno())
+
+    async def _spool(self, rows: list[dict[str, Any]]) -> None:
+        try:
+            await asyncio.to_thread(self._append_to_spool, rows)
+            self.spooled += len(rows)
+            self._spool_pending = True
+        except OSError:
+            logger.exception("Could not spool %d audit rows; dropping them", len(rows))
+            self.dropped += len(rows)
+
+    def _next_replay_path(self) -> str:
+        # Unique per take, so a file still waiting to be replayed is never
+        # renamed over.
+        self._replay_seq += 1
+        return f"{self.spool_path}.{os.getpid()}.{self._replay_seq}.replaying"
+
+    def _replay_paths(self) -> list[str]:
+        """
+        This worker's replay files plus those left behind by dead workers.
+        """
+        paths = []
+        for path in glob.glob(f"{glob.escape(self.spool_path)}.*.*.replaying"):
+            try:
+                pid = int(path.rsplit(".", 3)[-3])
+            except ValueError:
+                continue
+            if pid != os.getpid():
+                try:
+                    os.kill(pid, 0)
+                    continue
+                except ProcessLookupError:
+                    pass
+                except PermissionError:
+                    continue
+            paths.append(path)
+        return sorted(paths)
+
+    @staticmethod
+    def _parse_row(line: str) -> dict[str, Any]:
+        row = json.loads(line)
+        for key in _UUID_FIELDS:
+            if row.get(key) is not None:
+                row[key] = uuid.UUID(row[key])
+        for key in _TIME_FIELDS:
+            row[key] = datetime.fromisoformat(row[key])
+        return row
+
+    def _take_spool(self) -> tuple[list[str], list[dict[str, Any]], list[str]]:
+        # Rename first so rows spooled meanwhile go to a fresh file, and so
+        # only one live worker replays a given file.
+        try:
+            os.rename(self.spool_path, self._next_replay_path())
+        except FileNotFoundError:
+            pass
+        paths = self._replay_paths()
+
+        rows, rejected = [], []
+        for path in paths:
+            with open(path, encoding="utf-8") as spool:
+                for line in spool:
+                    if not line.strip():
+                        continue
+                    try:
+                        rows.append(self._parse_row(line))
+                    except (ValueError, TypeError, KeyError, AttributeError):
+                        # e.g. a line torn by a crash mid-write
+                        rejected.append(line if line.endswith("\n") else line + "\n")
+        return paths, rows, rejected
+
+    def _finish_replay(self, paths: list[str], rejected: list[str]) -> None:
+        if rejected:
+            # Set aside rather than dropped, so they can be inspected.
+            with open(f"{self.spool_path}.rejected", "a", encoding="utf-8") as quarantine:
+                quarantine.write("".join(rejected))
+                quarantine.flush()
+                os.fsync(quarantine.fileno())
+        for path in paths:
+            os.remove(path)
+
+    async def _replay_spool(self) -> None:
+        self._spool_pending = False
+        try:
+            paths, rows, rejected = await asyncio.to_thread(self._take_spool)
+            for start in range(0, len(rows), self.batch_size):
+                await asyncio.wait_for(
+                    self._insert(rows[start:start + self.batch_size]), timeout=self.flush_timeout
+                )
+            await asyncio.to_thread(self._finish_replay, paths, rejected)
+        except Exception:
+            # Keep the files and try again after the next successful flush.
+            logger.warning("Audit spool replay failed", exc_info=True)
+            self._spool_pending = True
+            return
+        self.replayed += len(rows)
+        if rejected:
+            self.rejected += len(rejected)
+            logger.warning(
+                "Moved %d unreadable audit spool lines to %s.rejected", len(rejected), self.spool_path
+            )
+
+    def stats(self) -> dict[str, Union[int, float]]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "last_flush_seconds": self.last_flush_seconds,
+            "max_flush_seconds": self.max_flush_seconds,
+            "total_flush_seconds": self.total_flush_seconds,
+        }
+
+
+audit_sink = AuditSink(
+    max_queue=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    flush_timeout=settings.AUDIT_FLUSH_TIMEOUT_SECONDS,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+    spool_path=settings.AUDIT_SPOOL_PATH,
+)
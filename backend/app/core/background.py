@@ -0,0 +1,21 @@
+import asyncio
+from typing import Coroutine
+
+_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine, name: str = None) -> asyncio.Task:
+    """
+    Start a long-running background task, keeping a reference until it ends.
+    """
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def cancel_all() -> None:
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
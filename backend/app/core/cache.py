@@ -0,0 +1,255 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.core.redis import get_redis
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Per-process cache with a fixed TTL and least-recently-used eviction.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SharedCache:
+    """
+    Cache tier shared by all workers. Values are JSON-encoded strings; a
+    `ttl_seconds` of None keeps the key until it is deleted.
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int]) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: str, ttl_seconds: Optional[int]) -> bool:
+        """
+        Set `key` only if it does not exist. Returns True if it was set.
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def delete_many(self, keys: list[str]) -> None:
+        for key in keys:
+            await self.delete(key)
+
+
+class InMemorySharedCache(SharedCache):
+    """
+    Local stand-in for the shared tier, used for tests and single-node setups.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int]) -> None:
+        expires_at = float("inf") if ttl_seconds is None else time.monotonic() + ttl_seconds
+        self._data[key] = (expires_at, value)
+
+    async def add(self, key: str, value: str, ttl_seconds: Optional[int]) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl_seconds)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class RedisSharedCache(SharedCache):
+    async def get(self, key: str) -> Optional[str]:
+        return await get_redis().get(key)
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int]) -> None:
+        await get_redis().set(key, value, ex=ttl_seconds)
+
+    async def add(self, key: str, value: str, ttl_seconds: Optional[int]) -> bool:
+        return bool(await get_redis().set(key, value, ex=ttl_seconds, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await get_redis().delete(key)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        if keys:
+            await get_redis().delete(*keys)
+
+
+def create_shared_cache() -> SharedCache:
+    if settings.CACHE_BACKEND == "memory":
+        return InMemorySharedCache()
+    return RedisSharedCache()
+
+
+class TieredCache:
+    """
+    Two-tier cache: a per-process LRU in front of a shared tier.
+
+    Explicit invalidation removes the key from the local tier and the shared
+    tier. Other workers may keep serving their local copy until it expires, so
+    the local TTL bounds how stale a value can get after invalidation.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        local: LRUCache,
+        shared: SharedCache,
+        shared_ttl_seconds: Optional[int],
+        encode: Callable[[Any], str] = json.dumps,
+        decode: Callable[[str], Any] = json.loads,
+    ):
+        self.namespace = namespace
+        self.encode = encode
+        self.decode = decode
+        self.local = local
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        try:
+            raw = await self.shared.get(self._key(key))
+        except Exception:
+            # The shared tier is an optimisation; fall through to the source.
+            self.shared_errors += 1
+            return None
+        if raw is None:
+            self.shared_misses += 1
+            return None
+
+        self.shared_hits += 1
+        value = self.decode(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        shared_ttl_seconds: Optional[int] = None,
+        local_ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.local.set(key, value, local_ttl_seconds)
+        try:
+            await self.shared.set(
+                self._key(key),
+                self.encode(value),
+                shared_ttl_seconds or self.shared_ttl_seconds,
+            )
+        except Exception:
+            self.shared_errors += 1
+
+    async def add(self, key: str, value: Any, local_ttl_seconds: Optional[float] = None) -> Any:
+        """
+        Store `value` unless the shared tier already holds one for `key`;
+        returns whichever value is kept.
+        """
+        try:
+            added = await self.shared.add(self._key(key), self.encode(value), self.shared_ttl_seconds)
+            if not added:
+                raw = await self.shared.get(self._key(key))
+                value = value if raw is None else self.decode(raw)
+        except Exception:
+            self.shared_errors += 1
+        self.local.set(key, value, local_ttl_seconds)
+        return value
+
+    async def invalidate(self, key: str) -> None:
+        self.local.delete(key)
+        try:
+            await self.shared.delete(self._key(key))
+        except Exception:
+            self.shared_errors += 1
+
+    async def invalidate_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self.local.delete(key)
+        try:
+            await self.shared.delete_many([self._key(key) for key in keys])
+        except Exception:
+            self.shared_errors += 1
+
+    def stats(self) -> dict[str, int]:
+        local = self.local.stats()
+        return {
+            "local_size": local["size"],
+            "local_hits": local["hits"],
+            "local_misses": local["misses"],
+            "local_evictions": local["evictions"],
+            "shared_hits": self.shared_hits,
+            "shared_misses": self.shared_misses,
+            "shared_errors": self.shared_errors,
+        }
@@ -0,0 +1,158 @@
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
+
+from app.config import settings
+from app.core import security
+
+T = TypeVar("T")
+
+
+class CryptoPoolSaturated(RuntimeError):
+    pass
+
+
+class CryptoExecutor:
+    """
+    Bounded thread pool for CPU-bound crypto.
+
+    At most `max_workers` jobs run at once; up to `max_queue` more wait for a
+    slot and anything beyond that is rejected with CryptoPoolSaturated so a
+    login storm cannot queue unbounded work. bcrypt releases the GIL, so the
+    threads run in parallel with the event loop.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.running = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="crypto"
+            )
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        self._ensure_started()
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise CryptoPoolSaturated("crypto pool queue is full")
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        enqueued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - enqueued_at
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._slots = None
+
+    def stats(self) -> dict[str, Union[int, float]]:
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "total_wait_seconds": self.total_wait_seconds,
+            "total_run_seconds": self.total_run_seconds,
+        }
+
+
+crypto_executor = CryptoExecutor(
+    max_workers=settings.CRYPTO_MAX_WORKERS,
+    max_queue=settings.CRYPTO_MAX_QUEUE,
+)
+
+
+def _signing_is_cheap() -> bool:
+    # HMAC signing takes microseconds, less than a thread hand-off.
+    return settings.ALGORITHM.startswith("HS")
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await crypto_executor.run(security.verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash(password: str) -> str:
+    return await crypto_executor.run(security.get_password_hash, password)
+
+
+async def verify_legacy_lookup_hash(value: str, stored: str) -> bool:
+    return await crypto_executor.run(security.verify_legacy_lookup_hash, value, stored)
+
+
+def _verify_many(pairs: list[tuple[str, str]]) -> list[bool]:
+    return [security.verify_password(plain, hashed) for plain, hashed in pairs]
+
+
+async def verify_passwords(pairs: Iterable[tuple[str, str]]) -> list[bool]:
+    """
+    Verify many (plain, hashed) pairs, e.g. for bulk imports.
+
+    Pairs are split into chunks of CRYPTO_BATCH_SIZE, one pool job per chunk,
+    so a large import occupies a bounded number of slots and pays one thread
+    hand-off per chunk rather than per pair. Results keep the input order.
+    """
+    pairs = list(pairs)
+    size = settings.CRYPTO_BATCH_SIZE
+    chunks = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+    results = await asyncio.gather(*(crypto_executor.run(_verify_many, c) for c in chunks))
+    return [ok for chunk in results for ok in chunk]
+
+
+async def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    family_id: Optional[uuid.UUID] = None,
+    is_leader: bool = False,
+) -> str:
+    if _signing_is_cheap():
+        return security.create_access_token(subject, expires_delta, family_id, is_leader)
+    return await crypto_executor.run(
+        security.create_access_token, subject, expires_delta, family_id, is_leader
+    )
+
+
+async def create_refresh_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    jti: Optional[uuid.UUID] = None,
+    family_id: Optional[uuid.UUID] = None,
+) -> str:
+    if _signing_is_cheap():
+        return security.create_refresh_token(subject, expires_delta, jti, family_id)
+    return await crypto_executor.run(
+        security.create_refresh_token, subject, expires_delta, jti, family_id
+    )
@@ -1,16 +1,97 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config import settings
+from app.core.metrics import current_trace
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts wait for a connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        elapsed = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.total_checkout_seconds += elapsed
+        self.max_checkout_seconds = max(self.max_checkout_seconds, elapsed)
+        return connection
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    if settings.DB_USE_NULL_POOL:
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
 
 engine = create_async_engine(
     str(settings.DATABASE_URL),
     echo=False,
     future=True,
     pool_pre_ping=True,
+    **_pool_kwargs(),
 )
 
+if settings.DATABASE_REPLICA_URL:
+    read_engine = create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=False,
+        future=True,
+        pool_pre_ping=True,
+        **_pool_kwargs(),
+    )
+else:
+    read_engine = engine
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_trace() is not None:
+        conn.info.setdefault("statement_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = current_trace()
+    started = conn.info.get("statement_started_at")
+    if trace is not None and started:
+        trace.record(statement, time.perf_counter() - started.pop())
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Record every statement run on `engine` in the current request's QueryTrace.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+instrument_engine(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine)
+
 AsyncSessionLocal = sessionmaker(
     engine, 
     class_=AsyncSession, 
@@ -19,6 +100,14 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -29,3 +118,41 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+async def get_read_db():
+    """
+    Session for read-only handlers, served by the replica when configured.
+
+    Nothing is committed; closing the session rolls back the implicit
+    transaction and returns the connection to the pool.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def _pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+
+    capacity = pool.size() + pool._max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "saturation": checked_out / capacity if capacity else 0.0,
+        "checkouts": pool.checkouts,
+        "checkout_timeouts": pool.checkout_timeouts,
+        "total_checkout_seconds": pool.total_checkout_seconds,
+        "max_checkout_seconds": pool.max_checkout_seconds,
+    }
+
+
+def pool_stats() -> dict[str, Any]:
+    stats = {"primary": _pool_stats(engine)}
+    if read_engine is not engine:
+        stats["replica"] = _pool_stats(read_engine)
+    return stats
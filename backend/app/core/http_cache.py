@@ -0,0 +1,145 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.core.cache import LRUCache, TieredCache, create_shared_cache
+from app.core.serialization import FastJSONResponse
+
+_REQUEST_PARAM = "_http_cache_request"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag (RFC 9110).
+    """
+    if not if_none_match:
+        return False
+    target = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == target:
+            return True
+    return False
+
+
+def strong_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def time_window(seconds: int) -> Callable[[], Awaitable[int]]:
+    """
+    Version for responses without an entity to track, such as aggregates:
+    it changes every `seconds`, so they are recomputed at most that often.
+    """
+
+    async def version() -> int:
+        return int(time.time() // seconds)
+
+    return version
+
+
+def http_cache(
+    max_age: int,
+    version: Callable[..., Awaitable[Optional[Any]]],
+    private: bool = False,
+    server_cache: bool = False,
+):
+    """
+    Conditional GET for a route, declared on the handler:
+
+        @router.get("/{territory_id}")
+        @http_cache(max_age=..., version=territory_version, server_cache=True)
+        async def read_territory(territory_id: uuid.UUID, db: ...): ...
+
+    `version` is awaited with the handler's arguments it names and returns
+    something that changes whenever the response would, such as an entity's
+    `updated_at`, or None to bypass caching (e.g. for a missing entity). The
+    strong ETag is derived from it and the URL, so a matching If-None-Match
+    is answered with 304 without running the handler or its serializer.
+
+    With `server_cache` rendered bodies are kept in a TieredCache keyed by
+    that ETag; a new version simply misses. Concurrent misses for one key in
+    a worker wait for a single render. Private responses are never kept.
+    """
+    version_params = list(inspect.signature(version).parameters)
+    cache_control = f"{'private' if private else 'public'}, max-age={max_age}"
+    bodies: Optional[TieredCache] = None
+    if server_cache and not private:
+        bodies = TieredCache(
+            namespace="http_response",
+            local=LRUCache(settings.HTTP_RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds=max_age),
+            shared=create_shared_cache(),
+            shared_ttl_seconds=max_age,
+            encode=lambda body: body,
+            decode=lambda body: body,
+        )
+    render_locks: dict[str, asyncio.Lock] = {}
+
+    def decorator(handler: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(handler)
+        request_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is Request), None
+        )
+
+        async def render(kwargs: dict[str, Any]) -> Response:
+            response = await handler(**kwargs)
+            if not isinstance(response, Response):
+                response = FastJSONResponse(response)
+            return response
+
+        @functools.wraps(handler)
+        async def wrapper(**kwargs: Any) -> Response:
+            request: Request = kwargs[request_param or _REQUEST_PARAM]
+            if request_param is None:
+                del kwargs[_REQUEST_PARAM]
+
+            current = await version(**{name: kwargs[name] for name in version_params})
+            if current is None:
+                return await render(kwargs)
+
+            etag = strong_etag(request.url.path, request.url.query, current)
+            headers = {"ETag": etag, "Cache-Control": cache_control}
+            if private:
+                headers["Vary"] = "Authorization"
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+
+            if bodies is None:
+                response = await render(kwargs)
+            else:
+                body = await bodies.get(etag)
+                if body is None:
+                    lock = render_locks.setdefault(etag, asyncio.Lock())
+                    try:
+                        async with lock:
+                            body = await bodies.get(etag)
+                            if body is None:
+                                response = await render(kwargs)
+                                if response.status_code != 200:
+                                    return response
+                                body = response.body.decode()
+                                await bodies.set(etag, body)
+                    finally:
+                        render_locks.pop(etag, None)
+                response = Response(content=body, media_type="application/json")
+
+            if response.status_code == 200:
+                response.headers.update(headers)
+            return response
+
+        if request_param is None:
+            extra = inspect.Parameter(
+                _REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+            )
+            signature = signature.replace(parameters=[*signature.parameters.values(), extra])
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
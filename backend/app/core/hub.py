@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from typing import Any, Iterable, Optional, Union
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.core import background
+from app.core.pubsub import PubSub, create_pubsub
+from app.utils.enums import HierarchyLevel
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_TOPIC = "all"
+
+# Close code for evicted slow consumers ("try again later").
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def user_topic(user_id: uuid.UUID) -> str:
+    return f"user:{user_id}"
+
+
+def territory_topic(territory_id: uuid.UUID) -> str:
+    return f"territory:{territory_id}"
+
+
+def group_topic(level: HierarchyLevel, group_id: uuid.UUID) -> str:
+    return f"{level.value}:{group_id}"
+
+
+class Connection:
+    """
+    One subscribed socket.
+
+    Idle connections hold no task and an empty deque; a sender task only
+    exists while messages are pending. `__slots__` keeps tens of thousands
+    of them cheap.
+    """
+
+    __slots__ = ("websocket", "user_id", "topics", "pending", "sender")
+
+    def __init__(self, websocket: WebSocket, user_id: uuid.UUID, topics: tuple[str, ...]):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.topics = topics
+        self.pending: deque[str] = deque()
+        self.sender: Optional[asyncio.Task] = None
+
+
+class EventHub:
+    """
+    Fans events out to the WebSocket connections of this worker.
+
+    `publish()` encodes an event once and hands it to the pub/sub backend,
+    which delivers it to the hub of every worker. Each hub looks up the
+    topic's connections and appends the same encoded message to their send
+    queues. A connection whose queue already holds `max_pending` messages,
+    or whose socket does not accept a message within `send_timeout`
+    seconds, is a slow consumer and gets closed so it cannot hold memory or
+    delay anyone else.
+    """
+
+    def __init__(self, pubsub: PubSub, max_pending: int, send_timeout: float):
+        self.pubsub = pubsub
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.topics: dict[str, set[Connection]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self.connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.evicted = 0
+
+    def start(self) -> asyncio.Task:
+        self._listener = asyncio.create_task(self._listen(), name="event-hub")
+        return self._listener
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self.pubsub.listen(self.deliver)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event hub subscription failed; resubscribing")
+                await asyncio.sleep(1)
+
+    def subscribe(
+        self, websocket: WebSocket, user_id: uuid.UUID, topics: Iterable[str]
+    ) -> Connection:
+        connection = Connection(websocket, user_id, tuple(dict.fromkeys(topics)))
+        for topic in connection.topics:
+            self.topics.setdefault(topic, set()).add(connection)
+        self.connections += 1
+        return connection
+
+    def unsubscribe(self, connection: Connection) -> None:
+        if not connection.topics:
+            return
+        for topic in connection.topics:
+            subscribers = self.topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.topics[topic]
+        connection.topics = ()
+        connection.pending.clear()
+        self.connections -= 1
+        if connection.sender is not None and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+
+    async def publish(self, topic: str, event: str, data: Any) -> None:
+        message = json.dumps(
+            {"event": event, "data": jsonable_encoder(data)},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self.published += 1
+        await self.pubsub.publish(topic, message)
+
+    def deliver(self, topic: str, message: str) -> int:
+        """
+        Queue an encoded message on every local connection subscribed to
+        `topic`. Returns the number of connections it was queued for.
+        """
+        subscribers = self.topics.get(topic)
+        if not subscribers:
+            return 0
+        queued = 0
+        for connection in list(subscribers):
+            if len(connection.pending) >= self.max_pending:
+                self._evict(connection)
+                continue
+            connection.pending.append(message)
+            if connection.sender is None:
+                connection.sender = asyncio.create_task(self._send_pending(connection))
+            queued += 1
+        self.delivered += queued
+        return queued
+
+    async def _send_pending(self, connection: Connection) -> None:
+        try:
+            while connection.pending:
+                message = connection.pending[0]
+                await asyncio.wait_for(
+                    connection.websocket.send_text(message), timeout=self.send_timeout
+                )
+                connection.pending.popleft()
+        except asyncio.TimeoutError:
+            self._evict(connection)
+        except Exception:
+            # The socket is gone; the endpoint's receive loop cleans up.
+            connection.pending.clear()
+        finally:
+            connection.sender = None
+
+    def _evict(self, connection: Connection) -> None:
+        if not connection.topics:
+            return
+        self.evicted += 1
+        self.unsubscribe(connection)
+        background.spawn(self._close(connection.websocket), name="ws-evict")
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    def stats(self) -> dict[str, Union[int, float]]:
+        return {
+            "connections": self.connections,
+            "topics": len(self.topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "evicted": self.evicted,
+        }
+
+
+hub = EventHub(
+    pubsub=create_pubsub(),
+    max_pending=settings.WS_MAX_PENDING_MESSAGES,
+    send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,7 @@
+"""
+Imported first by app.main, so IMPORT_STARTED marks the start of the app
+import for the boot report.
+"""
+import time
+
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,272 @@
+import bisect
+import contextvars
+import logging
+import time
+from collections import Counter
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Requests that matched no route share one label, so scanners probing random
+# paths cannot blow up the number of series.
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterable[tuple[str, int]]:
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield _format_value(bound), total
+        yield "+Inf", self.count
+
+
+class QueryTrace:
+    """
+    The SQL statements run while serving one request.
+
+    Counts and total time cover every statement; only the first
+    METRICS_MAX_CAPTURED_STATEMENTS are kept for the slow-request log.
+    """
+
+    __slots__ = ("count", "seconds", "statements", "repeats")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: list[tuple[str, float]] = []
+        self.repeats: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.repeats[statement] += 1
+        if len(self.statements) < settings.METRICS_MAX_CAPTURED_STATEMENTS:
+            self.statements.append((statement, seconds))
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Statements run at least `threshold` times: the same parameterized SQL
+        issued in a loop, the signature of an N+1 query.
+        """
+        return [(sql, n) for sql, n in self.repeats.items() if n >= threshold]
+
+
+_trace: contextvars.ContextVar[Optional[QueryTrace]] = contextvars.ContextVar(
+    "query_trace", default=None
+)
+
+
+def current_trace() -> Optional[QueryTrace]:
+    return _trace.get()
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "statements", "statement_seconds", "n_plus_one", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.statement_seconds = 0.0
+        self.n_plus_one = 0
+        self.statuses: Counter = Counter()
+
+
+class Metrics:
+    """
+    Per-route request metrics of this worker, in Prometheus text format.
+
+    Each worker keeps its own numbers; Prometheus scrapes every worker and
+    sums them, as it does for any multi-process exporter.
+    """
+
+    def __init__(self, n_plus_one_threshold: int):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._reported_repeats: set[tuple[str, str]] = set()
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, trace: QueryTrace
+    ) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(seconds)
+        metrics.statements.observe(trace.count)
+        metrics.statement_seconds += trace.seconds
+        metrics.statuses[status] += 1
+
+        repeated = trace.repeated(self.n_plus_one_threshold)
+        if repeated:
+            metrics.n_plus_one += 1
+            for statement, count in repeated:
+                # Each offending statement is logged once per route, not per request.
+                if (route, statement) not in self._reported_repeats:
+                    self._reported_repeats.add((route, statement))
+                    logger.warning(
+                        "Possible N+1 on %s %s: statement ran %d times: %s",
+                        method, route, count, statement,
+                    )
+
+    def render(self, gauges: Optional[dict[str, tuple[str, float]]] = None) -> str:
+        """
+        The route metrics plus `gauges`, a mapping of name to (help, value).
+        """
+        lines = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, help_text: str, attr: str) -> None:
+            header(name, "histogram", help_text)
+            for (method, route), metrics in sorted(self.routes.items()):
+                labels = _labels(method=method, route=route)
+                hist = getattr(metrics, attr)
+                for bound, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {_format_value(hist.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        header("http_requests_total", "counter", "HTTP requests by route and status.")
+        for (method, route), metrics in sorted(self.routes.items()):
+            for status, count in sorted(metrics.statuses.items()):
+                labels = _labels(method=method, route=route, status=str(status))
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        histogram(
+            "http_request_duration_seconds", "Request latency by route.", "latency"
+        )
+        histogram(
+            "db_statements_per_request", "SQL statements run per request, by route.", "statements"
+        )
+
+        header("db_statement_seconds_total", "counter", "Time spent in SQL statements, by route.")
+        for (method, route), metrics in sorted(self.routes.items()):
+            lines.append(
+                f"db_statement_seconds_total{{{_labels(method=method, route=route)}}} "
+                f"{_format_value(metrics.statement_seconds)}"
+            )
+
+        header(
+            "db_n_plus_one_requests_total", "counter",
+            "Requests that repeated an identical SQL statement, by route.",
+        )
+        for (method, route), metrics in sorted(self.routes.items()):
+            lines.append(
+                f"db_n_plus_one_requests_total{{{_labels(method=method, route=route)}}} "
+                f"{metrics.n_plus_one}"
+            )
+
+        for name, (help_text, value) in sorted((gauges or {}).items()):
+            header(name, "gauge", help_text)
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+metrics = Metrics(n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD)
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    The matched route's path template, e.g. "/api/v1/elections/{election_id}".
+
+    The router records the matched endpoint in the scope; templates are
+    looked up from it, with the table built once per application.
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None:
+        templates = {
+            route.endpoint: route.path
+            for route in app.routes
+            if getattr(route, "endpoint", None) is not None
+        }
+        app.state.route_templates = templates
+    return templates.get(endpoint, UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    Times each HTTP request and traces the SQL it runs, feeding `metrics`.
+
+    Requests slower than SLOW_REQUEST_SECONDS (when set) are logged with
+    their captured statements.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        registry: Metrics = metrics,
+        exempt_paths: tuple[str, ...] = ("/metrics",),
+    ):
+        self.app = app
+        self.registry = registry
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        trace = QueryTrace()
+        token = _trace.set(trace)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _trace.reset(token)
+            route = _route_template(scope)
+            self.registry.observe(scope["method"], route, status, elapsed, trace)
+            if settings.SLOW_REQUEST_SECONDS and elapsed >= settings.SLOW_REQUEST_SECONDS:
+                logger.warning(
+                    "Slow request %s %s (%s): %.3fs, %d statements in %.3fs\n%s",
+                    scope["method"], scope["path"], route, elapsed, trace.count, trace.seconds,
+                    "\n".join(f"  {seconds * 1000:8.2f}ms  {sql}" for sql, seconds in trace.statements),
+                )
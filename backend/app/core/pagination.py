@@ -0,0 +1,123 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+class CursorParams:
+    """
+    Query parameters shared by every list endpoint.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+        per_page: int = Query(DEFAULT_PER_PAGE, ge=1, le=MAX_PER_PAGE),
+        include_total: bool = Query(False, description="Include an estimated total"),
+    ):
+        self.cursor = cursor
+        self.per_page = per_page
+        self.include_total = include_total
+
+
+def encode_cursor(values: tuple) -> str:
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else str(v) for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def page_meta(
+    params: CursorParams,
+    next_cursor: Optional[str],
+    total: Optional[int] = None,
+) -> dict[str, Any]:
+    meta = {
+        "per_page": params.per_page,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
+    }
+    if total is not None:
+        meta["total"] = total
+    return meta
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """
+    Row estimate from the Postgres planner instead of an exact COUNT(*).
+
+    Other dialects (SQLite in local setups) fall back to an exact count.
+    """
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    if db.bind.dialect.name != "postgresql":
+        return await db.scalar(count_query)
+
+    try:
+        compiled = query.order_by(None).compile(
+            dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+    except Exception:
+        # Some bound values have no literal form; count exactly instead.
+        return await db.scalar(count_query)
+    plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    params: CursorParams,
+    serialize: Callable[[Any], Any] = lambda row: row._asdict(),
+) -> dict[str, Any]:
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The cursor carries the sort key of the last row, so every page is an
+    index range scan of `per_page + 1` rows no matter how deep it is.
+    `query` selects columns (see serialization.columns), including
+    `created_at` and `id`; rows are serialized without loading entities.
+    """
+    total = await estimate_count(db, query) if params.include_total else None
+
+    if params.cursor:
+        values = decode_cursor(params.cursor)
+        try:
+            created_at, last_id = datetime.fromisoformat(values[0]), uuid.UUID(values[1])
+        except (IndexError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, last_id))
+
+    result = await db.execute(
+        query.order_by(model.created_at.desc(), model.id.desc()).limit(params.per_page + 1)
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > params.per_page:
+        rows = rows[:params.per_page]
+        next_cursor = encode_cursor((rows[-1].created_at, rows[-1].id))
+
+    return {
+        "items": [serialize(row) for row in rows],
+        "meta": page_meta(params, next_cursor, total),
+    }
@@ -0,0 +1,82 @@
+import json
+import uuid
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Union
+
+from app.config import settings
+from app.core.cache import LRUCache, TieredCache, create_shared_cache
+from app.utils.enums import UserRole, UserStatus
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as seen by the auth guards.
+
+    Only holds the fields needed for role, status and group checks; handlers
+    that need the full profile load the `User` row themselves.
+    """
+
+    id: uuid.UUID
+    role: UserRole
+    status: Optional[UserStatus]
+    territory_id: Optional[uuid.UUID]
+    ateuli_id: Optional[uuid.UUID]
+    is_leader: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": str(self.id),
+            "role": self.role.value,
+            "status": self.status.value if self.status else None,
+            "territory_id": str(self.territory_id) if self.territory_id else None,
+            "ateuli_id": str(self.ateuli_id) if self.ateuli_id else None,
+            "is_leader": self.is_leader,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Principal":
+        return cls(
+            id=uuid.UUID(data["id"]),
+            role=UserRole(data["role"]),
+            status=UserStatus(data["status"]) if data["status"] else None,
+            territory_id=uuid.UUID(data["territory_id"]) if data["territory_id"] else None,
+            ateuli_id=uuid.UUID(data["ateuli_id"]) if data["ateuli_id"] else None,
+            is_leader=data.get("is_leader", False),
+        )
+
+
+principal_cache = TieredCache(
+    namespace="principal",
+    local=LRUCache(
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    ),
+    shared=create_shared_cache(),
+    shared_ttl_seconds=settings.PRINCIPAL_CACHE_SHARED_TTL_SECONDS,
+    encode=lambda principal: json.dumps(principal.to_dict()),
+    decode=lambda raw: Principal.from_dict(json.loads(raw)),
+)
+
+
+async def get_cached_principal(user_id: uuid.UUID) -> Optional[Principal]:
+    return await principal_cache.get(str(user_id))
+
+
+async def cache_principal(principal: Principal) -> None:
+    await principal_cache.set(str(principal.id), principal)
+
+
+async def invalidate_principal(user_id: Union[uuid.UUID, str]) -> None:
+    """
+    Must be called whenever a user's role, status, territory, Ateuli or
+    group leadership changes.
+    """
+    await principal_cache.invalidate(str(user_id))
+
+
+async def invalidate_principals(user_ids: Iterable[Union[uuid.UUID, str]]) -> None:
+    """
+    invalidate_principal() for many users at once, e.g. after bulk updates.
+    """
+    await principal_cache.invalidate_many([str(user_id) for user_id in user_ids])
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Callable
+
+from app.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, str], None]
+
+
+class PubSub:
+    """
+    Carries encoded events between workers. Every worker receives every
+    message and delivers it to its own subscribers.
+    """
+
+    async def publish(self, channel: str, message: str) -> None:
+        raise NotImplementedError
+
+    async def listen(self, handler: Handler) -> None:
+        """
+        Call `handler(channel, message)` for every message until cancelled.
+        """
+        raise NotImplementedError
+
+
+class InMemoryPubSub(PubSub):
+    """
+    Delivers to listeners in this process only; for tests and single-worker
+    setups.
+    """
+
+    def __init__(self):
+        self._handlers: list[Handler] = []
+
+    async def publish(self, channel: str, message: str) -> None:
+        for handler in list(self._handlers):
+            handler(channel, message)
+
+    async def listen(self, handler: Handler) -> None:
+        self._handlers.append(handler)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self._handlers.remove(handler)
+
+
+class RedisPubSub(PubSub):
+    def __init__(self, prefix: str = "events:"):
+        # Channels of one bus share a prefix, so buses do not hear each other.
+        self.prefix = prefix
+
+    async def publish(self, channel: str, message: str) -> None:
+        await get_redis().publish(self.prefix + channel, message)
+
+    async def listen(self, handler: Handler) -> None:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        await pubsub.psubscribe(self.prefix + "*")
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    handler(message["channel"][len(self.prefix):], message["data"])
+        finally:
+            await pubsub.close()
+
+
+def create_pubsub(prefix: str = "events:") -> PubSub:
+    if settings.PUBSUB_BACKEND == "memory":
+        return InMemoryPubSub()
+    return RedisPubSub(prefix)
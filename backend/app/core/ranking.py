@@ -0,0 +1,312 @@
+import random
+from typing import Iterable, Iterator, Optional
+
+from app.config import settings
+from app.core.redis import get_redis
+
+_MAX_LEVEL = 32
+_P = 0.25
+
+
+class _Node:
+    __slots__ = ("member", "score", "forward", "span", "backward")
+
+    def __init__(self, member: Optional[str], score: float, level: int):
+        self.member = member
+        self.score = score
+        self.forward: list[Optional[_Node]] = [None] * level
+        # Nodes passed by following forward[i], including its target.
+        self.span = [0] * level
+        self.backward: Optional[_Node] = None
+
+
+class SkipList:
+    """
+    Indexable skip list ordered by (score, member), as Redis keeps sorted
+    sets: every link records how many nodes it jumps, so inserts, deletes
+    and rank lookups in either direction are O(log n).
+    """
+
+    def __init__(self):
+        self.head = _Node(None, 0.0, _MAX_LEVEL)
+        self.tail: Optional[_Node] = None
+        self.level = 1
+        self.length = 0
+
+    @staticmethod
+    def _random_level() -> int:
+        level = 1
+        while level < _MAX_LEVEL and random.random() < _P:
+            level += 1
+        return level
+
+    def insert(self, member: str, score: float) -> None:
+        """
+        Add `member`, which must not be in the list yet.
+        """
+        update: list[_Node] = [self.head] * _MAX_LEVEL
+        rank = [0] * _MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            rank[i] = 0 if i == self.level - 1 else rank[i + 1]
+            while node.forward[i] is not None and (
+                (node.forward[i].score, node.forward[i].member) < (score, member)
+            ):
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                rank[i] = 0
+                update[i] = self.head
+                self.head.span[i] = self.length
+            self.level = level
+
+        new = _Node(member, score, level)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+
+        new.backward = None if update[0] is self.head else update[0]
+        if new.forward[0] is not None:
+            new.forward[0].backward = new
+        else:
+            self.tail = new
+        self.length += 1
+
+    def delete(self, member: str, score: float) -> bool:
+        update: list[_Node] = [self.head] * _MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and (
+                (node.forward[i].score, node.forward[i].member) < (score, member)
+            ):
+                node = node.forward[i]
+            update[i] = node
+
+        node = node.forward[0]
+        if node is None or node.member != member or node.score != score:
+            return False
+        for i in range(self.level):
+            if update[i].forward[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].forward[i] = node.forward[i]
+            else:
+                update[i].span[i] -= 1
+        if node.forward[0] is not None:
+            node.forward[0].backward = node.backward
+        else:
+            self.tail = node.backward
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.length -= 1
+        return True
+
+    def rank(self, member: str, score: float) -> Optional[int]:
+        """
+        0-based position of `member` in ascending order.
+        """
+        traversed = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and (
+                (node.forward[i].score, node.forward[i].member) <= (score, member)
+            ):
+                traversed += node.span[i]
+                node = node.forward[i]
+            if node is not self.head and node.member == member:
+                return traversed - 1
+        return None
+
+    def _node_at(self, rank: int) -> Optional[_Node]:
+        if not 0 <= rank < self.length:
+            return None
+        traversed = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and traversed + node.span[i] <= rank + 1:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if traversed == rank + 1:
+                return node
+        return None
+
+    def iter_descending(self, start: int) -> Iterator[tuple[str, float]]:
+        """
+        Members from the `start`-th highest down.
+        """
+        node = self.tail if start == 0 else self._node_at(self.length - 1 - start)
+        while node is not None:
+            yield node.member, node.score
+            node = node.backward
+
+
+class SortedSet:
+    def __init__(self):
+        self.scores: dict[str, float] = {}
+        self.order = SkipList()
+
+    def incr(self, member: str, delta: float) -> float:
+        old = self.scores.get(member)
+        score = (old or 0.0) + delta
+        if old is not None:
+            self.order.delete(member, old)
+        self.order.insert(member, score)
+        self.scores[member] = score
+        return score
+
+    def rank(self, member: str) -> Optional[int]:
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return self.order.length - 1 - self.order.rank(member, score)
+
+    def range(self, start: int, count: int) -> list[tuple[str, float]]:
+        result = []
+        for item in self.order.iter_descending(start):
+            if len(result) == count:
+                break
+            result.append(item)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+class RankingStore:
+    """
+    Named sorted sets of member -> score, ranked highest first, with the
+    operations of Redis sorted sets: O(log n) increments and rank lookups,
+    and O(log n + k) reads of k consecutive ranks.
+    """
+
+    # Whether every worker sees the same sets.
+    shared = False
+
+    async def incr_many(self, increments: Iterable[tuple[str, str, float]]) -> None:
+        """
+        Apply (key, member, delta) increments.
+        """
+        raise NotImplementedError
+
+    async def replace_all(self, boards: dict[str, dict[str, float]]) -> None:
+        """
+        Swap in freshly computed sets; sets missing from `boards` are dropped.
+        """
+        raise NotImplementedError
+
+    async def rank(self, key: str, member: str) -> Optional[tuple[int, float]]:
+        """
+        0-based rank and score of `member`, or None if it has no score.
+        """
+        raise NotImplementedError
+
+    async def range(self, key: str, start: int, count: int) -> list[tuple[str, float]]:
+        raise NotImplementedError
+
+    async def size(self, key: str) -> int:
+        raise NotImplementedError
+
+
+class InMemoryRankingStore(RankingStore):
+    """
+    Skip-list sets in this process only; for tests and single-worker setups.
+    """
+
+    def __init__(self):
+        self.sets: dict[str, SortedSet] = {}
+
+    async def incr_many(self, increments: Iterable[tuple[str, str, float]]) -> None:
+        for key, member, delta in increments:
+            self.sets.setdefault(key, SortedSet()).incr(member, delta)
+
+    async def replace_all(self, boards: dict[str, dict[str, float]]) -> None:
+        sets = {}
+        for key, scores in boards.items():
+            sorted_set = sets[key] = SortedSet()
+            for member, score in scores.items():
+                sorted_set.incr(member, score)
+        self.sets = sets
+
+    async def rank(self, key: str, member: str) -> Optional[tuple[int, float]]:
+        sorted_set = self.sets.get(key)
+        if sorted_set is None or member not in sorted_set.scores:
+            return None
+        return sorted_set.rank(member), sorted_set.scores[member]
+
+    async def range(self, key: str, start: int, count: int) -> list[tuple[str, float]]:
+        sorted_set = self.sets.get(key)
+        return sorted_set.range(start, count) if sorted_set is not None else []
+
+    async def size(self, key: str) -> int:
+        sorted_set = self.sets.get(key)
+        return len(sorted_set) if sorted_set is not None else 0
+
+
+class RedisRankingStore(RankingStore):
+    shared = True
+    prefix = "ranking:"
+    # Set of every key written by the last replace_all(), to drop on the next.
+    index_key = "ranking:keys"
+    chunk_size = 1000
+
+    async def incr_many(self, increments: Iterable[tuple[str, str, float]]) -> None:
+        pipe = get_redis().pipeline(transaction=False)
+        for key, member, delta in increments:
+            pipe.zincrby(self.prefix + key, delta, member)
+        await pipe.execute()
+
+    async def replace_all(self, boards: dict[str, dict[str, float]]) -> None:
+        redis = get_redis()
+        keys = {self.prefix + key for key, scores in boards.items() if scores}
+        for key, scores in boards.items():
+            if not scores:
+                continue
+            # Built under a scratch key and renamed over the live one, so
+            # readers never see a half-filled set.
+            scratch = f"{self.prefix}rebuild:{key}"
+            pipe = redis.pipeline(transaction=False)
+            pipe.delete(scratch)
+            items = list(scores.items())
+            for start in range(0, len(items), self.chunk_size):
+                pipe.zadd(scratch, dict(items[start:start + self.chunk_size]))
+            pipe.rename(scratch, self.prefix + key)
+            await pipe.execute()
+
+        stale = (await redis.smembers(self.index_key)) - keys
+        pipe = redis.pipeline(transaction=True)
+        if stale:
+            pipe.delete(*stale)
+        pipe.delete(self.index_key)
+        if keys:
+            pipe.sadd(self.index_key, *keys)
+        await pipe.execute()
+
+    async def rank(self, key: str, member: str) -> Optional[tuple[int, float]]:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.zrevrank(self.prefix + key, member)
+        pipe.zscore(self.prefix + key, member)
+        rank, score = await pipe.execute()
+        return None if rank is None else (rank, score)
+
+    async def range(self, key: str, start: int, count: int) -> list[tuple[str, float]]:
+        if count <= 0:
+            return []
+        return await get_redis().zrevrange(
+            self.prefix + key, start, start + count - 1, withscores=True
+        )
+
+    async def size(self, key: str) -> int:
+        return await get_redis().zcard(self.prefix + key)
+
+
+def create_ranking_store() -> RankingStore:
+    if settings.RANKING_BACKEND == "memory":
+        return InMemoryRankingStore()
+    return RedisRankingStore()
@@ -0,0 +1,309 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from jose import JWTError, jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.principal import Principal
+from app.core.redis import get_redis
+from app.dependencies import get_current_user
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window_seconds: int
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_seconds),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.reset_seconds)
+        return headers
+
+
+def _sliding_window(
+    previous: int, current: int, elapsed: float, rate: RateLimit
+) -> tuple[bool, float]:
+    """
+    Sliding-window counter: the previous fixed window's count weighted by how
+    much of it still overlaps the sliding window, plus the current count.
+    """
+    estimate = previous * (1 - elapsed / rate.window_seconds) + current
+    return estimate < rate.limit, estimate
+
+
+def _result(allowed: bool, estimate: float, elapsed: float, rate: RateLimit) -> RateLimitResult:
+    used = estimate + 1 if allowed else estimate
+    return RateLimitResult(
+        allowed=allowed,
+        limit=rate.limit,
+        remaining=max(0, math.floor(rate.limit - used)),
+        reset_seconds=max(1, math.ceil(rate.window_seconds - elapsed)),
+    )
+
+
+class RateLimitStore:
+    """
+    Counts hits per key. `hit()` checks and records a hit atomically.
+    """
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        raise NotImplementedError
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process counters for single-node setups and tests. The event loop
+    runs one hit at a time, so check-and-increment is atomic.
+
+    At most `max_keys` keys are tracked. Keys are kept least recently hit
+    first, and a new key beyond the cap evicts the first one; an evicted
+    client simply starts counting afresh.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [window index, previous count, current count]
+        self._windows: OrderedDict[str, list] = OrderedDict()
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        now = time.time()
+        index, elapsed = divmod(now, rate.window_seconds)
+        index = int(index)
+        key = f"{key}:{rate.window_seconds}"
+
+        window = self._windows.get(key)
+        if window is None:
+            while len(self._windows) >= self.max_keys:
+                self._windows.popitem(last=False)
+            window = self._windows[key] = [index, 0, 0]
+        else:
+            self._windows.move_to_end(key)
+        if window[0] != index:
+            window[1] = window[2] if window[0] == index - 1 else 0
+            window[2] = 0
+            window[0] = index
+
+        allowed, estimate = _sliding_window(window[1], window[2], elapsed, rate)
+        if allowed:
+            window[2] += 1
+        return _result(allowed, estimate, elapsed, rate)
+
+
+# KEYS[1] = current window counter, KEYS[2] = previous window counter
+# ARGV = limit, window seconds, elapsed seconds in the current window
+_SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local estimate = previous * (1 - elapsed / window) + current
+if estimate < limit then
+    redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], window * 2)
+    return {1, tostring(estimate)}
+end
+return {0, tostring(estimate)}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Counters shared by all workers. The check and the increment run in one
+    Lua script, so concurrent hits cannot overshoot the limit.
+    """
+
+    prefix = "ratelimit:"
+
+    def __init__(self):
+        self._script = None
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        if self._script is None:
+            self._script = get_redis().register_script(_SLIDING_WINDOW_SCRIPT)
+        now = time.time()
+        index, elapsed = divmod(now, rate.window_seconds)
+        index = int(index)
+        base = f"{self.prefix}{key}:{rate.window_seconds}:"
+        allowed, estimate = await self._script(
+            keys=[f"{base}{index}", f"{base}{index - 1}"],
+            args=[rate.limit, rate.window_seconds, elapsed],
+        )
+        return _result(bool(allowed), float(estimate), elapsed, rate)
+
+
+def create_rate_limit_store() -> RateLimitStore:
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return InMemoryRateLimitStore()
+    return RedisRateLimitStore()
+
+
+class RateLimiter:
+    """
+    Applies a store to a key, failing open if the store is unavailable: an
+    outage of the shared store must not take the API down with it.
+    """
+
+    def __init__(self, store: RateLimitStore):
+        self.store = store
+        self.errors = 0
+
+    async def hit(self, key: str, rate: RateLimit) -> Optional[RateLimitResult]:
+        try:
+            return await self.store.hit(key, rate)
+        except Exception:
+            self.errors += 1
+            logger.warning("Rate limit store unavailable; allowing request", exc_info=True)
+            return None
+
+
+rate_limiter = RateLimiter(create_rate_limit_store())
+
+ANONYMOUS_RATE = RateLimit(settings.RATE_LIMIT_ANONYMOUS_PER_HOUR, HOUR)
+AUTHENTICATED_RATE = RateLimit(settings.RATE_LIMIT_AUTHENTICATED_PER_HOUR, HOUR)
+LEADER_RATE = RateLimit(settings.RATE_LIMIT_LEADER_PER_HOUR, HOUR)
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" else None
+    return None
+
+
+def _client_tier(scope: Scope) -> tuple[str, RateLimit]:
+    """
+    Pick the global quota for a request without touching the database or
+    the caches: the token's subject decides between anonymous and
+    authenticated, and its `ldr` claim marks group leaders.
+    """
+    token = _bearer_token(scope)
+    if token is not None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            payload = {}
+        user_id = payload.get("sub")
+        if user_id is not None:
+            if payload.get("ldr"):
+                return f"user:{user_id}", LEADER_RATE
+            return f"user:{user_id}", AUTHENTICATED_RATE
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}", ANONYMOUS_RATE
+
+
+class RateLimitMiddleware:
+    """
+    Global per-client quota on HTTP requests, with `X-RateLimit-*` headers.
+
+    Routes with their own, tighter quota (see `limit_route`) report that one
+    in the headers instead.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter = rate_limiter,
+        exempt_prefixes: tuple[str, ...] = ("/health", "/metrics"),
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_prefixes = exempt_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        key, rate = _client_tier(scope)
+        result = await self.limiter.hit(key, rate)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not result.allowed:
+            response = Response(
+                content='{"detail":"Rate limit exceeded"}',
+                status_code=429,
+                media_type="application/json",
+                headers=result.headers(),
+            )
+            await response(scope, receive, send)
+            return
+
+        extra = [(k.lower().encode(), v.encode()) for k, v in result.headers().items()]
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                present = {name.lower() for name, _ in message.get("headers", [])}
+                message["headers"] = list(message.get("headers", [])) + [
+                    header for header in extra if header[0] not in present
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+async def _enforce(limiter: RateLimiter, key: str, rate: RateLimit, response: Response) -> None:
+    result = await limiter.hit(key, rate)
+    if result is None:
+        return
+    if not result.allowed:
+        raise HTTPException(status_code=429, detail="Rate limit exceeded", headers=result.headers())
+    for header, value in result.headers().items():
+        response.headers[header] = value
+
+
+def limit_route(
+    name: str,
+    rate: RateLimit,
+    key: Callable[[Request], str],
+    limiter: RateLimiter = rate_limiter,
+):
+    """
+    Dependency enforcing a quota on one route, keyed by `key(request)`.
+    """
+
+    async def dependency(request: Request, response: Response) -> None:
+        await _enforce(limiter, f"{name}:{key(request)}", rate, response)
+
+    return dependency
+
+
+def limit_user(name: str, rate: RateLimit, limiter: RateLimiter = rate_limiter):
+    """
+    Dependency enforcing a per-user quota on one route.
+    """
+
+    async def dependency(
+        response: Response, current_user: Principal = Depends(get_current_user)
+    ) -> None:
+        await _enforce(limiter, f"{name}:{current_user.id}", rate, response)
+
+    return dependency
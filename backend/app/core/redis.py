@@ -0,0 +1,25 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.config import settings
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Redis:
+    global _redis
+    if _redis is None:
+        _redis = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            decode_responses=True,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
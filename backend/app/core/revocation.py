@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.pubsub import PubSub, create_pubsub
+from app.models.auth import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL = "revoked"
+
+
+def _lifetime() -> timedelta:
+    # An access token of a revoked family is dead once it expires, so the
+    # revocation only has to be remembered that long (plus clock leeway).
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES, seconds=30)
+
+
+class RevocationIndex:
+    """
+    Token families revoked within the last access-token lifetime, checked
+    on every authenticated request.
+
+    Revoking commits `revoked_at` in refresh_tokens and then calls revoke(),
+    which records the families here and broadcasts them to every worker.
+    Each worker also reloads the recent revocations from the partial index
+    on startup and every resync interval, which covers messages missed
+    while it was starting or disconnected.
+
+    Entries expire with the last access token they could cover, so the set
+    stays as small as the number of logouts in one access-token lifetime
+    and is_revoked() is a dict probe that never touches the database.
+    """
+
+    def __init__(self, pubsub: PubSub):
+        self.pubsub = pubsub
+        # family id -> unix time the entry can be dropped
+        self._expiry: dict[str, float] = {}
+        self.revoked = 0
+        self.received = 0
+        self.purged = 0
+
+    def is_revoked(self, family_id: Optional[str]) -> bool:
+        if family_id is None or not self._expiry:
+            return False
+        expires = self._expiry.get(family_id)
+        return expires is not None and expires > time.time()
+
+    def _add(self, family_ids: Iterable[str], expires: float) -> None:
+        for family_id in family_ids:
+            if self._expiry.get(family_id, 0.0) < expires:
+                self._expiry[family_id] = expires
+
+    async def revoke(self, family_ids: Iterable[Any], revoked_at: datetime) -> None:
+        family_ids = [str(f) for f in family_ids]
+        if not family_ids:
+            return
+        expires = (revoked_at + _lifetime()).timestamp()
+        self._add(family_ids, expires)
+        self.revoked += len(family_ids)
+        try:
+            await self.pubsub.publish(
+                _CHANNEL, json.dumps({"families": family_ids, "expires": expires})
+            )
+        except Exception:
+            # Other workers pick it up from the database on their next resync.
+            logger.exception("Broadcasting token revocation failed")
+
+    def _receive(self, channel: str, message: str) -> None:
+        if channel != _CHANNEL:
+            return
+        data = json.loads(message)
+        self._add(data["families"], data["expires"])
+        self.received += 1
+
+    def purge(self) -> int:
+        now = time.time()
+        expired = [f for f, expires in self._expiry.items() if expires <= now]
+        for family_id in expired:
+            del self._expiry[family_id]
+        self.purged += len(expired)
+        return len(expired)
+
+    async def load(self, db: AsyncSession) -> int:
+        since = datetime.now(timezone.utc) - _lifetime()
+        result = await db.execute(
+            select(RefreshToken.family_id, RefreshToken.revoked_at)
+            .where(RefreshToken.revoked_at > since)
+            .distinct()
+        )
+        rows = result.all()
+        for family_id, revoked_at in rows:
+            self._add([str(family_id)], (revoked_at + _lifetime()).timestamp())
+        return len(rows)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self.pubsub.listen(self._receive)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Revocation subscription failed; resubscribing")
+                await asyncio.sleep(1)
+
+    async def run(self, session_factory, resync_seconds: int) -> None:
+        listener = asyncio.create_task(self._listen(), name="revocation-listener")
+        try:
+            while True:
+                try:
+                    async with session_factory() as db:
+                        await self.load(db)
+                except Exception:
+                    logger.exception("Loading token revocations failed")
+                self.purge()
+                await asyncio.sleep(resync_seconds)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._expiry),
+            "revoked": self.revoked,
+            "received": self.received,
+            "purged": self.purged,
+        }
+
+
+revocations = RevocationIndex(create_pubsub(prefix="auth:"))
@@ -1,3 +1,6 @@
+import hashlib
+import hmac
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
 
@@ -8,23 +11,43 @@ from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    family_id: Optional[uuid.UUID] = None,
+    is_leader: bool = False,
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {"exp": expire, "sub": str(subject)}
+    if family_id is not None:
+        # The login session it belongs to, so revoking the session revokes it
+        to_encode["fam"] = str(family_id)
+    if is_leader:
+        # Rate-limit tier, read without a lookup; refreshed with the token
+        to_encode["ldr"] = True
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def create_refresh_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+def create_refresh_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    jti: Optional[uuid.UUID] = None,
+    family_id: Optional[uuid.UUID] = None,
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    if jti is not None:
+        to_encode["jti"] = str(jti)
+    if family_id is not None:
+        to_encode["fam"] = str(family_id)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -34,12 +57,66 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def _lookup_key(version: int) -> bytes:
+    key = settings.LOOKUP_HASH_KEYS.get(version)
+    if key is None:
+        # No key configured for this version: derive one from SECRET_KEY so
+        # development setups work without extra configuration.
+        return hmac.new(
+            settings.SECRET_KEY.encode(), f"lookup-v{version}".encode(), hashlib.sha256
+        ).digest()
+    return key.encode()
+
+def _lookup_digest(purpose: str, value: str, version: int) -> str:
+    digest = hmac.new(
+        _lookup_key(version), f"{purpose}:{value}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"v{version}${digest}"
+
+def _lookup_versions() -> list[int]:
+    current = settings.LOOKUP_HASH_KEY_VERSION
+    return [current] + sorted(
+        (v for v in settings.LOOKUP_HASH_KEYS if v != current), reverse=True
+    )
+
+def normalize_phone_number(phone: str) -> str:
+    return "".join(c for c in phone.strip() if c.isdigit() or c == "+")
+
+def normalize_personal_id(personal_id: str) -> str:
+    return personal_id.strip()
+
 def hash_phone_number(phone: str) -> str:
-    # In a real app, use a salt and a strong hashing algorithm
-    # For now, we'll just use a simple hash for demonstration
-    return pwd_context.hash(phone)
+    """
+    Deterministic keyed digest of a phone number, usable as a unique index key.
+    """
+    return _lookup_digest("phone", normalize_phone_number(phone), settings.LOOKUP_HASH_KEY_VERSION)
 
 def hash_personal_id(personal_id: str) -> str:
-    # In a real app, use encryption (AES) so it can be decrypted by authorized personnel
-    # For now, we'll use hashing for demonstration
-    return pwd_context.hash(personal_id)
+    """
+    Deterministic keyed digest of a personal ID, usable as a unique index key.
+    """
+    return _lookup_digest("personal_id", normalize_personal_id(personal_id), settings.LOOKUP_HASH_KEY_VERSION)
+
+def phone_number_lookup_keys(phone: str) -> list[str]:
+    """
+    Digests of a phone number under every known key version, current first.
+    """
+    value = normalize_phone_number(phone)
+    return [_lookup_digest("phone", value, v) for v in _lookup_versions()]
+
+def personal_id_lookup_keys(personal_id: str) -> list[str]:
+    """
+    Digests of a personal ID under every known key version, current first.
+    """
+    value = normalize_personal_id(personal_id)
+    return [_lookup_digest("personal_id", value, v) for v in _lookup_versions()]
+
+def lookup_hash_needs_update(stored: Optional[str]) -> bool:
+    return not stored or not stored.startswith(f"v{settings.LOOKUP_HASH_KEY_VERSION}$")
+
+def is_legacy_lookup_hash(stored: Optional[str]) -> bool:
+    # Digests written before lookup keys existed are salted bcrypt hashes.
+    return bool(stored) and stored.startswith("$2")
+
+def verify_legacy_lookup_hash(value: str, stored: str) -> bool:
+    return pwd_context.verify(value, stored)
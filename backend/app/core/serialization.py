@@ -0,0 +1,55 @@
+import decimal
+import ipaddress
+import uuid
+from functools import lru_cache
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # orjson handles str enums, datetimes and uuid.UUID itself; this covers
+    # the rest the database drivers hand back.
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, uuid.UUID):
+        # Driver subclasses such as asyncpg's UUID
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded by orjson, skipping jsonable_encoder.
+
+    Handlers on hot paths return it directly with plain dicts built from
+    result rows; the route's response_model then only documents the shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def columns(schema: type[BaseModel], model: Any) -> tuple:
+    """
+    The columns of `model` a response schema exposes, to select instead of
+    the entity so rows come back as tuples rather than ORM instances.
+    """
+    return tuple(getattr(model, name) for name in schema.model_fields)
+
+
+def row_dicts(rows: Iterable[Any]) -> list[dict[str, Any]]:
+    return [row._asdict() for row in rows]
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+
+class BootReport:
+    """
+    How long each phase of this worker's startup took.
+
+    The app module records its import time; the lifespan handler runs the
+    warm-up phases through phase() before the worker accepts requests, so
+    the first request does not pay for them.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.failed: list[str] = []
+        self.ready = False
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+
+    async def phase(
+        self, name: str, step: Callable[[], Awaitable[Any]], required: bool = False
+    ) -> None:
+        """
+        Run and time one warm-up step. A failed optional step is logged and
+        skipped: whatever it would have warmed happens on first use instead.
+        """
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception:
+            if required:
+                raise
+            self.failed.append(name)
+            logger.exception("Startup phase %s failed", name)
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def finish(self) -> None:
+        self.ready = True
+        logger.info(
+            "Worker ready in %.3fs (%s)",
+            sum(self.phases.values()),
+            ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items()),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "boot_seconds": sum(self.phases.values()),
+            "phases": dict(self.phases),
+            "failed": list(self.failed),
+        }
+
+
+boot = BootReport()
+
+
+async def warm_pool(engine: AsyncEngine, connections: Optional[int]) -> None:
+    """
+    Open up to `connections` pooled connections at once and hand them back,
+    so early requests skip the connect and authentication round trips.
+    """
+    if connections is None or connections <= 0 or isinstance(engine.sync_engine.pool, NullPool):
+        return
+    opened = [engine.connect() for _ in range(min(connections, engine.sync_engine.pool.size()))]
+    try:
+        await asyncio.gather(*(connection.start() for connection in opened))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened), return_exceptions=True)
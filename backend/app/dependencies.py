@@ -1,3 +1,4 @@
+import uuid
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,7 +10,10 @@ from sqlalchemy import select
 from app.core import security
 from app.config import settings
 from app.core.database import get_db
+from app.core.principal import Principal, cache_principal, get_cached_principal
+from app.core.revocation import revocations
 from app.models.user import User
+from app.services.group_counters import is_leader_clause
 from app.utils.enums import UserRole, UserStatus
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -19,41 +23,64 @@ reusable_oauth2 = OAuth2PasswordBearer(
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(reusable_oauth2)
-) -> User:
+) -> Principal:
+    return await authenticate(db, token)
+
+async def authenticate(db: AsyncSession, token: str) -> Principal:
+    """
+    Resolve a bearer token to its Principal; shared by HTTP and WebSocket auth.
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = payload.get("sub")
-        if token_data is None:
+        if token_data is None or payload.get("type") == "refresh":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Could not validate credentials",
             )
-    except (JWTError, ValidationError):
+        user_id = uuid.UUID(token_data)
+    except (JWTError, ValidationError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-        
-    result = await db.execute(select(User).where(User.id == token_data))
-    user = result.scalars().first()
-    
-    if not user:
+    # In-process set lookup; never a database round trip.
+    if revocations.is_revoked(payload.get("fam")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token has been revoked",
+        )
+
+    principal = await get_cached_principal(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(
+        select(
+            User.id, User.role, User.status, User.territory_id, User.ateuli_id, is_leader_clause()
+        ).where(User.id == user_id)
+    )
+    row = result.first()
+
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
-        
-    return user
+
+    principal = Principal(*row)
+    await cache_principal(principal)
+    return principal
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if current_user.status != UserStatus.ACTIVE:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 def get_current_geder(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if current_user.role != UserRole.GEDER:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
@@ -1,16 +1,131 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+# Before anything heavy, to time the imports below
+from app.core.import_clock import IMPORT_STARTED
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import configure_mappers
 
+from app.api.v1 import api_router, events
 from app.config import settings
-# from app.api.v1 import api_router
+from app.core import background
+from app.core.audit import audit_sink
+from app.core.crypto import CryptoPoolSaturated, crypto_executor
+from app.core.database import AsyncSessionLocal, engine, pool_stats, read_engine
+from app.core.hub import hub
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.principal import principal_cache
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.revocation import revocations
+from app.core.serialization import FastJSONResponse
+from app.core.startup import boot, warm_pool
+from app.services.election_results import run_results_refresher
+from app.services.group_counters import run_reconciler
+from app.services.leaderboard import leaderboards, run_leaderboard_rebuild
+from app.services.notifications import run_partition_maintainer
+from app.services.placement import run_placement
+from app.services.refresh_tokens import run_refresh_token_purge
+from app.services.sos_escalation import escalation_scheduler
+from app.services.territories import territory_snapshot
+from app.services.vote_tally import run_tally_folder
+
+# Routers and the whole model graph, the bulk of a worker's boot time.
+boot.record("import", time.perf_counter() - IMPORT_STARTED)
+
+async def start_background_jobs():
+    audit_sink.start(AsyncSessionLocal)
+    hub.start()
+    if settings.GROUP_COUNTER_RECONCILE_SECONDS:
+        background.spawn(
+            run_reconciler(AsyncSessionLocal, settings.GROUP_COUNTER_RECONCILE_SECONDS),
+            name="group-counter-reconciler",
+        )
+    if settings.ELECTION_TALLY_FOLD_SECONDS:
+        background.spawn(
+            run_tally_folder(AsyncSessionLocal, settings.ELECTION_TALLY_FOLD_SECONDS),
+            name="vote-tally-folder",
+        )
+    if settings.ELECTION_RESULTS_REFRESH_SECONDS:
+        background.spawn(
+            run_results_refresher(AsyncSessionLocal, settings.ELECTION_RESULTS_REFRESH_SECONDS),
+            name="election-results-refresher",
+        )
+    if settings.NOTIFICATION_PARTITION_CHECK_SECONDS:
+        background.spawn(
+            run_partition_maintainer(AsyncSessionLocal, settings.NOTIFICATION_PARTITION_CHECK_SECONDS),
+            name="notification-partition-maintainer",
+        )
+    if settings.ATEULI_PLACEMENT_SECONDS:
+        background.spawn(
+            run_placement(AsyncSessionLocal, settings.ATEULI_PLACEMENT_SECONDS),
+            name="ateuli-placement",
+        )
+    if settings.SOS_ESCALATION_RESYNC_SECONDS:
+        background.spawn(
+            escalation_scheduler.run(AsyncSessionLocal, settings.SOS_ESCALATION_RESYNC_SECONDS),
+            name="sos-escalation-scheduler",
+        )
+    if settings.LEADERBOARD_REBUILD_SECONDS:
+        background.spawn(
+            run_leaderboard_rebuild(AsyncSessionLocal, settings.LEADERBOARD_REBUILD_SECONDS),
+            name="leaderboard-rebuild",
+        )
+    if settings.TOKEN_REVOCATION_RESYNC_SECONDS:
+        background.spawn(
+            revocations.run(AsyncSessionLocal, settings.TOKEN_REVOCATION_RESYNC_SECONDS),
+            name="token-revocation-sync",
+        )
+    if settings.REFRESH_TOKEN_PURGE_SECONDS:
+        background.spawn(
+            run_refresh_token_purge(AsyncSessionLocal, settings.REFRESH_TOKEN_PURGE_SECONDS),
+            name="refresh-token-purge",
+        )
+
+async def stop_background_jobs():
+    await hub.stop()
+    await background.cancel_all()
+    await audit_sink.stop()
+
+async def _configure_mappers():
+    configure_mappers()
+
+async def _load_territory_snapshot():
+    async with AsyncSessionLocal() as db:
+        await territory_snapshot.get(db)
+
+async def _warm_pools():
+    await asyncio.gather(*(
+        warm_pool(db_engine, settings.DB_POOL_WARM_CONNECTIONS)
+        for db_engine in {engine, read_engine}
+    ))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Work that would otherwise land on the first requests after a scale-up:
+    # resolving the string-referenced relationships of every mapper, opening
+    # database connections and loading the territory tree.
+    await boot.phase("configure_mappers", _configure_mappers, required=True)
+    await boot.phase("warm_pool", _warm_pools)
+    await boot.phase("territory_snapshot", _load_territory_snapshot)
+    await start_background_jobs()
+    boot.finish()
+    yield
+    await stop_background_jobs()
 
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
 )
 
+app.add_middleware(RateLimitMiddleware)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -21,8 +136,82 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Outermost, so throttled and CORS preflight requests are measured too.
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(CryptoPoolSaturated)
+async def crypto_pool_saturated(request: Request, exc: CryptoPoolSaturated):
+    # Backpressure: the login storm is shed, not queued without bound.
+    return FastJSONResponse(
+        {"detail": "Server busy, try again shortly"},
+        status_code=503,
+        headers={"Retry-After": str(settings.CRYPTO_RETRY_AFTER_SECONDS)},
+    )
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "version": "0.1.0"}
 
-# app.include_router(api_router, prefix=settings.API_V1_STR)
+@app.get("/health/cache")
+def cache_stats():
+    return {"principal": principal_cache.stats()}
+
+@app.get("/health/crypto")
+def crypto_stats():
+    return crypto_executor.stats()
+
+@app.get("/health/audit")
+def audit_stats():
+    return audit_sink.stats()
+
+@app.get("/health/ws")
+def websocket_stats():
+    return hub.stats()
+
+@app.get("/health/rate-limit")
+def rate_limit_stats():
+    return {"store_errors": rate_limiter.errors}
+
+@app.get("/health/sos")
+def sos_escalation_stats():
+    return escalation_scheduler.stats()
+
+@app.get("/health/leaderboard")
+def leaderboard_stats():
+    return leaderboards.stats()
+
+@app.get("/health/auth")
+def auth_stats():
+    return {"revocations": revocations.stats()}
+
+@app.get("/health/startup")
+def startup_stats():
+    return boot.stats()
+
+@app.get("/health/db")
+def database_stats():
+    return pool_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    """
+    gauges = {}
+    for name, stats in pool_stats().items():
+        if "checked_out" in stats:
+            gauges[f"db_pool_{name}_checked_out"] = (
+                f"Connections checked out of the {name} pool.", stats["checked_out"]
+            )
+            gauges[f"db_pool_{name}_saturation"] = (
+                f"Share of the {name} pool in use.", stats["saturation"]
+            )
+    cache = principal_cache.stats()
+    lookups = cache["local_hits"] + cache["local_misses"]
+    gauges["principal_cache_hit_ratio"] = (
+        "Local principal cache hits per lookup.", cache["local_hits"] / lookups if lookups else 0.0
+    )
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
+
+app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(events.router)
@@ -2,9 +2,10 @@ from app.models.base import Base
 from app.models.user import User, GeDVerification, DeviceFingerprint
 from app.models.territory import Territory
 from app.models.group import Ateuli, Ormotsdaateuli, Aseuli, Ataseuli
-from app.models.endorsement import Endorsement
+from app.models.endorsement import Endorsement, GeDerCapacity
 from app.models.election import Election, ElectionCandidate, Vote
 from app.models.sos import SOSSignal, SOSEscalation
 from app.models.initiative import Initiative, InitiativeSupport
 from app.models.arbitration import ArbitrationCase
 from app.models.audit import AuditLog, Notification
+from app.models.auth import RefreshToken
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, ForeignKey, Enum, Text, DateTime
+from sqlalchemy import String, ForeignKey, Enum, Text, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -26,3 +26,7 @@ class ArbitrationCase(Base):
     plaintiff: Mapped["User"] = relationship("User", foreign_keys=[plaintiff_id])
     defendant: Mapped["User"] = relationship("User", foreign_keys=[defendant_id])
     arbitrator: Mapped[Optional["User"]] = relationship("User", foreign_keys=[arbitrator_id])
+
+    __table_args__ = (
+        Index("idx_arbitration_cases_created_at_id", "created_at", "id"),
+    )
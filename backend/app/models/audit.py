@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
 from typing import Optional, Any
-from sqlalchemy import String, ForeignKey, Text, DateTime, JSON
-from sqlalchemy.dialects.postgresql import INET
+from sqlalchemy import String, ForeignKey, Text, DateTime, JSON, Index, PrimaryKeyConstraint, text
+from sqlalchemy.dialects.postgresql import INET, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
 
 from app.models.base import Base
 
@@ -24,10 +25,19 @@ class AuditLog(Base):
     # Relationships
     user: Mapped[Optional["User"]] = relationship("User")
 
+    __table_args__ = (
+        Index("idx_audit_logs_created_at_id", "created_at", "id"),
+    )
+
 
 class Notification(Base):
     __tablename__ = "notifications"
 
+    # Range-partitioned by month on created_at, which must therefore be part
+    # of the primary key. Partitions are created by ensure_notification_partitions().
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     type: Mapped[str] = mapped_column(String(100), nullable=False)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
@@ -37,3 +47,10 @@ class Notification(Base):
 
     # Relationships
     user: Mapped["User"] = relationship("User")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        Index("idx_notifications_user_created_at_id", "user_id", "created_at", "id"),
+        Index("idx_notifications_unread", "user_id", postgresql_where=text("read_at IS NULL")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import ForeignKey, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class RefreshToken(Base):
+    """
+    One issued refresh token; `id` is the token's `jti`.
+
+    Every login starts a family and each refresh rotates within it: the
+    presented token is marked used and a new one issued. A used token
+    presented again means it leaked, and the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    family_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    user: Mapped["User"] = relationship("User")
+
+    __table_args__ = (
+        Index("idx_refresh_tokens_family_id", "family_id"),
+        Index("idx_refresh_tokens_user_id", "user_id", postgresql_where=text("revoked_at IS NULL")),
+        Index("idx_refresh_tokens_expires_at", "expires_at"),
+        # Families revoked recently, loaded into every worker's revocation index
+        Index(
+            "idx_refresh_tokens_revoked_at", "revoked_at",
+            postgresql_where=text("revoked_at IS NOT NULL"),
+        ),
+    )
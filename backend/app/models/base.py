@@ -1,6 +1,5 @@
 import uuid
 from datetime import datetime
-from typing import Any
 
 from sqlalchemy import Column, DateTime
 from sqlalchemy.dialects.postgresql import UUID
@@ -23,9 +22,3 @@ class Base(DeclarativeBase):
     deleted_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
-
-    def dict(self) -> dict[str, Any]:
-        return {
-            c.name: getattr(self, c.name) 
-            for c in self.__table__.columns
-        }
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, ForeignKey, Enum, Integer, Text, DateTime, UniqueConstraint
+from sqlalchemy import String, ForeignKey, Enum, Integer, Text, DateTime, Boolean, UniqueConstraint, Index, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -29,6 +30,10 @@ class Election(Base):
     candidates: Mapped[List["ElectionCandidate"]] = relationship("ElectionCandidate", back_populates="election")
     votes: Mapped[List["Vote"]] = relationship("Vote", back_populates="election")
 
+    __table_args__ = (
+        Index("idx_elections_created_at_id", "created_at", "id"),
+    )
+
 
 class ElectionCandidate(Base):
     __tablename__ = "election_candidates"
@@ -56,6 +61,8 @@ class Vote(Base):
     candidate_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("election_candidates.id"), nullable=False)
     vote_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     cast_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Set once the vote has been folded into ElectionCandidate.vote_count
+    tallied: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
     # Relationships
     election: Mapped["Election"] = relationship("Election", back_populates="votes")
@@ -64,4 +71,5 @@ class Vote(Base):
 
     __table_args__ = (
         UniqueConstraint('election_id', 'voter_id', name='unique_vote_per_election'),
+        Index('idx_votes_untallied', 'election_id', 'candidate_id', postgresql_where=text('NOT tallied')),
     )
@@ -1,10 +1,12 @@
+import random
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import ForeignKey, Enum, Boolean, Text, DateTime
+from sqlalchemy import ForeignKey, Enum, Boolean, Text, DateTime, Float, Index, Integer, event, inspect, text, update
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.models.user import User
 from app.utils.enums import EndorsementStatus
 
 class Endorsement(Base):
@@ -23,3 +25,46 @@ class Endorsement(Base):
     # Relationships
     geder: Mapped["User"] = relationship("User", foreign_keys=[geder_id], back_populates="endorsements_given")
     supporter: Mapped["User"] = relationship("User", foreign_keys=[supporter_id], back_populates="endorsement_received")
+
+
+class GeDerCapacity(Base):
+    """
+    How many more supporters a GeDer can endorse, kept up to date by
+    app.services.endorsements so finding available GeDers needs no COUNT
+    over endorsements.
+
+    territory_id is the GeDer's, copied for the sampling index and kept in
+    sync by the mapper event below.
+    """
+    __tablename__ = "geder_capacities"
+
+    geder_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), unique=True, nullable=False)
+    territory_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("territories.id"), nullable=True)
+    approved_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pending_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    remaining: Mapped[int] = mapped_column(Integer, nullable=False)
+    penalized: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Uniform in [0, 1); re-drawn on every approval so random samples rotate.
+    sample_key: Mapped[float] = mapped_column(Float, nullable=False, default=random.random)
+
+    __table_args__ = (
+        Index(
+            "idx_geder_capacities_territory_remaining", "territory_id", "remaining",
+            postgresql_where=text("NOT penalized"),
+        ),
+        Index(
+            "idx_geder_capacities_territory_sample", "territory_id", "sample_key",
+            postgresql_where=text("NOT penalized AND remaining > 0"),
+        ),
+    )
+
+
+@event.listens_for(User, "after_update")
+def _move_capacity(mapper, connection, target: User) -> None:
+    # Bulk UPDATEs of users.territory_id bypass this and must move the row too.
+    if inspect(target).attrs.territory_id.history.has_changes():
+        connection.execute(
+            update(GeDerCapacity.__table__)
+            .where(GeDerCapacity.__table__.c.geder_id == target.id)
+            .values(territory_id=target.territory_id)
+        )
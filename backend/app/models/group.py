@@ -10,8 +10,8 @@ class Ateuli(Base):
     __tablename__ = "ateulis"
 
     name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
-    territory_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("territories.id"), nullable=False)
-    atistavi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    territory_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("territories.id"), nullable=False, index=True)
+    atistavi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
     ormotsdaateuli_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("ormotsdaateulis.id"), nullable=True)
     member_count: Mapped[int] = mapped_column(Integer, default=0)
     status: Mapped[GroupStatus] = mapped_column(Enum(GroupStatus), nullable=False, default=GroupStatus.FORMING)
@@ -28,7 +28,7 @@ class Ormotsdaateuli(Base):
 
     name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     territory_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("territories.id"), nullable=False)
-    leader_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    leader_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
     aseuli_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("aseulis.id"), nullable=True)
     ateuli_count: Mapped[int] = mapped_column(Integer, default=0)
     member_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -46,7 +46,7 @@ class Aseuli(Base):
 
     name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     territory_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("territories.id"), nullable=False)
-    asistavi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    asistavi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
     ataseuli_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("ataseulis.id"), nullable=True)
     ormotsdaateuli_count: Mapped[int] = mapped_column(Integer, default=0)
     member_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -64,7 +64,7 @@ class Ataseuli(Base):
 
     name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     territory_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("territories.id"), nullable=False)
-    atasistavi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    atasistavi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
     aseuli_count: Mapped[int] = mapped_column(Integer, default=0)
     member_count: Mapped[int] = mapped_column(Integer, default=0)
     status: Mapped[GroupStatus] = mapped_column(Enum(GroupStatus), nullable=False, default=GroupStatus.FORMING)
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, ForeignKey, Enum, Integer, Text, DateTime, UniqueConstraint
+from sqlalchemy import String, ForeignKey, Enum, Integer, Text, DateTime, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -31,6 +32,10 @@ class Initiative(Base):
     assigned_to: Mapped[Optional["User"]] = relationship("User", foreign_keys=[assigned_to_id])
     supports: Mapped[List["InitiativeSupport"]] = relationship("InitiativeSupport", back_populates="initiative")
 
+    __table_args__ = (
+        Index("idx_initiatives_created_at_id", "created_at", "id"),
+    )
+
 
 class InitiativeSupport(Base):
     __tablename__ = "initiative_supports"
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, ForeignKey, Enum, Text, DateTime
+from sqlalchemy import String, ForeignKey, Enum, Text, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -25,12 +25,23 @@ class SOSSignal(Base):
     
     current_level: Mapped[HierarchyLevel] = mapped_column(Enum(HierarchyLevel), nullable=False, default=HierarchyLevel.ATEULI)
     resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # When the signal moves up a level unless handled first; NULL once it is
+    # closed or has nowhere left to go.
+    escalate_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     reporter: Mapped["User"] = relationship("User", foreign_keys=[reporter_id])
     verifier: Mapped[Optional["User"]] = relationship("User", foreign_keys=[verifier_id])
     escalations: Mapped[List["SOSEscalation"]] = relationship("SOSEscalation", back_populates="signal")
 
+    __table_args__ = (
+        Index("idx_sos_signals_created_at_id", "created_at", "id"),
+        Index(
+            "idx_sos_signals_escalate_at", "escalate_at",
+            postgresql_where=text("escalate_at IS NOT NULL"),
+        ),
+    )
+
 
 class SOSEscalation(Base):
     __tablename__ = "sos_escalations"
@@ -38,10 +49,11 @@ class SOSEscalation(Base):
     signal_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sos_signals.id"), nullable=False)
     from_level: Mapped[HierarchyLevel] = mapped_column(Enum(HierarchyLevel), nullable=False)
     to_level: Mapped[HierarchyLevel] = mapped_column(Enum(HierarchyLevel), nullable=False)
-    escalated_by_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # NULL for escalations made by the scheduler when a deadline passed
+    escalated_by_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
     escalated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relationships
     signal: Mapped["SOSSignal"] = relationship("SOSSignal", back_populates="escalations")
-    escalated_by: Mapped["User"] = relationship("User")
+    escalated_by: Mapped[Optional["User"]] = relationship("User")
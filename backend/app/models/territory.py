@@ -1,6 +1,7 @@
+import uuid
 from typing import Optional, List
-from sqlalchemy import String, ForeignKey, Enum, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, ForeignKey, Enum, Text, Index, event, select, update, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, attributes
 
 from app.models.base import Base
 from app.utils.enums import TerritoryType
@@ -13,6 +14,10 @@ class Territory(Base):
     type: Mapped[TerritoryType] = mapped_column(Enum(TerritoryType), nullable=False)
     parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("territories.id"), nullable=True)
     code: Mapped[Optional[str]] = mapped_column(String(50), unique=True, nullable=True)
+
+    # Materialized path of ids from the root, e.g. "/<root>/<child>/<self>/".
+    # Maintained by the mapper events below; a subtree is a prefix match.
+    path: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Hierarchical relationship
     parent: Mapped[Optional["Territory"]] = relationship("Territory", remote_side="Territory.id", back_populates="children")
@@ -25,5 +30,49 @@ class Territory(Base):
     aseulis: Mapped[List["Aseuli"]] = relationship("Aseuli", back_populates="territory")
     ataseulis: Mapped[List["Ataseuli"]] = relationship("Ataseuli", back_populates="territory")
 
+    __table_args__ = (
+        Index("idx_territories_path", "path", postgresql_ops={"path": "text_pattern_ops"}),
+    )
+
     def __repr__(self):
         return f"<Territory {self.name} ({self.type})>"
+
+
+def _build_path(connection, target: Territory) -> str:
+    if target.parent_id is None:
+        return f"/{target.id}/"
+    parent = target.__dict__.get("parent")
+    if parent is not None and parent.id == target.parent_id and parent.path:
+        parent_path = parent.path
+    else:
+        parent_path = connection.execute(
+            select(Territory.path).where(Territory.id == target.parent_id)
+        ).scalar_one()
+    return f"{parent_path}{target.id}/"
+
+
+@event.listens_for(Territory, "before_insert")
+def _set_path_on_insert(mapper, connection, target: Territory) -> None:
+    if target.id is None:
+        target.id = uuid.uuid4()
+    target.path = _build_path(connection, target)
+
+
+@event.listens_for(Territory, "before_update")
+def _move_subtree_on_reparent(mapper, connection, target: Territory) -> None:
+    if not attributes.get_history(target, "parent_id").has_changes():
+        return
+
+    old_path = target.path
+    new_path = _build_path(connection, target)
+    if new_path.startswith(old_path):
+        raise ValueError("A territory cannot be moved under its own subtree")
+
+    # Rewrite the prefix of every descendant in one statement; the row itself
+    # is written by the pending UPDATE.
+    connection.execute(
+        update(Territory)
+        .where(Territory.path.startswith(old_path, autoescape=True), Territory.id != target.id)
+        .values(path=new_path + func.substr(Territory.path, len(old_path) + 1))
+    )
+    target.path = new_path
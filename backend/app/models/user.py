@@ -1,25 +1,34 @@
 import uuid
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, ForeignKey, Enum, Boolean, Text, DateTime
+from sqlalchemy import String, ForeignKey, Enum, Boolean, Text, DateTime, Index, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
 from app.utils.enums import UserRole, UserStatus
+from app.utils.transliteration import normalize_search_text
 
 class User(Base):
     __tablename__ = "users"
 
     phone_number: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
+    phone_hash: Mapped[Optional[str]] = mapped_column(String(255), unique=True, nullable=True)
     phone_verified_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     personal_id_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    full_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    # full_name folded by normalize_search_text(); kept in sync by the mapper
+    # events below. Also has a trigram index, created by migration 0004.
+    search_name: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), nullable=False, default=UserRole.UNVERIFIED)
     status: Mapped[Optional[UserStatus]] = mapped_column(Enum(UserStatus), nullable=True)
     is_diaspora: Mapped[bool] = mapped_column(Boolean, default=False)
     
-    territory_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("territories.id"), nullable=True)
+    territory_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("territories.id"), nullable=True, index=True)
     ateuli_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("ateulis.id"), nullable=True)
     tavdebi_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    # Set while the user waits for the placement job to put them into an
+    # Ateuli; cleared once they are in one, however they got there.
+    placement_requested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     constitution_agreed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     onboarding_completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -47,10 +56,27 @@ class User(Base):
     led_aseuli: Mapped[Optional["Aseuli"]] = relationship("Aseuli", back_populates="asistavi", foreign_keys="Aseuli.asistavi_id")
     led_ataseuli: Mapped[Optional["Ataseuli"]] = relationship("Ataseuli", back_populates="atasistavi", foreign_keys="Ataseuli.atasistavi_id")
 
+    __table_args__ = (
+        Index("idx_users_search_name_prefix", "search_name", postgresql_ops={"search_name": "text_pattern_ops"}),
+        # Users waiting for Ateuli placement, in the order the placement job reads them.
+        Index(
+            "idx_users_unplaced", "territory_id", "id",
+            postgresql_where=text(
+                "placement_requested_at IS NOT NULL AND ateuli_id IS NULL AND deleted_at IS NULL"
+            ),
+        ),
+    )
+
     def __repr__(self):
         return f"<User {self.phone_number} ({self.role})>"
 
 
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _set_search_name(mapper, connection, target: User) -> None:
+    target.search_name = normalize_search_text(target.full_name) if target.full_name else None
+
+
 class GeDVerification(Base):
     __tablename__ = "ged_verifications"
 
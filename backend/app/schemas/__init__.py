@@ -0,0 +1,29 @@
+from app.schemas.base import Page, PageMeta, Schema
+from app.schemas.user import UserProfile, UserSearchResult
+from app.schemas.territory import TerritoryDetail, TerritoryOut, TerritoryStatistics
+from app.schemas.group import AteuliOut
+from app.schemas.endorsement import (
+    AvailableGeDer,
+    EndorsementRequested,
+    EndorsementRequestIn,
+    EndorsementRevokeIn,
+)
+from app.schemas.election import CastVoteOut, ElectionOut, VoteReceipt
+from app.schemas.sos import SOSSignalIn, SOSSignalOut
+from app.schemas.initiative import (
+    InitiativeOut,
+    InitiativeProgress,
+    InitiativeSupported,
+    InitiativeSupportIn,
+    SupportReceipt,
+)
+from app.schemas.notification import NotificationOut
+from app.schemas.arbitration import ArbitrationCaseOut
+from app.schemas.gamification import (
+    Leaderboard,
+    LeaderboardEntry,
+    MetricStandings,
+    Progress,
+    Standing,
+)
+from app.schemas.auth import LogoutIn, RefreshTokenIn, TokenPair
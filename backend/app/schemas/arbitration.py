@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from app.schemas.base import Schema
+from app.utils.enums import ArbitrationStatus
+
+
+class ArbitrationCaseOut(Schema):
+    id: uuid.UUID
+    case_number: str
+    plaintiff_id: uuid.UUID
+    defendant_id: uuid.UUID
+    arbitrator_id: Optional[uuid.UUID]
+    title: str
+    description: str
+    status: ArbitrationStatus
+    resolution: Optional[str]
+    resolved_at: Optional[datetime]
+    created_at: datetime
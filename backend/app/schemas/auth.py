@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class RefreshTokenIn(BaseModel):
+    refresh_token: str
+
+
+class LogoutIn(BaseModel):
+    # End every session of the user instead of only this one
+    all_sessions: bool = False
+
+
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
@@ -0,0 +1,21 @@
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+T = TypeVar("T")
+
+
+class Schema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PageMeta(BaseModel):
+    per_page: int
+    has_next: bool
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    meta: PageMeta
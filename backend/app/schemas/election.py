@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from app.schemas.base import Schema
+from app.utils.enums import ElectionScopeType, ElectionStatus, ElectionType
+
+
+class ElectionOut(Schema):
+    id: uuid.UUID
+    election_type: ElectionType
+    scope_type: ElectionScopeType
+    scope_id: Optional[uuid.UUID]
+    title: str
+    description: Optional[str]
+    starts_at: datetime
+    ends_at: datetime
+    status: ElectionStatus
+    winner_id: Optional[uuid.UUID]
+    total_votes: Optional[int]
+    created_at: datetime
+
+
+class VoteReceipt(Schema):
+    id: uuid.UUID
+    election_id: uuid.UUID
+    vote_hash: str
+    cast_at: datetime
+
+
+class CastVoteOut(Schema):
+    vote: VoteReceipt
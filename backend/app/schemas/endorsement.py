@@ -0,0 +1,26 @@
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.base import Schema
+from app.utils.enums import EndorsementStatus
+
+
+class AvailableGeDer(Schema):
+    id: uuid.UUID
+    full_name: Optional[str]
+    remaining: int
+
+
+class EndorsementRequestIn(BaseModel):
+    geder_id: uuid.UUID
+
+
+class EndorsementRevokeIn(BaseModel):
+    reason: Optional[str] = None
+
+
+class EndorsementRequested(Schema):
+    id: uuid.UUID
+    status: EndorsementStatus
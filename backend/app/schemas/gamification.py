@@ -0,0 +1,33 @@
+import uuid
+from typing import Optional
+
+from app.schemas.base import Schema
+
+
+class LeaderboardEntry(Schema):
+    rank: int
+    id: uuid.UUID
+    name: Optional[str]
+    score: int
+
+
+class Leaderboard(Schema):
+    entries: list[LeaderboardEntry]
+    total: int
+
+
+class Standing(Schema):
+    rank: Optional[int]
+    score: int
+    total: int
+    neighbors: list[LeaderboardEntry]
+
+
+class MetricStandings(Schema):
+    national: Standing
+    territory: Optional[Standing]
+
+
+class Progress(Schema):
+    rankings: dict[str, MetricStandings]
+    group: Optional[Standing]
@@ -0,0 +1,17 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from app.schemas.base import Schema
+from app.utils.enums import GroupStatus
+
+
+class AteuliOut(Schema):
+    id: uuid.UUID
+    name: Optional[str]
+    territory_id: uuid.UUID
+    atistavi_id: Optional[uuid.UUID]
+    ormotsdaateuli_id: Optional[uuid.UUID]
+    member_count: int
+    status: GroupStatus
+    created_at: datetime
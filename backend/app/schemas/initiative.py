@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.base import Schema
+from app.utils.enums import ElectionScopeType, InitiativeCategory, InitiativeStatus
+
+
+class InitiativeOut(Schema):
+    id: uuid.UUID
+    creator_id: uuid.UUID
+    title: str
+    description: str
+    category: InitiativeCategory
+    scope_type: ElectionScopeType
+    scope_id: Optional[uuid.UUID]
+    target_support: int
+    current_support: Optional[int]
+    status: InitiativeStatus
+    assigned_to_id: Optional[uuid.UUID]
+    completed_at: Optional[datetime]
+    created_at: datetime
+
+
+class InitiativeSupportIn(BaseModel):
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+
+class InitiativeProgress(Schema):
+    id: uuid.UUID
+    current_support: int
+    target_support: int
+    progress_percentage: int
+    status: InitiativeStatus
+
+
+class SupportReceipt(Schema):
+    id: uuid.UUID
+    supported_at: datetime
+
+
+class InitiativeSupported(Schema):
+    initiative: InitiativeProgress
+    support: SupportReceipt
@@ -0,0 +1,15 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from app.schemas.base import Schema
+
+
+class NotificationOut(Schema):
+    id: uuid.UUID
+    type: str
+    title: str
+    message: str
+    data: Optional[dict[str, Any]]
+    read_at: Optional[datetime]
+    created_at: datetime
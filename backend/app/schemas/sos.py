@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.base import Schema
+from app.utils.enums import HierarchyLevel, SOSPriority, SOSStatus
+
+
+class SOSSignalIn(BaseModel):
+    title: str = Field(..., max_length=300)
+    description: str
+    location: Optional[str] = Field(None, max_length=300)
+    moral_filter_response: str
+    priority: SOSPriority = SOSPriority.NORMAL
+
+
+class SOSSignalOut(Schema):
+    id: uuid.UUID
+    reporter_id: uuid.UUID
+    title: str
+    description: str
+    location: Optional[str]
+    status: SOSStatus
+    priority: SOSPriority
+    current_level: HierarchyLevel
+    verified_at: Optional[datetime]
+    resolved_at: Optional[datetime]
+    created_at: datetime
@@ -0,0 +1,26 @@
+import uuid
+from typing import Optional
+
+from app.schemas.base import Schema
+from app.utils.enums import TerritoryType
+
+
+class TerritoryOut(Schema):
+    id: uuid.UUID
+    name: str
+    name_en: Optional[str]
+    type: TerritoryType
+    parent_id: Optional[uuid.UUID]
+    code: Optional[str]
+
+
+class TerritoryDetail(TerritoryOut):
+    ancestors: list[TerritoryOut]
+    children: list[TerritoryOut]
+
+
+class TerritoryStatistics(Schema):
+    territory_id: uuid.UUID
+    territories: int
+    users: int
+    ateulis: int
@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from app.schemas.base import Schema
+from app.utils.enums import UserRole, UserStatus
+
+
+class UserProfile(Schema):
+    id: uuid.UUID
+    full_name: Optional[str]
+    role: UserRole
+    status: Optional[UserStatus]
+    is_diaspora: Optional[bool]
+    territory_id: Optional[uuid.UUID]
+    ateuli_id: Optional[uuid.UUID]
+    tavdebi_id: Optional[uuid.UUID]
+    phone_verified_at: Optional[datetime]
+    constitution_agreed_at: Optional[datetime]
+    onboarding_completed_at: Optional[datetime]
+    created_at: datetime
+
+
+class UserSearchResult(Schema):
+    id: uuid.UUID
+    full_name: Optional[str]
+    role: UserRole
+    territory_id: Optional[uuid.UUID]
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.cache import LRUCache, TieredCache, create_shared_cache
+from app.models.election import Election
+from app.services import vote_tally
+from app.utils.enums import ElectionStatus
+
+logger = logging.getLogger(__name__)
+
+_FINAL_STATUSES = {ElectionStatus.COMPLETED.value, ElectionStatus.CANCELLED.value}
+_REFRESH_LOCK_KEY = "election_results:refresh_lock"
+
+
+@dataclass(frozen=True)
+class ResultSnapshot:
+    election_id: str
+    status: str
+    total_votes: int
+    etag: str
+    body: str
+
+    @property
+    def is_final(self) -> bool:
+        return self.status in _FINAL_STATUSES
+
+    @property
+    def cache_control(self) -> str:
+        if self.is_final:
+            return f"public, max-age={settings.ELECTION_RESULTS_COMPLETED_TTL_SECONDS}, immutable"
+        return f"public, max-age={settings.ELECTION_RESULTS_REFRESH_SECONDS}"
+
+
+results_cache = TieredCache(
+    namespace="election_results",
+    local=LRUCache(max_entries=1000, ttl_seconds=settings.ELECTION_RESULTS_REFRESH_SECONDS),
+    shared=create_shared_cache(),
+    shared_ttl_seconds=settings.ELECTION_RESULTS_ACTIVE_TTL_SECONDS,
+    encode=lambda snapshot: json.dumps(asdict(snapshot)),
+    decode=lambda raw: ResultSnapshot(**json.loads(raw)),
+)
+
+# Final snapshots are written once and kept without expiry: after close no
+# vote can change them, and a refresher that read the election before it
+# closed must not replace them with a live one.
+final_results = TieredCache(
+    namespace="election_results:final",
+    local=LRUCache(max_entries=1000, ttl_seconds=settings.ELECTION_RESULTS_COMPLETED_TTL_SECONDS),
+    shared=results_cache.shared,
+    shared_ttl_seconds=None,
+    encode=results_cache.encode,
+    decode=results_cache.decode,
+)
+
+_build_locks: dict[str, asyncio.Lock] = {}
+
+
+async def build_snapshot(db: AsyncSession, election_id: uuid.UUID) -> ResultSnapshot:
+    results = await vote_tally.read_results(db, election_id)
+    body = json.dumps(jsonable_encoder(results), ensure_ascii=False, separators=(",", ":"))
+    election = results["election"]
+    return ResultSnapshot(
+        election_id=str(election_id),
+        status=election["status"].value,
+        total_votes=election["total_votes"],
+        etag='"%s"' % hashlib.sha256(body.encode()).hexdigest()[:32],
+        body=body,
+    )
+
+
+async def store_snapshot(snapshot: ResultSnapshot) -> ResultSnapshot:
+    """
+    Cache a snapshot and return the one now current for its election.
+
+    A final snapshot goes to final_results and over the live entry, so
+    readers see it with one lookup. A live snapshot is dropped once a final
+    one exists. A stale live write racing that check is overwritten by the
+    next refresh, which keeps re-storing final snapshots of recently ended
+    elections.
+    """
+    key = snapshot.election_id
+    if snapshot.is_final:
+        snapshot = await final_results.add(key, snapshot)
+        ttl = settings.ELECTION_RESULTS_COMPLETED_TTL_SECONDS
+        await results_cache.set(key, snapshot, ttl, ttl)
+        return snapshot
+
+    final = await final_results.get(key)
+    if final is not None:
+        await results_cache.set(key, final)
+        return final
+    await results_cache.set(key, snapshot)
+    return snapshot
+
+
+async def _cached(key: str) -> Optional[ResultSnapshot]:
+    snapshot = await results_cache.get(key)
+    if snapshot is None:
+        snapshot = await final_results.get(key)
+    return snapshot
+
+
+async def get_snapshot(db: AsyncSession, election_id: uuid.UUID) -> ResultSnapshot:
+    """
+    Cached results for an election, computing them only on a cold miss.
+
+    Concurrent misses in one worker wait for a single computation.
+    """
+    key = str(election_id)
+    snapshot = await _cached(key)
+    if snapshot is not None:
+        return snapshot
+
+    lock = _build_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        snapshot = await _cached(key)
+        if snapshot is None:
+            snapshot = await store_snapshot(await build_snapshot(db, election_id))
+    _build_locks.pop(key, None)
+    return snapshot
+
+
+async def refresh_snapshots(session_factory) -> int:
+    """
+    Rebuild snapshots of live elections and of elections that just ended.
+
+    Only the worker holding the refresh lock for this interval does the work,
+    so results are aggregated once per interval however many workers and
+    pollers there are. Returns the number of snapshots rebuilt.
+    """
+    acquired = await results_cache.shared.add(
+        _REFRESH_LOCK_KEY, uuid.uuid4().hex, settings.ELECTION_RESULTS_REFRESH_SECONDS
+    )
+    if not acquired:
+        return 0
+
+    recently = datetime.now(timezone.utc) - timedelta(seconds=settings.ELECTION_RESULTS_ACTIVE_TTL_SECONDS)
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Election.id).where(
+                or_(
+                    Election.status == ElectionStatus.ACTIVE,
+                    Election.updated_at >= recently,
+                )
+            )
+        )
+        election_ids = list(result.scalars())
+        for election_id in election_ids:
+            await store_snapshot(await build_snapshot(db, election_id))
+    return len(election_ids)
+
+
+async def run_results_refresher(session_factory, interval_seconds: int) -> None:
+    while True:
+        try:
+            await refresh_snapshots(session_factory)
+        except Exception:
+            logger.exception("Election results refresh failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,302 @@
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import func, insert, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.endorsement import Endorsement, GeDerCapacity
+from app.models.user import User
+from app.utils.enums import EndorsementStatus, UserRole
+
+
+class EndorsementNotFoundError(LookupError):
+    pass
+
+
+class GeDerUnavailableError(ValueError):
+    pass
+
+
+class AlreadyEndorsedError(ValueError):
+    pass
+
+
+class InvalidEndorsementStateError(ValueError):
+    pass
+
+
+# Capacity is reserved when a supporter asks and returned on rejection or
+# revocation, so `remaining` = limit - pending - approved.
+_OPEN = (EndorsementStatus.PENDING, EndorsementStatus.APPROVED)
+
+
+def _available(territory_id: Optional[uuid.UUID]):
+    territory = (
+        GeDerCapacity.territory_id.is_(None)
+        if territory_id is None
+        else GeDerCapacity.territory_id == territory_id
+    )
+    return (territory, GeDerCapacity.penalized.is_(False), GeDerCapacity.remaining > 0)
+
+
+async def available_geders(
+    db: AsyncSession, territory_id: Optional[uuid.UUID], limit: int, sample: bool = False
+) -> list[dict[str, Any]]:
+    """
+    GeDers in a territory who can still endorse someone and carry no penalty.
+
+    Without `sample` the ones with the most room come first, read off the
+    (territory_id, remaining) index. With it, a random pivot is drawn and
+    the rows after it on the (territory_id, sample_key) index are taken,
+    wrapping around to the start, so requests spread across all endorsers.
+    Either way the result is listed most room first.
+    """
+    columns = (GeDerCapacity.geder_id, GeDerCapacity.remaining)
+    if sample:
+        pivot = random.random()
+        after = (
+            select(*columns, GeDerCapacity.sample_key)
+            .where(*_available(territory_id), GeDerCapacity.sample_key >= pivot)
+            .order_by(GeDerCapacity.sample_key)
+            .limit(limit)
+            .subquery()
+        )
+        before = (
+            select(*columns, GeDerCapacity.sample_key)
+            .where(*_available(territory_id), GeDerCapacity.sample_key < pivot)
+            .order_by(GeDerCapacity.sample_key)
+            .limit(limit)
+            .subquery()
+        )
+        picked = union_all(after.select(), before.select()).limit(limit).subquery()
+    else:
+        picked = (
+            select(*columns)
+            .where(*_available(territory_id))
+            .order_by(GeDerCapacity.remaining.desc())
+            .limit(limit)
+            .subquery()
+        )
+
+    result = await db.execute(
+        select(picked.c.geder_id, picked.c.remaining, User.full_name)
+        .join(User, User.id == picked.c.geder_id)
+        # The join does not keep the subquery's order.
+        .order_by(picked.c.remaining.desc(), picked.c.geder_id)
+    )
+    return [
+        {"id": row.geder_id, "full_name": row.full_name, "remaining": row.remaining}
+        for row in result
+    ]
+
+
+async def ensure_capacity(db: AsyncSession, geder_id: uuid.UUID) -> None:
+    """
+    Create a GeDer's capacity row from their endorsements if it is missing.
+    Should be called when a user becomes a GeDer, so they are listed before
+    anyone has asked them.
+    """
+    exists = await db.scalar(
+        select(GeDerCapacity.id).where(GeDerCapacity.geder_id == geder_id)
+    )
+    if exists is not None:
+        return
+
+    geder = await db.execute(
+        select(User.territory_id).where(User.id == geder_id, User.role == UserRole.GEDER)
+    )
+    row = geder.first()
+    if row is None:
+        raise GeDerUnavailableError(geder_id)
+
+    counts = dict(
+        (await db.execute(
+            select(Endorsement.status, func.count())
+            .where(Endorsement.geder_id == geder_id, Endorsement.status.in_(_OPEN))
+            .group_by(Endorsement.status)
+        )).all()
+    )
+    penalized = await db.scalar(
+        select(func.count()).where(
+            Endorsement.geder_id == geder_id, Endorsement.penalty_applied.is_(True)
+        )
+    )
+    pending = counts.get(EndorsementStatus.PENDING, 0)
+    approved = counts.get(EndorsementStatus.APPROVED, 0)
+    await db.execute(
+        insert(GeDerCapacity).values(
+            id=uuid.uuid4(),
+            geder_id=geder_id,
+            territory_id=row.territory_id,
+            pending_count=pending,
+            approved_count=approved,
+            remaining=max(0, settings.ENDORSEMENT_LIMIT_PER_GEDER - pending - approved),
+            penalized=bool(penalized),
+            sample_key=random.random(),
+        )
+    )
+
+
+async def _adjust_capacity(db: AsyncSession, geder_id: uuid.UUID, *guard, **values) -> bool:
+    result = await db.execute(
+        update(GeDerCapacity)
+        .where(GeDerCapacity.geder_id == geder_id, *guard)
+        .values(**values)
+        .returning(GeDerCapacity.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar() is not None
+
+
+async def request_endorsement(
+    db: AsyncSession, supporter_id: uuid.UUID, geder_id: uuid.UUID
+) -> Endorsement:
+    """
+    Ask a GeDer for an endorsement, reserving one of their places.
+
+    The reservation is a guarded UPDATE, so concurrent requests cannot take
+    more places than the GeDer has. Supporters whose earlier request was
+    rejected or revoked may ask again; the same row is reused.
+    """
+    if supporter_id == geder_id:
+        raise GeDerUnavailableError(geder_id)
+
+    endorsement = await db.scalar(
+        select(Endorsement).where(Endorsement.supporter_id == supporter_id).with_for_update()
+    )
+    if endorsement is not None and endorsement.status in _OPEN:
+        raise AlreadyEndorsedError(supporter_id)
+
+    reserve = dict(
+        remaining=GeDerCapacity.remaining - 1,
+        pending_count=GeDerCapacity.pending_count + 1,
+    )
+    guard = (GeDerCapacity.penalized.is_(False), GeDerCapacity.remaining > 0)
+    if not await _adjust_capacity(db, geder_id, *guard, **reserve):
+        await ensure_capacity(db, geder_id)
+        if not await _adjust_capacity(db, geder_id, *guard, **reserve):
+            raise GeDerUnavailableError(geder_id)
+
+    now = datetime.now(timezone.utc)
+    if endorsement is None:
+        endorsement = Endorsement(supporter_id=supporter_id)
+        db.add(endorsement)
+    endorsement.geder_id = geder_id
+    endorsement.status = EndorsementStatus.PENDING
+    endorsement.requested_at = now
+    endorsement.approved_at = None
+    endorsement.revoked_at = None
+    endorsement.revocation_reason = None
+    endorsement.penalty_applied = False
+    await db.flush()
+    return endorsement
+
+
+async def _endorsement_for_update(
+    db: AsyncSession, endorsement_id: uuid.UUID, geder_id: uuid.UUID, status: EndorsementStatus
+) -> Endorsement:
+    endorsement = await db.scalar(
+        select(Endorsement)
+        .where(Endorsement.id == endorsement_id, Endorsement.geder_id == geder_id)
+        .with_for_update()
+    )
+    if endorsement is None:
+        raise EndorsementNotFoundError(endorsement_id)
+    if endorsement.status != status:
+        raise InvalidEndorsementStateError(endorsement.status)
+    await ensure_capacity(db, geder_id)
+    return endorsement
+
+
+async def approve_endorsement(
+    db: AsyncSession, endorsement_id: uuid.UUID, geder_id: uuid.UUID
+) -> tuple[Endorsement, bool]:
+    """
+    Approve a pending request: the supporter becomes the GeDer's supporter
+    and the reserved place turns into a used one.
+
+    Also returns whether the supporter was recruited, i.e. was unverified
+    and now has the GeDer as Tavdebi.
+    """
+    endorsement = await _endorsement_for_update(
+        db, endorsement_id, geder_id, EndorsementStatus.PENDING
+    )
+    await _adjust_capacity(
+        db, geder_id,
+        pending_count=GeDerCapacity.pending_count - 1,
+        approved_count=GeDerCapacity.approved_count + 1,
+        sample_key=random.random(),
+    )
+    endorsement.status = EndorsementStatus.APPROVED
+    endorsement.approved_at = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(User)
+        .where(User.id == endorsement.supporter_id, User.role == UserRole.UNVERIFIED)
+        .values(role=UserRole.SUPPORTER, tavdebi_id=geder_id)
+        .execution_options(synchronize_session=False)
+    )
+    return endorsement, result.rowcount > 0
+
+
+async def reject_endorsement(
+    db: AsyncSession, endorsement_id: uuid.UUID, geder_id: uuid.UUID
+) -> Endorsement:
+    """
+    Reject a pending request and give the reserved place back.
+    """
+    endorsement = await _endorsement_for_update(
+        db, endorsement_id, geder_id, EndorsementStatus.PENDING
+    )
+    await _adjust_capacity(
+        db, geder_id,
+        pending_count=GeDerCapacity.pending_count - 1,
+        remaining=GeDerCapacity.remaining + 1,
+    )
+    endorsement.status = EndorsementStatus.REJECTED
+    return endorsement
+
+
+async def revoke_endorsement(
+    db: AsyncSession,
+    endorsement_id: uuid.UUID,
+    geder_id: uuid.UUID,
+    reason: Optional[str] = None,
+    penalty: bool = False,
+) -> tuple[Endorsement, bool]:
+    """
+    Revoke an approved endorsement and give the place back.
+
+    With `penalty` (the supporter turned out to be fake) the GeDer loses
+    endorsement rights and drops out of available_geders(). Also returns
+    whether the supporter lost the GeDer as Tavdebi.
+    """
+    endorsement = await _endorsement_for_update(
+        db, endorsement_id, geder_id, EndorsementStatus.APPROVED
+    )
+    values = dict(
+        approved_count=GeDerCapacity.approved_count - 1,
+        remaining=GeDerCapacity.remaining + 1,
+    )
+    if penalty:
+        values["penalized"] = True
+    await _adjust_capacity(db, geder_id, **values)
+
+    endorsement.status = EndorsementStatus.REVOKED
+    endorsement.revoked_at = datetime.now(timezone.utc)
+    endorsement.revocation_reason = reason
+    endorsement.penalty_applied = penalty
+    result = await db.execute(
+        update(User)
+        .where(
+            User.id == endorsement.supporter_id,
+            User.tavdebi_id == geder_id,
+            # A supporter who has since become a GeDer keeps that role
+            User.role == UserRole.SUPPORTER,
+        )
+        .values(role=UserRole.UNVERIFIED, tavdebi_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    return endorsement, result.rowcount > 0
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.group import Ateuli, Ormotsdaateuli, Aseuli, Ataseuli
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+ATEULI_CAPACITY = 10
+
+# Hierarchy from the bottom up, with the column pointing at the parent group
+# and, for parents, the column counting their direct children.
+CHAIN = (Ateuli, Ormotsdaateuli, Aseuli, Ataseuli)
+PARENT_FK = {
+    Ateuli: Ateuli.ormotsdaateuli_id,
+    Ormotsdaateuli: Ormotsdaateuli.aseuli_id,
+    Aseuli: Aseuli.ataseuli_id,
+}
+CHILD_COUNT = {
+    Ormotsdaateuli: "ateuli_count",
+    Aseuli: "ormotsdaateuli_count",
+    Ataseuli: "aseuli_count",
+}
+
+
+class GroupNotFoundError(LookupError):
+    pass
+
+
+class GroupFullError(ValueError):
+    pass
+
+
+def is_leader_clause(user_id: Any = User.id):
+    """
+    True when the user leads a group at any level; four index probes on the
+    leader columns.
+    """
+    return or_(
+        exists().where(Ateuli.atistavi_id == user_id),
+        exists().where(Ormotsdaateuli.leader_id == user_id),
+        exists().where(Aseuli.asistavi_id == user_id),
+        exists().where(Ataseuli.atasistavi_id == user_id),
+    )
+
+
+async def chain_ids(db: AsyncSession, ateuli_id: uuid.UUID) -> Optional[tuple]:
+    """
+    Ids of an Ateuli and its ancestors, in CHAIN order.
+    """
+    result = await db.execute(
+        select(Ateuli.id, Ormotsdaateuli.id, Aseuli.id, Ataseuli.id)
+        .select_from(Ateuli)
+        .outerjoin(Ormotsdaateuli, Ormotsdaateuli.id == Ateuli.ormotsdaateuli_id)
+        .outerjoin(Aseuli, Aseuli.id == Ormotsdaateuli.aseuli_id)
+        .outerjoin(Ataseuli, Ataseuli.id == Aseuli.ataseuli_id)
+        .where(Ateuli.id == ateuli_id)
+    )
+    return result.first()
+
+
+async def apply_member_delta(db: AsyncSession, ateuli_id: uuid.UUID, delta: int) -> int:
+    """
+    Add `delta` members to an Ateuli and every group above it.
+
+    Rows are updated top-down (Ataseuli first, Ateuli last). Every writer uses
+    this order, so concurrent joins queue on the topmost shared row instead
+    of deadlocking. The Ateuli update carries the capacity check, so a full
+    group raises GroupFullError and the caller's rollback undoes the upper
+    updates. Returns the Ateuli's new member count.
+    """
+    chain = await chain_ids(db, ateuli_id)
+    if chain is None:
+        raise GroupNotFoundError(ateuli_id)
+
+    for model, group_id in reversed(list(zip(CHAIN, chain))[1:]):
+        if group_id is not None:
+            await db.execute(
+                update(model)
+                .where(model.id == group_id)
+                .values(member_count=model.member_count + delta)
+                .execution_options(synchronize_session=False)
+            )
+
+    if delta > 0:
+        in_range = Ateuli.member_count + delta <= ATEULI_CAPACITY
+    else:
+        in_range = Ateuli.member_count + delta >= 0
+    result = await db.execute(
+        update(Ateuli)
+        .where(Ateuli.id == ateuli_id, in_range)
+        .values(member_count=Ateuli.member_count + delta)
+        .returning(Ateuli.member_count)
+        .execution_options(synchronize_session=False)
+    )
+    member_count = result.scalar()
+    if member_count is None:
+        raise GroupFullError(ateuli_id)
+    return member_count
+
+
+def _join_to_level(query, level: Any):
+    """
+    Join active grouped users up to `level`; returns the query and the column
+    holding their group id at that level.
+    """
+    key = User.ateuli_id
+    query = query.where(User.deleted_at.is_(None), User.ateuli_id.is_not(None))
+    for child in CHAIN[:CHAIN.index(level)]:
+        query = query.join(child, child.id == key)
+        key = PARENT_FK[child]
+    return query, key
+
+
+def _members_query(level: Any):
+    return _join_to_level(select(func.count().label("n")).select_from(User), level)
+
+
+def member_ids_select(level: Any, group_id: uuid.UUID):
+    """
+    SELECT of the ids of every active member of a group at any level.
+    """
+    query, key = _join_to_level(select(User.id), level)
+    return query.where(key == group_id)
+
+
+def _member_totals(level: Any):
+    query, key = _members_query(level)
+    return query.add_columns(key.label("group_id")).group_by(key).subquery()
+
+
+def _child_totals(level: Any):
+    child = CHAIN[CHAIN.index(level) - 1]
+    key = PARENT_FK[child]
+    return (
+        select(key.label("group_id"), func.count().label("n"))
+        .where(key.is_not(None))
+        .group_by(key)
+        .subquery()
+    )
+
+
+async def find_drift(db: AsyncSession) -> list[tuple[Any, uuid.UUID]]:
+    """
+    Groups whose stored counters disagree with the underlying rows.
+    """
+    drifted = []
+    for level in CHAIN:
+        members = _member_totals(level)
+        condition = level.member_count != func.coalesce(members.c.n, 0)
+        query = select(level.id).outerjoin(members, members.c.group_id == level.id)
+        if level in CHILD_COUNT:
+            children = _child_totals(level)
+            query = query.outerjoin(children, children.c.group_id == level.id)
+            condition = condition | (
+                getattr(level, CHILD_COUNT[level]) != func.coalesce(children.c.n, 0)
+            )
+        result = await db.execute(query.where(condition))
+        drifted.extend((level, group_id) for group_id in result.scalars())
+    return drifted
+
+
+async def repair_group(db: AsyncSession, level: Any, group_id: uuid.UUID) -> None:
+    """
+    Recount one group's counters while holding its row lock.
+
+    Writers update the group row before they commit, so once the lock is
+    held every committed change is visible to the recount and every
+    in-flight one will apply its delta on top of the repaired value. Only
+    one row is locked, so this cannot deadlock with apply_member_delta.
+    """
+    await db.execute(select(level.id).where(level.id == group_id).with_for_update())
+
+    members, key = _members_query(level)
+    values = {"member_count": members.where(key == group_id).scalar_subquery()}
+    if level in CHILD_COUNT:
+        child = CHAIN[CHAIN.index(level) - 1]
+        values[CHILD_COUNT[level]] = (
+            select(func.count()).where(PARENT_FK[child] == group_id).scalar_subquery()
+        )
+    await db.execute(
+        update(level)
+        .where(level.id == group_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_group_counters(session_factory) -> int:
+    """
+    Detect and repair counter drift across all four group tables.
+
+    Detection is a single read-only aggregate pass per table; each drifted
+    group is then repaired in its own short transaction. Returns the number
+    of groups repaired.
+    """
+    async with session_factory() as db:
+        drifted = await find_drift(db)
+
+    for level, group_id in drifted:
+        async with session_factory() as db:
+            await repair_group(db, level, group_id)
+            await db.commit()
+
+    if drifted:
+        logger.warning("Repaired counter drift in %d groups", len(drifted))
+    return len(drifted)
+
+
+async def run_reconciler(session_factory, interval_seconds: int) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await reconcile_group_counters(session_factory)
+        except Exception:
+            logger.exception("Group counter reconciliation failed")
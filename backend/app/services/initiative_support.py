@@ -0,0 +1,185 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, case, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.hub import BROADCAST_TOPIC, group_topic, user_topic
+from app.models.initiative import Initiative, InitiativeSupport
+from app.services.notifications import SCOPE_LEVELS
+from app.utils.enums import ElectionScopeType, InitiativeStatus
+
+THRESHOLD_EVENT = "initiative.support_threshold_reached"
+
+# Initiatives keep collecting support after reaching their target.
+SUPPORTABLE = (InitiativeStatus.ACTIVE, InitiativeStatus.ACHIEVED)
+
+
+class InitiativeNotFoundError(LookupError):
+    pass
+
+
+class InitiativeClosedError(ValueError):
+    pass
+
+
+class AlreadySupportedError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SupportResult:
+    support_id: uuid.UUID
+    supported_at: datetime
+    initiative_id: uuid.UUID
+    creator_id: uuid.UUID
+    scope_type: ElectionScopeType
+    scope_id: Optional[uuid.UUID]
+    current_support: int
+    target_support: int
+    status: InitiativeStatus
+
+    @property
+    def threshold_reached(self) -> bool:
+        # Each support adds exactly one under the row lock, so exactly one
+        # transaction sees the count land on the target.
+        return self.current_support == max(1, self.target_support)
+
+    @property
+    def progress_percentage(self) -> int:
+        if self.target_support <= 0:
+            return 100
+        return min(100, 100 * self.current_support // self.target_support)
+
+
+def _supportable(initiative_id: uuid.UUID):
+    return (
+        Initiative.id == initiative_id,
+        Initiative.status.in_(SUPPORTABLE),
+        Initiative.deleted_at.is_(None),
+    )
+
+
+async def support_initiative(
+    db: AsyncSession,
+    initiative_id: uuid.UUID,
+    supporter_id: uuid.UUID,
+    comment: Optional[str] = None,
+) -> SupportResult:
+    """
+    Record a user's support and count it, in two statements.
+
+    The support row goes in with INSERT ... SELECT from the initiative, so
+    it is only written while the initiative takes support, and ON CONFLICT
+    DO NOTHING on unique_support_per_initiative turns a repeat into a no-op
+    instead of an error that aborts the transaction. Only a fresh row bumps
+    the counter, with one UPDATE ... RETURNING that also moves the
+    initiative to ACHIEVED when it reaches its target.
+
+    The counter row stays locked until the caller commits, so commit right
+    away; the threshold event is the caller's to publish after that.
+    """
+    now = datetime.now(timezone.utc)
+    support_id = uuid.uuid4()
+    result = await db.execute(
+        pg_insert(InitiativeSupport)
+        .from_select(
+            ["id", "initiative_id", "supporter_id", "comment", "supported_at"],
+            select(
+                literal(support_id, InitiativeSupport.id.type),
+                Initiative.id,
+                literal(supporter_id, InitiativeSupport.supporter_id.type),
+                literal(comment, InitiativeSupport.comment.type),
+                literal(now, InitiativeSupport.supported_at.type),
+            ).where(*_supportable(initiative_id)),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[InitiativeSupport.initiative_id, InitiativeSupport.supporter_id]
+        )
+        .returning(InitiativeSupport.id)
+    )
+    if result.scalar() is None:
+        await _raise_rejection(db, initiative_id)
+
+    current_support = Initiative.current_support + 1
+    result = await db.execute(
+        update(Initiative)
+        .where(*_supportable(initiative_id))
+        .values(
+            current_support=current_support,
+            status=case(
+                (
+                    and_(
+                        Initiative.status == InitiativeStatus.ACTIVE,
+                        current_support >= Initiative.target_support,
+                    ),
+                    literal(InitiativeStatus.ACHIEVED, Initiative.status.type),
+                ),
+                else_=Initiative.status,
+            ),
+        )
+        .returning(
+            Initiative.creator_id,
+            Initiative.scope_type,
+            Initiative.scope_id,
+            Initiative.current_support,
+            Initiative.target_support,
+            Initiative.status,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    if row is None:
+        # Closed between the two statements; the caller's rollback drops
+        # the support row.
+        raise InitiativeClosedError(initiative_id)
+
+    return SupportResult(
+        support_id=support_id,
+        supported_at=now,
+        initiative_id=initiative_id,
+        creator_id=row.creator_id,
+        scope_type=row.scope_type,
+        scope_id=row.scope_id,
+        current_support=row.current_support,
+        target_support=row.target_support,
+        status=row.status,
+    )
+
+
+async def _raise_rejection(db: AsyncSession, initiative_id: uuid.UUID) -> None:
+    result = await db.execute(
+        select(Initiative.status).where(
+            Initiative.id == initiative_id, Initiative.deleted_at.is_(None)
+        )
+    )
+    status = result.scalar()
+    if status is None:
+        raise InitiativeNotFoundError(initiative_id)
+    if status not in SUPPORTABLE:
+        raise InitiativeClosedError(initiative_id)
+    raise AlreadySupportedError(initiative_id)
+
+
+def threshold_topics(result: SupportResult) -> list[str]:
+    """
+    Where `initiative.support_threshold_reached` goes: the initiative's
+    scope (everyone for national ones) and its creator.
+    """
+    level = SCOPE_LEVELS.get(result.scope_type)
+    if level is not None and result.scope_id is not None:
+        scope = group_topic(level, result.scope_id)
+    else:
+        scope = BROADCAST_TOPIC
+    return [scope, user_topic(result.creator_id)]
+
+
+def threshold_event(result: SupportResult) -> dict[str, Any]:
+    return {
+        "initiative_id": result.initiative_id,
+        "current_support": result.current_support,
+        "target_support": result.target_support,
+    }
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.core.cache import create_shared_cache
+from app.core.ranking import RankingStore, create_ranking_store
+from app.models.endorsement import Endorsement
+from app.models.group import Ateuli, Ormotsdaateuli, Aseuli, Ataseuli
+from app.models.initiative import InitiativeSupport
+from app.models.user import User
+from app.services.notifications import LEVEL_MODELS
+from app.services.territories import TerritorySnapshot, territory_snapshot
+from app.utils.enums import EndorsementStatus, HierarchyLevel, LeaderboardMetric
+
+logger = logging.getLogger(__name__)
+
+USER_SUBJECT = "user"
+# Bottom up, as in group_counters.CHAIN
+GROUP_LEVELS = {model: level for level, model in LEVEL_MODELS.items()}
+_REBUILD_LOCK_KEY = "leaderboard:rebuild_lock"
+
+
+def board_key(subject: str, metric: str, territory_id: Optional[uuid.UUID] = None) -> str:
+    """
+    Key of one board: users by a metric, or groups of a level by members,
+    nationwide or within a territory.
+    """
+    key = f"{subject}:{metric}"
+    return key if territory_id is None else f"{key}:{territory_id}"
+
+
+def user_board(metric: LeaderboardMetric, territory_id: Optional[uuid.UUID] = None) -> str:
+    return board_key(USER_SUBJECT, metric.value, territory_id)
+
+
+def group_board(level: HierarchyLevel, territory_id: Optional[uuid.UUID] = None) -> str:
+    return board_key(level.value, "members", territory_id)
+
+
+def _scopes(snapshot: TerritorySnapshot, territory_id: Optional[uuid.UUID]) -> list[Optional[uuid.UUID]]:
+    """
+    Every board an entry of `territory_id` counts in: nationwide, its own
+    territory and each territory above it.
+    """
+    if territory_id is None:
+        return [None]
+    return [None, territory_id, *(n.id for n in snapshot.ancestors(territory_id))]
+
+
+class Leaderboards:
+    """
+    Rankings of users and groups, kept in a RankingStore.
+
+    Write paths report each change as it commits (an approved endorsement,
+    a recruited supporter, a supported initiative, a member joining a
+    group), which becomes one increment per board the entry counts in.
+    Reads never aggregate: a top-K page or a rank is a sorted-set lookup.
+
+    Changes that bypass those paths, such as bulk placement and counter
+    repairs, and any increment lost to a store outage, are folded in by
+    rebuild(), which recomputes every board from the database every
+    LEADERBOARD_REBUILD_SECONDS.
+    """
+
+    def __init__(self, store: RankingStore):
+        self.store = store
+        self.lock = create_shared_cache()
+        self.errors = 0
+        self.rebuilds = 0
+        self.boards = 0
+        self.last_rebuild_seconds = 0.0
+
+    async def _apply(self, increments: list[tuple[str, str, float]]) -> None:
+        # Scores are derived data; the write they describe has committed.
+        try:
+            await self.store.incr_many(increments)
+        except Exception:
+            self.errors += 1
+            logger.exception("Leaderboard update failed")
+
+    async def record_user(
+        self,
+        db: AsyncSession,
+        metric: LeaderboardMetric,
+        user_id: uuid.UUID,
+        territory_id: Optional[uuid.UUID],
+        delta: int = 1,
+    ) -> None:
+        snapshot = await territory_snapshot.get(db)
+        await self._apply([
+            (user_board(metric, scope), str(user_id), delta)
+            for scope in _scopes(snapshot, territory_id)
+        ])
+
+    async def record_members(self, db: AsyncSession, ateuli_id: uuid.UUID, delta: int) -> None:
+        """
+        A member joined (`delta` 1) or left (-1) an Ateuli and so every
+        group above it.
+        """
+        result = await db.execute(
+            select(
+                Ateuli.id, Ateuli.territory_id,
+                Ormotsdaateuli.id, Ormotsdaateuli.territory_id,
+                Aseuli.id, Aseuli.territory_id,
+                Ataseuli.id, Ataseuli.territory_id,
+            )
+            .select_from(Ateuli)
+            .outerjoin(Ormotsdaateuli, Ormotsdaateuli.id == Ateuli.ormotsdaateuli_id)
+            .outerjoin(Aseuli, Aseuli.id == Ormotsdaateuli.aseuli_id)
+            .outerjoin(Ataseuli, Ataseuli.id == Aseuli.ataseuli_id)
+            .where(Ateuli.id == ateuli_id)
+        )
+        row = result.first()
+        if row is None:
+            return
+        snapshot = await territory_snapshot.get(db)
+        increments = []
+        for i, level in enumerate(GROUP_LEVELS.values()):
+            group_id, territory_id = row[2 * i], row[2 * i + 1]
+            if group_id is None:
+                break
+            increments.extend(
+                (group_board(level, scope), str(group_id), delta)
+                for scope in _scopes(snapshot, territory_id)
+            )
+        await self._apply(increments)
+
+    async def top(self, key: str, offset: int, limit: int) -> list[dict[str, Any]]:
+        entries = await self.store.range(key, offset, limit)
+        return [
+            {"rank": offset + i + 1, "id": member, "score": int(score)}
+            for i, (member, score) in enumerate(entries)
+        ]
+
+    async def standing(self, key: str, member: uuid.UUID, neighbors: int) -> dict[str, Any]:
+        """
+        1-based rank and score of `member` and the entries ranked up to
+        `neighbors` places either side of it.
+        """
+        total = await self.store.size(key)
+        found = await self.store.rank(key, str(member))
+        if found is None:
+            return {"rank": None, "score": 0, "total": total, "neighbors": []}
+        rank, score = found
+        start = max(0, rank - neighbors)
+        return {
+            "rank": rank + 1,
+            "score": int(score),
+            "total": total,
+            "neighbors": await self.top(key, start, rank - start + neighbors + 1),
+        }
+
+    async def rebuild(self, session_factory) -> int:
+        """
+        Recompute every board from the database and swap them in. With a
+        shared store one worker per interval does it. Returns the number of
+        boards built.
+        """
+        if self.store.shared:
+            acquired = await self.lock.add(
+                _REBUILD_LOCK_KEY, uuid.uuid4().hex, settings.LEADERBOARD_REBUILD_SECONDS
+            )
+            if not acquired:
+                return 0
+
+        started = time.perf_counter()
+        boards: dict[str, dict[str, float]] = defaultdict(dict)
+
+        def add(keys: Iterable[str], member: uuid.UUID, score: int) -> None:
+            for key in keys:
+                boards[key][str(member)] = score
+
+        recruiter = aliased(User)
+        async with session_factory() as db:
+            snapshot = await territory_snapshot.get(db)
+
+            for metric, query in (
+                (
+                    LeaderboardMetric.ENDORSEMENTS,
+                    select(Endorsement.geder_id, User.territory_id, func.count())
+                    .join(User, User.id == Endorsement.geder_id)
+                    .where(Endorsement.status == EndorsementStatus.APPROVED)
+                    .group_by(Endorsement.geder_id, User.territory_id),
+                ),
+                (
+                    # Supporters who joined with the user as their Tavdebi
+                    LeaderboardMetric.MEMBERS_RECRUITED,
+                    select(User.tavdebi_id, recruiter.territory_id, func.count())
+                    .join(recruiter, recruiter.id == User.tavdebi_id)
+                    .where(User.deleted_at.is_(None))
+                    .group_by(User.tavdebi_id, recruiter.territory_id),
+                ),
+                (
+                    LeaderboardMetric.INITIATIVES_SUPPORTED,
+                    select(InitiativeSupport.supporter_id, User.territory_id, func.count())
+                    .join(User, User.id == InitiativeSupport.supporter_id)
+                    .group_by(InitiativeSupport.supporter_id, User.territory_id),
+                ),
+            ):
+                for user_id, territory_id, count in await db.execute(query):
+                    add((user_board(metric, s) for s in _scopes(snapshot, territory_id)), user_id, count)
+
+            for model, level in GROUP_LEVELS.items():
+                result = await db.execute(
+                    select(model.id, model.territory_id, model.member_count).where(
+                        model.member_count > 0, model.deleted_at.is_(None)
+                    )
+                )
+                for group_id, territory_id, members in result:
+                    add((group_board(level, s) for s in _scopes(snapshot, territory_id)), group_id, members)
+
+        await self.store.replace_all(boards)
+        self.rebuilds += 1
+        self.boards = len(boards)
+        self.last_rebuild_seconds = time.perf_counter() - started
+        return len(boards)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": type(self.store).__name__,
+            "boards": self.boards,
+            "rebuilds": self.rebuilds,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+            "errors": self.errors,
+        }
+
+
+leaderboards = Leaderboards(create_ranking_store())
+
+
+async def names(db: AsyncSession, entries: Iterable[dict[str, Any]], level: Optional[HierarchyLevel]) -> None:
+    """
+    Add the display name of each user (or group of `level`) in `entries`,
+    in one query.
+    """
+    entries = list(entries)
+    if not entries:
+        return
+    model = User if level is None else LEVEL_MODELS[level]
+    column = User.full_name if level is None else model.name
+    result = await db.execute(
+        select(model.id, column).where(model.id.in_({uuid.UUID(e["id"]) for e in entries}))
+    )
+    by_id = {str(i): name for i, name in result}
+    for entry in entries:
+        entry["name"] = by_id.get(entry["id"])
+
+
+async def run_leaderboard_rebuild(session_factory, interval_seconds: int) -> None:
+    # Built right away: an in-memory store starts out empty.
+    while True:
+        try:
+            await leaderboards.rebuild(session_factory)
+        except Exception:
+            logger.exception("Leaderboard rebuild failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.hub import hub, user_topic
+from app.models.audit import Notification
+from app.models.election import Election
+from app.models.group import Ateuli, Ormotsdaateuli, Aseuli, Ataseuli
+from app.models.sos import SOSSignal
+from app.models.user import User
+from app.services.group_counters import CHAIN, chain_ids, member_ids_select
+from app.utils.enums import ElectionScopeType, HierarchyLevel
+
+logger = logging.getLogger(__name__)
+
+LEVEL_MODELS = {
+    HierarchyLevel.ATEULI: Ateuli,
+    HierarchyLevel.ORMOTSDAATEULI: Ormotsdaateuli,
+    HierarchyLevel.ASEULI: Aseuli,
+    HierarchyLevel.ATASEULI: Ataseuli,
+}
+SCOPE_LEVELS = {
+    ElectionScopeType.ATEULI: HierarchyLevel.ATEULI,
+    ElectionScopeType.ORMOTSDAATEULI: HierarchyLevel.ORMOTSDAATEULI,
+    ElectionScopeType.ASEULI: HierarchyLevel.ASEULI,
+    ElectionScopeType.ATASEULI: HierarchyLevel.ATASEULI,
+}
+
+NOTIFICATION_EVENT = "notification.new"
+
+
+@dataclass(frozen=True)
+class FanOut:
+    """
+    Notifications written by one fan-out, to announce once committed.
+    """
+    # (recipient id, notification id)
+    notifications: Sequence[tuple[uuid.UUID, uuid.UUID]]
+    type: str
+    title: str
+
+    def __len__(self) -> int:
+        return len(self.notifications)
+
+    async def publish(self) -> None:
+        """
+        Send `notification.new` to each recipient. Call after commit, so
+        clients never fetch a notification that is not there yet.
+        """
+        chunk_size = settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+        for start in range(0, len(self.notifications), chunk_size):
+            await asyncio.gather(*(
+                hub.publish(user_topic(user_id), NOTIFICATION_EVENT, {
+                    "notification_id": notification_id,
+                    "type": self.type,
+                    "title": self.title,
+                })
+                for user_id, notification_id in self.notifications[start:start + chunk_size]
+            ))
+
+
+NO_RECIPIENTS = FanOut((), "", "")
+
+
+async def fan_out(
+    db: AsyncSession,
+    recipient_ids: Sequence[uuid.UUID],
+    type: str,
+    title: str,
+    message: str,
+    data: Optional[dict[str, Any]] = None,
+) -> FanOut:
+    """
+    Write one notification per recipient using multi-row INSERTs of
+    NOTIFICATION_FANOUT_CHUNK_SIZE rows each.
+
+    Every row of a fan-out shares one created_at, so the whole batch lands
+    in a single monthly partition. The caller commits, then publishes the
+    returned FanOut.
+    """
+    now = datetime.now(timezone.utc)
+    table = Notification.__table__
+    chunk_size = settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    notifications = [(user_id, uuid.uuid4()) for user_id in recipient_ids]
+    for start in range(0, len(notifications), chunk_size):
+        rows = [
+            {
+                "id": notification_id,
+                "created_at": now,
+                "updated_at": now,
+                "user_id": user_id,
+                "type": type,
+                "title": title,
+                "message": message,
+                "data": data,
+            }
+            for user_id, notification_id in notifications[start:start + chunk_size]
+        ]
+        await db.execute(insert(table).values(rows))
+    return FanOut(notifications, type, title)
+
+
+async def group_member_ids(
+    db: AsyncSession, level: HierarchyLevel, group_id: uuid.UUID
+) -> list[uuid.UUID]:
+    """
+    Every active member of a group, resolved with one query through the
+    group hierarchy.
+    """
+    result = await db.execute(member_ids_select(LEVEL_MODELS[level], group_id))
+    return list(result.scalars())
+
+
+async def notify_group(
+    db: AsyncSession,
+    level: HierarchyLevel,
+    group_id: uuid.UUID,
+    type: str,
+    title: str,
+    message: str,
+    data: Optional[dict[str, Any]] = None,
+) -> FanOut:
+    recipient_ids = await group_member_ids(db, level, group_id)
+    return await fan_out(db, recipient_ids, type, title, message, data)
+
+
+async def notify_election_started(db: AsyncSession, election: Election) -> FanOut:
+    if election.scope_type == ElectionScopeType.NATIONAL:
+        result = await db.execute(select(User.id).where(User.deleted_at.is_(None)))
+        recipient_ids = list(result.scalars())
+    elif election.scope_id is not None:
+        recipient_ids = await group_member_ids(db, SCOPE_LEVELS[election.scope_type], election.scope_id)
+    else:
+        return NO_RECIPIENTS
+    return await fan_out(
+        db,
+        recipient_ids,
+        type="election_started",
+        title=election.title,
+        message="Voting is open.",
+        data={"election_id": str(election.id)},
+    )
+
+
+async def sos_group_id(
+    db: AsyncSession, signal: SOSSignal, level: HierarchyLevel
+) -> Optional[uuid.UUID]:
+    """
+    The reporter's group at `level`, or None outside the group hierarchy.
+    """
+    model = LEVEL_MODELS.get(level)
+    if model is None:
+        return None
+    ateuli_id = await db.scalar(select(User.ateuli_id).where(User.id == signal.reporter_id))
+    chain = await chain_ids(db, ateuli_id) if ateuli_id is not None else None
+    return chain[CHAIN.index(model)] if chain is not None else None
+
+
+async def notify_sos_escalated(
+    db: AsyncSession,
+    signal: SOSSignal,
+    to_level: HierarchyLevel,
+    group_id: Optional[uuid.UUID] = None,
+) -> FanOut:
+    """
+    Notify the members of the reporter's group at the level the signal was
+    escalated to. Escalations outside the group hierarchy notify nobody.
+    Callers that already resolved the group may pass it as `group_id`.
+    """
+    if group_id is None:
+        group_id = await sos_group_id(db, signal, to_level)
+    if group_id is None:
+        return NO_RECIPIENTS
+    return await notify_group(
+        db,
+        to_level,
+        group_id,
+        type="sos_escalated",
+        title=signal.title,
+        message=f"An SOS signal was escalated to the {to_level.value} level.",
+        data={"signal_id": str(signal.id), "level": to_level.value},
+    )
+
+
+async def mark_all_read(db: AsyncSession, user_id: uuid.UUID) -> int:
+    """
+    Mark every unread notification of a user as read in one UPDATE.
+
+    The predicate is exactly that of idx_notifications_unread, so only the
+    user's unread entries are visited in each partition. Returns the number
+    of notifications marked.
+    """
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.read_at.is_(None))
+        .values(read_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def ensure_partitions(session_factory) -> int:
+    """
+    Create any missing monthly partition up to
+    NOTIFICATION_PARTITION_MONTHS_AHEAD months from now. Returns the number
+    of partitions created.
+    """
+    async with session_factory() as db:
+        if db.bind.dialect.name != "postgresql":
+            return 0
+        created = await db.scalar(
+            text("SELECT ensure_notification_partitions(:months_ahead)"),
+            {"months_ahead": settings.NOTIFICATION_PARTITION_MONTHS_AHEAD},
+        )
+        await db.commit()
+    if created:
+        logger.info("Created %d notification partitions", created)
+    return created
+
+
+async def run_partition_maintainer(session_factory, interval_seconds: int) -> None:
+    while True:
+        try:
+            await ensure_partitions(session_factory)
+        except Exception:
+            logger.exception("Notification partition maintenance failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,366 @@
+import asyncio
+import logging
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import bindparam, func, insert, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.principal import invalidate_principals
+from app.models.group import Ateuli, Ormotsdaateuli, Aseuli, Ataseuli
+from app.models.user import User
+from app.services.group_counters import ATEULI_CAPACITY, CHAIN, CHILD_COUNT, PARENT_FK
+from app.utils.enums import GroupStatus, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Direct children a parent group takes: 5 Ateulis make an Ormotsdaateuli
+# (50), 2 of those an Aseuli (100) and 10 Aseulis an Ataseuli (1000).
+CHILD_CAPACITY = {Ormotsdaateuli: 5, Aseuli: 2, Ataseuli: 10}
+# The roles a member may join an Ateuli with, as in POST /ateulis/{id}/join.
+PLACED_ROLES = (UserRole.GEDER,)
+MAX_CONFLICT_RETRIES = 5
+
+
+class PlacementConflictError(RuntimeError):
+    """
+    A chunk raced with a manual join; it is rolled back and placement
+    restarts from the committed state.
+    """
+
+
+class _Group:
+    __slots__ = (
+        "model", "id", "parent", "members", "children", "new", "member_delta", "child_delta",
+    )
+
+    def __init__(
+        self, model: Any, group_id: uuid.UUID, members: int = 0, children: int = 0, new: bool = False
+    ):
+        self.model = model
+        self.id = group_id
+        self.parent: Optional[_Group] = None
+        self.members = members
+        self.children = children
+        self.new = new
+        self.member_delta = 0
+        self.child_delta = 0
+
+
+class TerritoryPacker:
+    """
+    Fills one territory's groups in memory.
+
+    Open groups are filled fullest first. When none is left at a level a new
+    one is made, under the current open group of the level above, which is
+    made the same way, so parents appear exactly when they are needed.
+    Every group whose counts change is kept in `dirty` until flushed.
+    """
+
+    def __init__(self, territory_id: uuid.UUID, open_groups: dict[Any, list[_Group]]):
+        self.territory_id = territory_id
+        self.open = {model: deque(open_groups.get(model, ())) for model in CHAIN}
+        self.dirty: dict[uuid.UUID, _Group] = {}
+        self.sealed: list[uuid.UUID] = []
+
+    def place(self) -> uuid.UUID:
+        """
+        Take one member; returns the id of the Ateuli they go to.
+        """
+        ateuli = self._current(Ateuli)
+        ateuli.members += 1
+        group = ateuli
+        while group is not None:
+            group.member_delta += 1
+            self.dirty[group.id] = group
+            group = group.parent
+        if ateuli.members >= ATEULI_CAPACITY:
+            self.open[Ateuli].popleft()
+            self.sealed.append(ateuli.id)
+        return ateuli.id
+
+    def _current(self, model: Any) -> _Group:
+        queue = self.open[model]
+        if queue:
+            return queue[0]
+
+        group = _Group(model, uuid.uuid4(), new=True)
+        self.dirty[group.id] = group
+        if model is not Ataseuli:
+            parent_model = CHAIN[CHAIN.index(model) + 1]
+            parent = self._current(parent_model)
+            group.parent = parent
+            parent.children += 1
+            parent.child_delta += 1
+            if parent.children >= CHILD_CAPACITY[parent_model]:
+                self.open[parent_model].popleft()
+        queue.append(group)
+        return group
+
+    def take_changes(self) -> tuple[list[_Group], list[uuid.UUID]]:
+        dirty, sealed = list(self.dirty.values()), self.sealed
+        self.dirty, self.sealed = {}, []
+        return dirty, sealed
+
+
+async def _load_open_groups(db: AsyncSession, territory_id: uuid.UUID) -> dict[Any, list[_Group]]:
+    """
+    The territory's groups with room left, linked to their parents. Parents
+    that are full themselves are loaded too, as they still count members.
+    """
+    groups: dict[uuid.UUID, _Group] = {}
+    parent_ids: dict[uuid.UUID, uuid.UUID] = {}
+    open_groups: dict[Any, list[_Group]] = {}
+
+    for model in CHAIN:
+        if model is Ateuli:
+            size = Ateuli.member_count
+            room = (Ateuli.status == GroupStatus.FORMING) & (Ateuli.member_count < ATEULI_CAPACITY)
+        else:
+            size = getattr(model, CHILD_COUNT[model])
+            room = (model.status != GroupStatus.INACTIVE) & (size < CHILD_CAPACITY[model])
+        columns = [model.id, size]
+        if model in PARENT_FK:
+            columns.append(PARENT_FK[model])
+        result = await db.execute(
+            select(*columns)
+            .where(model.territory_id == territory_id, model.deleted_at.is_(None), room)
+            .order_by(size.desc(), model.id)
+        )
+        for row in result:
+            group = groups[row[0]] = _Group(
+                model, row[0],
+                members=row[1] if model is Ateuli else 0,
+                children=row[1] if model is not Ateuli else 0,
+            )
+            open_groups.setdefault(model, []).append(group)
+            if model in PARENT_FK and row[2] is not None:
+                parent_ids[group.id] = row[2]
+
+    # Full ancestors of open groups only need to receive member deltas.
+    while True:
+        missing = {pid for pid in parent_ids.values() if pid not in groups}
+        if not missing:
+            break
+        for model in CHAIN[1:]:
+            columns = [model.id] + ([PARENT_FK[model]] if model in PARENT_FK else [])
+            result = await db.execute(select(*columns).where(model.id.in_(missing)))
+            for row in result:
+                groups[row[0]] = _Group(model, row[0])
+                if model in PARENT_FK and row[1] is not None:
+                    parent_ids[row[0]] = row[1]
+
+    for group_id, parent_id in parent_ids.items():
+        groups[group_id].parent = groups.get(parent_id)
+    return open_groups
+
+
+async def request_placement(db: AsyncSession, user: User) -> bool:
+    """
+    Queue a user without an Ateuli for the placement job. Returns False if
+    they are already in one.
+    """
+    if user.ateuli_id is not None:
+        return False
+    if user.placement_requested_at is None:
+        user.placement_requested_at = datetime.now(timezone.utc)
+    return True
+
+
+async def _unplaced_users(
+    db: AsyncSession, after: Optional[tuple], limit: int
+) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    query = (
+        select(User.territory_id, User.id)
+        .where(
+            User.placement_requested_at.is_not(None),
+            User.ateuli_id.is_(None),
+            User.deleted_at.is_(None),
+            User.territory_id.is_not(None),
+            User.role.in_(PLACED_ROLES),
+        )
+        .order_by(User.territory_id, User.id)
+        .limit(limit)
+        # Users a manual join is holding are left for the next run.
+        .with_for_update(skip_locked=True)
+    )
+    if after is not None:
+        query = query.where(tuple_(User.territory_id, User.id) > tuple_(*after))
+    result = await db.execute(query)
+    return [tuple(row) for row in result]
+
+
+def _new_row(group: _Group, territory_id: uuid.UUID) -> dict[str, Any]:
+    row = {
+        "id": group.id,
+        "territory_id": territory_id,
+        "member_count": 0,
+        "status": GroupStatus.FORMING,
+    }
+    if group.model in PARENT_FK:
+        row[PARENT_FK[group.model].key] = group.parent.id if group.parent else None
+    if group.model in CHILD_COUNT:
+        row[CHILD_COUNT[group.model]] = 0
+    return row
+
+
+async def _assign_users(db: AsyncSession, assignments: list[tuple[uuid.UUID, uuid.UUID]]) -> int:
+    users = User.__table__
+    if db.bind.dialect.name == "postgresql":
+        result = await db.execute(
+            text(
+                "UPDATE users SET ateuli_id = v.ateuli_id, placement_requested_at = NULL, "
+                "updated_at = now() "
+                "FROM unnest(CAST(:user_ids AS uuid[]), CAST(:ateuli_ids AS uuid[])) "
+                "AS v(user_id, ateuli_id) "
+                "WHERE users.id = v.user_id AND users.ateuli_id IS NULL"
+            ),
+            {
+                "user_ids": [user_id for user_id, _ in assignments],
+                "ateuli_ids": [ateuli_id for _, ateuli_id in assignments],
+            },
+        )
+        return result.rowcount
+
+    result = await db.execute(
+        update(users)
+        .where(users.c.id == bindparam("b_user"), users.c.ateuli_id.is_(None))
+        .values(ateuli_id=bindparam("b_ateuli"), placement_requested_at=None),
+        [{"b_user": user_id, "b_ateuli": ateuli_id} for user_id, ateuli_id in assignments],
+    )
+    if not db.bind.dialect.supports_sane_multi_rowcount:
+        return len(assignments)
+    return result.rowcount
+
+
+async def _flush(
+    db: AsyncSession,
+    packers: list[TerritoryPacker],
+    assignments: list[tuple[uuid.UUID, uuid.UUID]],
+) -> None:
+    """
+    Write one chunk: new groups top-down (parents first), counter deltas
+    top-down like apply_member_delta so concurrent joins cannot deadlock
+    with it, then the users themselves.
+    """
+    dirty: list[tuple[_Group, uuid.UUID]] = []
+    sealed: list[uuid.UUID] = []
+    for packer in packers:
+        groups, sealed_ids = packer.take_changes()
+        dirty.extend((group, packer.territory_id) for group in groups)
+        sealed.extend(sealed_ids)
+
+    for model in reversed(CHAIN):
+        rows = [_new_row(g, t) for g, t in dirty if g.model is model and g.new]
+        if rows:
+            await db.execute(insert(model), rows)
+
+    for model in reversed(CHAIN):
+        table = model.__table__
+        changed = [g for g, _ in dirty if g.model is model]
+        if not changed:
+            continue
+        values = {"member_count": table.c.member_count + bindparam("b_members")}
+        if model in CHILD_COUNT:
+            column = table.c[CHILD_COUNT[model]]
+            values[column.key] = column + bindparam("b_children")
+        await db.execute(
+            update(table).where(table.c.id == bindparam("b_id")).values(**values),
+            [
+                {"b_id": g.id, "b_members": g.member_delta, "b_children": g.child_delta}
+                for g in changed
+            ],
+        )
+        for g in changed:
+            g.new = False
+            g.member_delta = g.child_delta = 0
+
+    touched = [g.id for g, _ in dirty if g.model is Ateuli]
+    overfull = await db.scalar(
+        select(func.count()).where(Ateuli.id.in_(touched), Ateuli.member_count > ATEULI_CAPACITY)
+    )
+    if overfull:
+        raise PlacementConflictError("Ateuli filled concurrently")
+    if sealed:
+        await db.execute(
+            update(Ateuli)
+            .where(Ateuli.id.in_(sealed))
+            .values(status=GroupStatus.ACTIVE)
+            .execution_options(synchronize_session=False)
+        )
+
+    if await _assign_users(db, assignments) != len(assignments):
+        raise PlacementConflictError("User placed concurrently")
+
+
+async def _place_chunks(session_factory, chunk_size: int):
+    """
+    One pass over the unplaced users, yielding the size of each committed chunk.
+    """
+    after: Optional[tuple] = None
+    packers: dict[uuid.UUID, TerritoryPacker] = {}
+
+    while True:
+        async with session_factory() as db:
+            users = await _unplaced_users(db, after, chunk_size)
+            if not users:
+                return
+
+            assignments = []
+            for territory_id, user_id in users:
+                packer = packers.get(territory_id)
+                if packer is None:
+                    # Users come in territory order, so territories already
+                    # flushed are finished and their packers can go.
+                    packers = {t: p for t, p in packers.items() if p.dirty}
+                    packer = packers[territory_id] = TerritoryPacker(
+                        territory_id, await _load_open_groups(db, territory_id)
+                    )
+                assignments.append((user_id, packer.place()))
+
+            await _flush(db, list(packers.values()), assignments)
+            await db.commit()
+
+        after = users[-1]
+        await invalidate_principals(user_id for user_id, _ in assignments)
+        yield len(users)
+
+
+async def place_unassigned_users(session_factory, chunk_size: Optional[int] = None) -> int:
+    """
+    Put every GeDer queued for placement (see request_placement()) into an
+    Ateuli of their territory. Only the queue is read: a member who left a
+    group is not placed again unless they ask to be.
+
+    Users are read once, in (territory_id, id) order, and packed in memory;
+    each chunk of `chunk_size` users is written in its own transaction with
+    bulk statements. All state lives in the database, so an interrupted run
+    simply continues where it stopped the next time it is started; a chunk
+    that races with a manual join is rolled back and the pass restarted.
+    Diaspora users, who have no territory, are not placed. Returns the
+    number of users placed.
+    """
+    chunk_size = chunk_size or settings.ATEULI_PLACEMENT_CHUNK_SIZE
+    placed = 0
+    for _ in range(MAX_CONFLICT_RETRIES):
+        try:
+            async for count in _place_chunks(session_factory, chunk_size):
+                placed += count
+            break
+        except PlacementConflictError:
+            logger.warning("Ateuli placement raced with a join; restarting", exc_info=True)
+    if placed:
+        logger.info("Placed %d users into Ateulis", placed)
+    return placed
+
+
+async def run_placement(session_factory, interval_seconds: int) -> None:
+    while True:
+        try:
+            await place_unassigned_users(session_factory)
+        except Exception:
+            logger.exception("Ateuli placement failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jose import JWTError, jwt
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core import crypto
+from app.models.auth import RefreshToken
+from app.services.group_counters import is_leader_clause
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 5000
+
+
+class InvalidRefreshTokenError(ValueError):
+    pass
+
+
+class RefreshTokenReuseError(ValueError):
+    """
+    A refresh token that was already rotated came back. Its family has been
+    revoked in the caller's transaction.
+    """
+
+    def __init__(self, family_id: uuid.UUID):
+        super().__init__(family_id)
+        self.family_id = family_id
+
+
+@dataclass(frozen=True)
+class IssuedTokens:
+    access_token: str
+    refresh_token: str
+    family_id: uuid.UUID
+
+
+async def issue(
+    db: AsyncSession, user_id: uuid.UUID, family_id: Optional[uuid.UUID] = None
+) -> IssuedTokens:
+    """
+    Register a new refresh token, in a new family unless `family_id` is
+    given, and sign it with a matching access token. The caller commits.
+
+    The access token says whether the user leads a group, so the rate
+    limiter can pick the leader tier without a lookup.
+    """
+    is_leader = bool(await db.scalar(select(is_leader_clause(user_id))))
+    jti = uuid.uuid4()
+    family_id = family_id or uuid.uuid4()
+    db.add(RefreshToken(
+        id=jti,
+        user_id=user_id,
+        family_id=family_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return IssuedTokens(
+        access_token=await crypto.create_access_token(
+            user_id, family_id=family_id, is_leader=is_leader
+        ),
+        refresh_token=await crypto.create_refresh_token(user_id, jti=jti, family_id=family_id),
+        family_id=family_id,
+    )
+
+
+def _claims(token: str) -> uuid.UUID:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("type") != "refresh" or "jti" not in payload:
+            raise InvalidRefreshTokenError("not a refresh token")
+        return uuid.UUID(payload["jti"])
+    except (JWTError, ValueError) as exc:
+        raise InvalidRefreshTokenError(str(exc)) from exc
+
+
+async def rotate(db: AsyncSession, token: str) -> IssuedTokens:
+    """
+    Exchange a refresh token for a new pair in the same family.
+
+    Marking the presented token used is one conditional UPDATE, so of two
+    concurrent refreshes with the same token exactly one wins. Presenting a
+    token that was already used means a copy of it is out there; the whole
+    family is revoked and RefreshTokenReuseError raised, and the caller must
+    commit before reporting the revocation to the workers.
+    """
+    jti = _claims(token)
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == jti,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    if row is not None:
+        return await issue(db, row.user_id, row.family_id)
+
+    result = await db.execute(
+        select(RefreshToken.family_id, RefreshToken.used_at, RefreshToken.revoked_at)
+        .where(RefreshToken.id == jti)
+    )
+    row = result.first()
+    if row is None or row.revoked_at is not None or row.used_at is None:
+        # Unknown, already revoked, or expired.
+        raise InvalidRefreshTokenError(jti)
+    await revoke_family(db, row.family_id)
+    raise RefreshTokenReuseError(row.family_id)
+
+
+async def revoke_family(db: AsyncSession, family_id: uuid.UUID) -> list[uuid.UUID]:
+    """
+    Revoke every token of one login. Returns the family if it had live
+    tokens, for revocations.revoke() once the caller has committed.
+    """
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+        .returning(RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(set(result.scalars()))
+
+
+async def revoke_user(db: AsyncSession, user_id: uuid.UUID) -> list[uuid.UUID]:
+    """
+    Revoke every login of a user, e.g. "log out everywhere" or a ban.
+    """
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+        .returning(RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(set(result.scalars()))
+
+
+async def purge_expired(session_factory) -> int:
+    """
+    Delete tokens past their expiry, in batches. Rows revoked within the
+    last access-token lifetime are kept for the revocation index to load.
+    """
+    purged = 0
+    while True:
+        now = datetime.now(timezone.utc)
+        revoked_before = now - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES, seconds=30)
+        async with session_factory() as db:
+            batch = (
+                select(RefreshToken.id)
+                .where(
+                    RefreshToken.expires_at <= now,
+                    or_(RefreshToken.revoked_at.is_(None), RefreshToken.revoked_at < revoked_before),
+                )
+                .limit(PURGE_BATCH_SIZE)
+            )
+            result = await db.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(batch.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        purged += result.rowcount
+        if result.rowcount < PURGE_BATCH_SIZE:
+            return purged
+
+
+async def run_refresh_token_purge(session_factory, interval_seconds: int) -> None:
+    while True:
+        try:
+            purged = await purge_expired(session_factory)
+            if purged:
+                logger.info("Purged %d expired refresh tokens", purged)
+        except Exception:
+            logger.exception("Refresh token purge failed")
+        await asyncio.sleep(interval_seconds)
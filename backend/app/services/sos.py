@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sos import SOSSignal
+from app.schemas.sos import SOSSignalIn
+from app.services.sos_escalation import next_deadline
+from app.utils.enums import HierarchyLevel, SOSStatus
+
+
+async def create_signal(db: AsyncSession, reporter_id: uuid.UUID, data: SOSSignalIn) -> SOSSignal:
+    """
+    Open a signal at the reporter's Ateuli, with its first escalation
+    deadline set from its priority. The caller commits and then schedules
+    it on escalation_scheduler.
+    """
+    now = datetime.now(timezone.utc)
+    signal = SOSSignal(
+        reporter_id=reporter_id,
+        title=data.title,
+        description=data.description,
+        location=data.location,
+        moral_filter_response=data.moral_filter_response,
+        priority=data.priority,
+        status=SOSStatus.PENDING,
+        current_level=HierarchyLevel.ATEULI,
+        escalate_at=next_deadline(HierarchyLevel.ATEULI, data.priority, now),
+    )
+    db.add(signal)
+    await db.flush()
+    return signal
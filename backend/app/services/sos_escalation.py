@@ -0,0 +1,258 @@
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.hub import group_topic, hub
+from app.models.sos import SOSEscalation, SOSSignal
+from app.services import notifications
+from app.utils.enums import HierarchyLevel, SOSPriority, SOSStatus
+
+logger = logging.getLogger(__name__)
+
+NEXT_LEVEL = {
+    HierarchyLevel.ATEULI: HierarchyLevel.ORMOTSDAATEULI,
+    HierarchyLevel.ORMOTSDAATEULI: HierarchyLevel.ASEULI,
+    HierarchyLevel.ASEULI: HierarchyLevel.ATASEULI,
+    HierarchyLevel.ATASEULI: HierarchyLevel.MEDIA,
+}
+OPEN_STATUSES = (SOSStatus.PENDING, SOSStatus.VERIFIED, SOSStatus.ESCALATED)
+# Deadlines falling in the same instant fire the most urgent signal first.
+PRIORITY_RANK = {
+    SOSPriority.CRITICAL: 0,
+    SOSPriority.HIGH: 1,
+    SOSPriority.NORMAL: 2,
+    SOSPriority.LOW: 3,
+}
+
+
+def escalation_delay(priority: SOSPriority) -> timedelta:
+    seconds = {
+        SOSPriority.CRITICAL: settings.SOS_ESCALATE_CRITICAL_SECONDS,
+        SOSPriority.HIGH: settings.SOS_ESCALATE_HIGH_SECONDS,
+        SOSPriority.NORMAL: settings.SOS_ESCALATE_NORMAL_SECONDS,
+        SOSPriority.LOW: settings.SOS_ESCALATE_LOW_SECONDS,
+    }[priority]
+    return timedelta(seconds=seconds)
+
+
+def next_deadline(
+    level: HierarchyLevel, priority: SOSPriority, since: datetime
+) -> Optional[datetime]:
+    """
+    When a signal that reached `level` at `since` escalates next; None at
+    the top of the hierarchy.
+    """
+    if level not in NEXT_LEVEL:
+        return None
+    return since + escalation_delay(priority)
+
+
+async def escalate_signals(
+    session_factory, signal_ids: list[uuid.UUID]
+) -> list[tuple[uuid.UUID, datetime, SOSPriority]]:
+    """
+    Move every listed signal whose deadline has passed up one level, in one
+    transaction: escalation rows in one INSERT, notifications for the new
+    level, then a `sos.new_signal` event to its group once committed.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED and re-checked against
+    `escalate_at`, so when several workers fire the same deadline only one
+    escalates it. Returns (id, deadline, priority) of the signals' next
+    deadlines, to schedule.
+    """
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        result = await db.execute(
+            select(SOSSignal)
+            .where(
+                SOSSignal.id.in_(signal_ids),
+                SOSSignal.escalate_at <= now,
+                SOSSignal.status.in_(OPEN_STATUSES),
+                SOSSignal.deleted_at.is_(None),
+            )
+            .order_by(SOSSignal.id)
+            .with_for_update(skip_locked=True)
+        )
+        signals = list(result.scalars())
+        if not signals:
+            return []
+
+        escalations, events, notices, rescheduled = [], [], [], []
+        for signal in signals:
+            from_level = signal.current_level
+            to_level = NEXT_LEVEL.get(from_level)
+            signal.escalate_at = None if to_level is None else next_deadline(
+                to_level, signal.priority, now
+            )
+            if to_level is None:
+                continue
+            signal.current_level = to_level
+            signal.status = SOSStatus.ESCALATED
+            escalations.append({
+                "id": uuid.uuid4(),
+                "signal_id": signal.id,
+                "from_level": from_level,
+                "to_level": to_level,
+                "escalated_by_id": None,
+                "escalated_at": now,
+                "notes": "Escalated automatically: no response in time",
+            })
+            if signal.escalate_at is not None:
+                rescheduled.append((signal.id, signal.escalate_at, signal.priority))
+
+            group_id = await notifications.sos_group_id(db, signal, to_level)
+            notices.append(await notifications.notify_sos_escalated(db, signal, to_level, group_id))
+            if group_id is not None:
+                events.append((group_topic(to_level, group_id), signal_event(signal, escalated=True)))
+
+        if escalations:
+            await db.execute(insert(SOSEscalation), escalations)
+        await db.commit()
+
+    for topic, data in events:
+        await hub.publish(topic, "sos.new_signal", data)
+    for notice in notices:
+        await notice.publish()
+    if escalations:
+        logger.info("Escalated %d SOS signals", len(escalations))
+    return rescheduled
+
+
+def signal_event(signal: SOSSignal, escalated: bool) -> dict[str, Any]:
+    """
+    Payload of `sos.new_signal`, sent to the group a signal has reached.
+    """
+    return {
+        "id": signal.id,
+        "title": signal.title,
+        "priority": signal.priority,
+        "level": signal.current_level,
+        "escalated": escalated,
+    }
+
+
+class EscalationScheduler:
+    """
+    In-process timer for SOS escalation deadlines.
+
+    Deadlines sit in a heap ordered by (time, priority); the runner sleeps
+    until the earliest one and escalates everything due at once. State is
+    rebuilt from the partial index on `escalate_at` every resync interval,
+    which picks up signals created by other workers and makes restarts
+    safe, and covers only deadlines up to two intervals ahead, so the heap
+    stays small. Every worker may run one: escalate_signals() claims rows,
+    so a deadline fires once.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, uuid.UUID]] = []
+        # Current deadline per signal; heap entries that disagree are stale.
+        self._deadlines: dict[uuid.UUID, float] = {}
+        self._wakeup = asyncio.Event()
+        self.fired = 0
+        self.batches = 0
+        self.max_lag_seconds = 0.0
+
+    def schedule(self, signal_id: uuid.UUID, at: datetime, priority: SOSPriority) -> None:
+        deadline = at.timestamp()
+        if self._deadlines.get(signal_id) == deadline:
+            return
+        self._deadlines[signal_id] = deadline
+        heapq.heappush(self._heap, (deadline, PRIORITY_RANK[priority], signal_id))
+        if self._heap[0][2] == signal_id:
+            self._wakeup.set()
+
+    def cancel(self, signal_id: uuid.UUID) -> None:
+        self._deadlines.pop(signal_id, None)
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._heap:
+            deadline, _, signal_id = self._heap[0]
+            if self._deadlines.get(signal_id) == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def _take_due(self, now: float) -> list[uuid.UUID]:
+        due = []
+        while len(due) < settings.SOS_ESCALATION_BATCH_SIZE:
+            deadline = self._next_deadline()
+            if deadline is None or deadline > now:
+                break
+            _, _, signal_id = heapq.heappop(self._heap)
+            del self._deadlines[signal_id]
+            self.max_lag_seconds = max(self.max_lag_seconds, now - deadline)
+            due.append(signal_id)
+        return due
+
+    async def load(self, db: AsyncSession, horizon_seconds: float) -> int:
+        """
+        Schedule every open deadline before now + `horizon_seconds`.
+        """
+        until = datetime.now(timezone.utc) + timedelta(seconds=horizon_seconds)
+        result = await db.execute(
+            select(SOSSignal.id, SOSSignal.escalate_at, SOSSignal.priority).where(
+                SOSSignal.escalate_at.is_not(None),
+                SOSSignal.escalate_at <= until,
+                SOSSignal.status.in_(OPEN_STATUSES),
+                SOSSignal.deleted_at.is_(None),
+            )
+        )
+        rows = result.all()
+        for signal_id, escalate_at, priority in rows:
+            self.schedule(signal_id, escalate_at, priority)
+        return len(rows)
+
+    async def run(self, session_factory, resync_seconds: int) -> None:
+        next_sync = 0.0
+        while True:
+            now = time.time()
+            if now >= next_sync:
+                try:
+                    async with session_factory() as db:
+                        await self.load(db, 2 * resync_seconds)
+                except Exception:
+                    logger.exception("Loading SOS escalation deadlines failed")
+                next_sync = now + resync_seconds
+
+            due = self._take_due(now)
+            if due:
+                try:
+                    for signal_id, at, priority in await escalate_signals(session_factory, due):
+                        self.schedule(signal_id, at, priority)
+                    self.fired += len(due)
+                    self.batches += 1
+                except Exception:
+                    # The deadlines are still in the database; the next
+                    # resync schedules them again.
+                    logger.exception("SOS escalation failed")
+                continue
+
+            deadline = self._next_deadline()
+            wake_at = next_sync if deadline is None else min(deadline, next_sync)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, wake_at - time.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        deadline = self._next_deadline()
+        return {
+            "scheduled": len(self._deadlines),
+            "next_in_seconds": None if deadline is None else max(0.0, deadline - time.time()),
+            "fired": self.fired,
+            "batches": self.batches,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+
+escalation_scheduler = EscalationScheduler()
@@ -0,0 +1,184 @@
+import bisect
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.cache import create_shared_cache
+from app.models.territory import Territory
+from app.utils.enums import TerritoryType
+
+_VERSION_KEY = "territory:snapshot_version"
+
+
+@dataclass
+class TerritoryNode:
+    id: uuid.UUID
+    name: str
+    name_en: Optional[str]
+    type: TerritoryType
+    parent_id: Optional[uuid.UUID]
+    code: Optional[str]
+    path: str
+    updated_at: datetime
+    children: list[uuid.UUID] = field(default_factory=list)
+
+    def dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "name_en": self.name_en,
+            "type": self.type,
+            "parent_id": self.parent_id,
+            "code": self.code,
+        }
+
+
+class TerritorySnapshot:
+    """
+    Immutable in-memory copy of the whole territory tree.
+    """
+
+    def __init__(self, nodes: list[TerritoryNode]):
+        self.nodes: dict[uuid.UUID, TerritoryNode] = {n.id: n for n in nodes}
+        # Sorted by path, so every subtree is a contiguous run after its root.
+        self.ordered: list[TerritoryNode] = sorted(nodes, key=lambda n: n.path)
+        self._paths = [n.path for n in self.ordered]
+        self._position = {n.id: i for i, n in enumerate(self.ordered)}
+        # Changes whenever a territory is added, edited or removed; used as
+        # the HTTP cache version of every territory response.
+        latest = max((n.updated_at for n in nodes), default=None)
+        self.revision = f"{len(nodes)}:{latest.isoformat() if latest else ''}"
+        for node in self.ordered:
+            if node.parent_id in self.nodes:
+                self.nodes[node.parent_id].children.append(node.id)
+
+    def get(self, territory_id: uuid.UUID) -> Optional[TerritoryNode]:
+        return self.nodes.get(territory_id)
+
+    def roots(self) -> list[TerritoryNode]:
+        return [n for n in self.ordered if n.parent_id is None]
+
+    def ancestors(self, territory_id: uuid.UUID) -> list[TerritoryNode]:
+        node = self.nodes.get(territory_id)
+        if node is None:
+            return []
+        ids = node.path.strip("/").split("/")[:-1]
+        return [self.nodes[uuid.UUID(i)] for i in ids]
+
+    def subtree(self, territory_id: uuid.UUID) -> list[TerritoryNode]:
+        """
+        The territory and all of its descendants.
+        """
+        start = self._position.get(territory_id)
+        if start is None:
+            return []
+        prefix = self.ordered[start].path
+        end = start + 1
+        while end < len(self.ordered) and self.ordered[end].path.startswith(prefix):
+            end += 1
+        return self.ordered[start:end]
+
+    def page_after(self, path: Optional[str], limit: int) -> list[TerritoryNode]:
+        """
+        Up to `limit` territories ordered after `path`, for keyset paging.
+        """
+        start = bisect.bisect_right(self._paths, path) if path is not None else 0
+        return self.ordered[start:start + limit]
+
+    def subtree_ids(self, territory_id: uuid.UUID) -> list[uuid.UUID]:
+        return [n.id for n in self.subtree(territory_id)]
+
+
+class TerritorySnapshotStore:
+    """
+    Holds the current snapshot and reloads it when the tree changes.
+
+    Writers call `invalidate()` after committing, which bumps a version token
+    in the shared cache. Each worker compares its token with the shared one at
+    most every TERRITORY_SNAPSHOT_CHECK_SECONDS and reloads when they differ.
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[TerritorySnapshot] = None
+        self.version: Optional[str] = None
+        self.shared = create_shared_cache()
+        self._checked_at = 0.0
+        self.reloads = 0
+
+    async def load(self, db: AsyncSession) -> TerritorySnapshot:
+        result = await db.execute(
+            select(
+                Territory.id,
+                Territory.name,
+                Territory.name_en,
+                Territory.type,
+                Territory.parent_id,
+                Territory.code,
+                Territory.path,
+                Territory.updated_at,
+            ).where(Territory.deleted_at.is_(None))
+        )
+        self.snapshot = TerritorySnapshot([TerritoryNode(*row) for row in result])
+        self.reloads += 1
+        return self.snapshot
+
+    async def _shared_version(self) -> Optional[str]:
+        try:
+            return await self.shared.get(_VERSION_KEY)
+        except Exception:
+            return self.version
+
+    async def get(self, db: AsyncSession) -> TerritorySnapshot:
+        now = time.monotonic()
+        if self.snapshot is not None and now - self._checked_at < settings.TERRITORY_SNAPSHOT_CHECK_SECONDS:
+            return self.snapshot
+
+        self._checked_at = now
+        version = await self._shared_version()
+        if self.snapshot is None or version != self.version:
+            await self.load(db)
+            self.version = version
+        return self.snapshot
+
+    async def invalidate(self) -> None:
+        self.snapshot = None
+        self.version = uuid.uuid4().hex
+        try:
+            await self.shared.set(_VERSION_KEY, self.version, settings.TERRITORY_SNAPSHOT_VERSION_TTL_SECONDS)
+        except Exception:
+            pass
+
+
+territory_snapshot = TerritorySnapshotStore()
+
+
+def subtree_ids_select(root_path: str):
+    """
+    SELECT of the ids under a territory path, for use as an IN (...) filter
+    where the snapshot is not at hand. The constant prefix lets Postgres
+    answer it with a single range scan on idx_territories_path.
+    """
+    return select(Territory.id).where(Territory.path.startswith(root_path, autoescape=True))
+
+
+async def create_territory(db: AsyncSession, **fields: Any) -> Territory:
+    territory = Territory(**fields)
+    db.add(territory)
+    await db.commit()
+    await territory_snapshot.invalidate()
+    return territory
+
+
+async def move_territory(
+    db: AsyncSession, territory: Territory, parent_id: Optional[uuid.UUID]
+) -> Territory:
+    territory.parent_id = parent_id
+    await db.commit()
+    await territory_snapshot.invalidate()
+    return territory
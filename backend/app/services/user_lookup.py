@@ -0,0 +1,64 @@
+from typing import Optional
+
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import crypto, security
+from app.models.user import User
+
+
+async def get_user_by_phone(db: AsyncSession, phone_number: str) -> Optional[User]:
+    """
+    Indexed lookup by phone digest, falling back to the plaintext column for
+    users whose digest has not been written yet.
+    """
+    keys = security.phone_number_lookup_keys(phone_number)
+    result = await db.execute(
+        select(User).where(
+            or_(
+                User.phone_hash.in_(keys),
+                User.phone_number == security.normalize_phone_number(phone_number),
+            )
+        )
+    )
+    return result.scalars().first()
+
+
+async def personal_id_exists(db: AsyncSession, personal_id: str) -> bool:
+    keys = security.personal_id_lookup_keys(personal_id)
+    result = await db.execute(
+        select(exists().where(User.personal_id_hash.in_(keys)))
+    )
+    return bool(result.scalar())
+
+
+async def upgrade_lookup_hashes(
+    user: User,
+    phone_number: str,
+    personal_id: Optional[str] = None,
+) -> bool:
+    """
+    Rewrite a user's lookup digests under the current key version.
+
+    Called on login. The phone digest can always be recomputed. A personal ID
+    digest that is a legacy bcrypt hash can only be replaced when the personal
+    ID itself is presented, after a one-time bcrypt verify. Returns True if the
+    user row was changed; the caller's session commits it.
+    """
+    changed = False
+
+    if security.lookup_hash_needs_update(user.phone_hash):
+        user.phone_hash = security.hash_phone_number(phone_number)
+        changed = True
+
+    if personal_id is not None and security.lookup_hash_needs_update(user.personal_id_hash):
+        stored = user.personal_id_hash
+        if security.is_legacy_lookup_hash(stored):
+            valid = await crypto.verify_legacy_lookup_hash(personal_id, stored)
+        else:
+            valid = stored in security.personal_id_lookup_keys(personal_id)
+        if valid:
+            user.personal_id_hash = security.hash_personal_id(personal_id)
+            changed = True
+
+    return changed
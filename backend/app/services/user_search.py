@@ -0,0 +1,75 @@
+from typing import Any
+
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import security
+from app.models.user import User
+from app.utils.transliteration import normalize_search_text
+
+# Below this many characters trigrams are too unselective; match prefixes only.
+MIN_TRIGRAM_QUERY = 3
+MIN_PHONE_DIGITS = 6
+
+_COLUMNS = (User.id, User.full_name, User.role, User.territory_id)
+
+
+def _looks_like_phone(q: str) -> bool:
+    digits = sum(c.isdigit() for c in q)
+    return digits >= MIN_PHONE_DIGITS and all(c.isdigit() or c in "+-() " for c in q.strip())
+
+
+def _row(row: Any) -> dict[str, Any]:
+    return {"id": row.id, "full_name": row.full_name, "role": row.role, "territory_id": row.territory_id}
+
+
+async def find_by_phone(db: AsyncSession, q: str) -> list[dict[str, Any]]:
+    """
+    Exact phone match through the unique lookup-digest index.
+    """
+    result = await db.execute(
+        select(*_COLUMNS).where(
+            or_(
+                User.phone_hash.in_(security.phone_number_lookup_keys(q)),
+                User.phone_number == security.normalize_phone_number(q),
+            ),
+            User.deleted_at.is_(None),
+        )
+    )
+    return [_row(row) for row in result]
+
+
+async def search_users(db: AsyncSession, q: str, limit: int) -> list[dict[str, Any]]:
+    """
+    Users matching a phone number exactly or a name approximately.
+
+    Names are matched on `search_name`, so Georgian and Latin spellings find
+    each other. Short queries are prefix scans on the text_pattern_ops index.
+    Longer ones also use the pg_trgm GIN index for substring and fuzzy
+    matches. Prefix hits rank first, then the closest by trigram similarity.
+    At most `limit` rows are returned.
+    """
+    if _looks_like_phone(q):
+        return await find_by_phone(db, q)
+
+    term = normalize_search_text(q)
+    if not term:
+        return []
+
+    prefix = User.search_name.startswith(term, autoescape=True)
+    query = select(*_COLUMNS).where(User.deleted_at.is_(None)).limit(limit)
+
+    if len(term) < MIN_TRIGRAM_QUERY:
+        query = query.where(prefix).order_by(User.search_name)
+    elif db.bind.dialect.name == "postgresql":
+        similar = User.search_name.op("%")(literal(term))
+        query = query.where(
+            or_(similar, User.search_name.contains(term, autoescape=True))
+        ).order_by(prefix.desc(), func.similarity(User.search_name, term).desc())
+    else:
+        query = query.where(User.search_name.contains(term, autoescape=True)).order_by(
+            prefix.desc(), User.search_name
+        )
+
+    result = await db.execute(query)
+    return [_row(row) for row in result]
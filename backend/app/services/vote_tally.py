@@ -0,0 +1,346 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, bindparam, exists, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.hub import BROADCAST_TOPIC, group_topic, hub
+from app.models.election import Election, ElectionCandidate, Vote
+from app.models.user import User
+from app.services.group_counters import member_ids_select
+from app.services import notifications
+from app.services.notifications import LEVEL_MODELS, SCOPE_LEVELS
+from app.utils.enums import ElectionScopeType, ElectionStatus
+
+logger = logging.getLogger(__name__)
+
+STARTED_EVENT = "election.started"
+
+
+class ElectionNotFoundError(LookupError):
+    pass
+
+
+class CandidateNotFoundError(LookupError):
+    pass
+
+
+class ElectionNotActiveError(ValueError):
+    pass
+
+
+class AlreadyVotedError(ValueError):
+    pass
+
+
+class NotEligibleError(ValueError):
+    pass
+
+
+def _vote_hash(vote_id: uuid.UUID, election_id: uuid.UUID, candidate_id: uuid.UUID, cast_at: datetime) -> str:
+    message = f"{vote_id}:{election_id}:{candidate_id}:{cast_at.isoformat()}"
+    return hmac.new(settings.SECRET_KEY.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+async def cast_vote(
+    db: AsyncSession,
+    election_id: uuid.UUID,
+    candidate_id: uuid.UUID,
+    voter_id: uuid.UUID,
+) -> Vote:
+    """
+    Record a vote as a single INSERT into `votes`.
+
+    No counter row is touched, so votes in the same election never wait on
+    each other; unique_vote_per_election rejects a second vote. Totals are
+    folded in later by fold_election().
+
+    The election row is held FOR KEY SHARE until the caller commits. Voters
+    and the folder's total update do not conflict with that, but
+    close_election()'s FOR UPDATE does: a vote either commits before the
+    final fold or sees the election completed.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(
+            Election.status,
+            and_(Election.starts_at <= now, Election.ends_at > now),
+            Election.scope_type,
+            Election.scope_id,
+        )
+        .join(ElectionCandidate, ElectionCandidate.election_id == Election.id)
+        .where(Election.id == election_id, ElectionCandidate.id == candidate_id)
+        .with_for_update(read=True, key_share=True, of=Election)
+    )
+    row = result.first()
+    if row is None:
+        raise CandidateNotFoundError(candidate_id)
+
+    status, is_open, scope_type, scope_id = row
+    if status != ElectionStatus.ACTIVE or not is_open:
+        raise ElectionNotActiveError(election_id)
+    if not await _in_scope(db, voter_id, scope_type, scope_id):
+        raise NotEligibleError(election_id)
+
+    vote_id = uuid.uuid4()
+    vote = Vote(
+        id=vote_id,
+        election_id=election_id,
+        voter_id=voter_id,
+        candidate_id=candidate_id,
+        cast_at=now,
+        vote_hash=_vote_hash(vote_id, election_id, candidate_id, now),
+        tallied=False,
+    )
+    db.add(vote)
+    try:
+        await db.flush()
+    except IntegrityError:
+        raise AlreadyVotedError(election_id)
+    return vote
+
+
+async def _in_scope(
+    db: AsyncSession,
+    voter_id: uuid.UUID,
+    scope_type: ElectionScopeType,
+    scope_id: Optional[uuid.UUID],
+) -> bool:
+    """
+    Whether the voter is an active member of the election's group; national
+    elections are open to every user.
+    """
+    if scope_type == ElectionScopeType.NATIONAL:
+        return True
+    level = SCOPE_LEVELS.get(scope_type)
+    if level is None or scope_id is None:
+        return False
+    members = member_ids_select(LEVEL_MODELS[level], scope_id).where(User.id == voter_id)
+    return bool(await db.scalar(select(exists(members))))
+
+
+async def fold_election(db: AsyncSession, election_id: uuid.UUID) -> int:
+    """
+    Fold untallied votes into the per-candidate and per-election totals.
+
+    Marking votes as tallied and adding them to the counters happen in the
+    caller's transaction, so a vote is counted exactly once even if two
+    folders race: the second one finds no untallied rows. Returns the number
+    of votes folded.
+    """
+    result = await db.execute(
+        update(Vote)
+        .where(Vote.election_id == election_id, Vote.tallied.is_(False))
+        .values(tallied=True)
+        .returning(Vote.candidate_id)
+        .execution_options(synchronize_session=False)
+    )
+    counts = Counter(result.scalars())
+    if not counts:
+        return 0
+
+    candidates = ElectionCandidate.__table__
+    await db.execute(
+        update(candidates)
+        .where(candidates.c.id == bindparam("candidate_id"))
+        .values(vote_count=candidates.c.vote_count + bindparam("delta")),
+        [{"candidate_id": c, "delta": n} for c, n in sorted(counts.items())],
+    )
+    folded = sum(counts.values())
+    await db.execute(
+        update(Election)
+        .where(Election.id == election_id)
+        .values(total_votes=Election.total_votes + folded)
+        .execution_options(synchronize_session=False)
+    )
+    return folded
+
+
+async def fold_pending(session_factory) -> int:
+    """
+    Fold every election that has untallied votes, one transaction each.
+    """
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Vote.election_id).where(Vote.tallied.is_(False)).distinct()
+        )
+        election_ids = list(result.scalars())
+
+    folded = 0
+    for election_id in election_ids:
+        async with session_factory() as db:
+            folded += await fold_election(db, election_id)
+            await db.commit()
+    return folded
+
+
+def started_event(election: Election) -> dict[str, Any]:
+    return {
+        "election_id": election.id,
+        "election_type": election.election_type,
+        "starts_at": election.starts_at,
+    }
+
+
+def started_topic(election: Election) -> str:
+    """
+    Where `election.started` goes: the election's group, or everyone for
+    national elections.
+    """
+    level = SCOPE_LEVELS.get(election.scope_type)
+    if level is not None and election.scope_id is not None:
+        return group_topic(level, election.scope_id)
+    return BROADCAST_TOPIC
+
+
+async def open_due(session_factory) -> list[uuid.UUID]:
+    """
+    Open every scheduled election whose voting period has begun, one
+    transaction each, notifying its voters. Events are published once the
+    election is committed. Returns the ids of the elections opened.
+    """
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Election.id).where(
+                Election.status == ElectionStatus.SCHEDULED,
+                Election.starts_at <= now,
+                Election.ends_at > now,
+                Election.deleted_at.is_(None),
+            )
+        )
+        election_ids = list(result.scalars())
+
+    opened = []
+    for election_id in election_ids:
+        async with session_factory() as db:
+            election = await db.get(Election, election_id, with_for_update=True, populate_existing=True)
+            if election is None or election.status != ElectionStatus.SCHEDULED:
+                # Opened by another worker meanwhile
+                continue
+            election.status = ElectionStatus.ACTIVE
+            notice = await notifications.notify_election_started(db, election)
+            topic, event = started_topic(election), started_event(election)
+            await db.commit()
+        await hub.publish(topic, STARTED_EVENT, event)
+        await notice.publish()
+        opened.append(election_id)
+    return opened
+
+
+async def close_due(session_factory) -> list[uuid.UUID]:
+    """
+    Close every active election past its end, one transaction each.
+    Returns the ids of the elections closed.
+    """
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Election.id).where(
+                Election.status == ElectionStatus.ACTIVE,
+                Election.ends_at <= now,
+                Election.deleted_at.is_(None),
+            )
+        )
+        election_ids = list(result.scalars())
+
+    closed = []
+    for election_id in election_ids:
+        async with session_factory() as db:
+            election = await close_election(db, election_id)
+            await db.commit()
+        if election.status == ElectionStatus.COMPLETED:
+            closed.append(election_id)
+    return closed
+
+
+async def run_tally_folder(session_factory, interval_seconds: int) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await open_due(session_factory)
+            await fold_pending(session_factory)
+            await close_due(session_factory)
+        except Exception:
+            logger.exception("Vote tally fold failed")
+
+
+async def read_results(db: AsyncSession, election_id: uuid.UUID) -> dict[str, Any]:
+    """
+    Folded totals plus the votes cast since the last fold.
+
+    The recent delta is read from the partial index on untallied votes and is
+    bounded by what arrives within one fold interval.
+    """
+    election = await db.get(Election, election_id)
+    if election is None:
+        raise ElectionNotFoundError(election_id)
+
+    result = await db.execute(
+        select(ElectionCandidate.id, ElectionCandidate.user_id, ElectionCandidate.vote_count)
+        .where(ElectionCandidate.election_id == election_id)
+    )
+    candidates = result.all()
+
+    result = await db.execute(
+        select(Vote.candidate_id, func.count())
+        .where(Vote.election_id == election_id, Vote.tallied.is_(False))
+        .group_by(Vote.candidate_id)
+    )
+    pending = dict(result.all())
+
+    totals = {c.id: c.vote_count + pending.get(c.id, 0) for c in candidates}
+    total_votes = sum(totals.values())
+    return {
+        "election": {
+            "id": election.id,
+            "title": election.title,
+            "status": election.status,
+            "total_votes": total_votes,
+        },
+        "results": [
+            {
+                "candidate": {"id": c.id, "user_id": c.user_id},
+                "vote_count": totals[c.id],
+                "percentage": round(100.0 * totals[c.id] / total_votes, 2) if total_votes else 0.0,
+                "is_winner": election.winner_id is not None and c.user_id == election.winner_id,
+            }
+            for c in sorted(candidates, key=lambda c: totals[c.id], reverse=True)
+        ],
+    }
+
+
+async def close_election(db: AsyncSession, election_id: uuid.UUID) -> Election:
+    """
+    Fold the remaining votes, pick the winner and mark the election completed.
+
+    FOR UPDATE on the election waits for every vote still holding its share
+    lock, so the final fold sees them all. An election that is no longer
+    active (e.g. closed by another worker meanwhile) is returned unchanged.
+    """
+    election = await db.get(Election, election_id, with_for_update=True, populate_existing=True)
+    if election is None:
+        raise ElectionNotFoundError(election_id)
+    if election.status != ElectionStatus.ACTIVE:
+        return election
+
+    await fold_election(db, election_id)
+    result = await db.execute(
+        select(ElectionCandidate.user_id)
+        .where(ElectionCandidate.election_id == election_id)
+        .order_by(ElectionCandidate.vote_count.desc())
+        .limit(1)
+    )
+    await db.refresh(election)
+    election.winner_id = result.scalar()
+    election.status = ElectionStatus.COMPLETED
+    await db.flush()
+    return election
@@ -65,6 +65,11 @@ class HierarchyLevel(str, Enum):
     ATASEULI = "ataseuli"
     MEDIA = "media"
 
+class LeaderboardMetric(str, Enum):
+    ENDORSEMENTS = "endorsements"
+    MEMBERS_RECRUITED = "members_recruited"
+    INITIATIVES_SUPPORTED = "initiatives_supported"
+
 class InitiativeCategory(str, Enum):
     EDUCATION = "education"
     INFRASTRUCTURE = "infrastructure"
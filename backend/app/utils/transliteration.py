@@ -0,0 +1,34 @@
+import re
+import unicodedata
+
+# Georgian Mkhedruli to Latin, following the national romanization with the
+# ejective apostrophes dropped, since people typing Latin names leave them out.
+GEORGIAN_TO_LATIN = {
+    "ა": "a", "ბ": "b", "გ": "g", "დ": "d", "ე": "e", "ვ": "v", "ზ": "z",
+    "თ": "t", "ი": "i", "კ": "k", "ლ": "l", "მ": "m", "ნ": "n", "ო": "o",
+    "პ": "p", "ჟ": "zh", "რ": "r", "ს": "s", "ტ": "t", "უ": "u", "ფ": "p",
+    "ქ": "k", "ღ": "gh", "ყ": "q", "შ": "sh", "ჩ": "ch", "ც": "ts", "ძ": "dz",
+    "წ": "ts", "ჭ": "ch", "ხ": "kh", "ჯ": "j", "ჰ": "h",
+}
+
+_MTAVRULI_START, _MTAVRULI_END = 0x1C90, 0x1CBF
+_MKHEDRULI_START = 0x10D0
+_NOT_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _to_latin(char: str) -> str:
+    code = ord(char)
+    if _MTAVRULI_START <= code <= _MTAVRULI_END:
+        # Mtavruli capitals mirror the Mkhedruli block.
+        char = chr(code - _MTAVRULI_START + _MKHEDRULI_START)
+    return GEORGIAN_TO_LATIN.get(char, char)
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Fold a name to lowercase ASCII words separated by single spaces, so
+    "გიორგი", "Giorgi" and "GIÓRGI" all become "giorgi".
+    """
+    latin = "".join(_to_latin(c) for c in text)
+    ascii_text = unicodedata.normalize("NFKD", latin).encode("ascii", "ignore").decode()
+    return _NOT_WORD.sub(" ", ascii_text.lower()).strip()
@@ -0,0 +1,290 @@
+"""
+Load benchmark for the API.
+
+Generates a synthetic polity (see benchmarks.polity), then drives the real
+routers of app/api/v1 in-process through an ASGI client and reports latency
+percentiles per endpoint and per number of SQL statements a request ran.
+Output is JSON, so runs from different commits can be compared:
+
+    python -m benchmarks.api --output before.json
+    git checkout ... && python -m benchmarks.api --compare before.json
+
+The target database is wiped. SQLite (the default) is a stand-in; point
+--database-url at a scratch Postgres for numbers that mean something
+against NFR-2.1 (p95 < 200ms).
+"""
+# First: every request is measured; nothing may be throttled or need Redis.
+from benchmarks import environment  # noqa: F401
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+_statements: contextvars.ContextVar[Optional[list[int]]] = contextvars.ContextVar(
+    "statements", default=None
+)
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 3)
+
+    return {
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _scenarios(polity, rng: random.Random, token: Callable) -> dict[str, Callable]:
+    """
+    Endpoint name -> function building (method, path, params, headers).
+    """
+    api = "/api/v1"
+
+    def user_headers() -> dict[str, str]:
+        return {"Authorization": f"Bearer {token(rng.choice(polity.user_ids))}"}
+
+    def vote():
+        if not polity.open_ballots:
+            return None
+        election_id, candidate_id, voter_id = polity.open_ballots.pop()
+        return (
+            "POST", f"{api}/elections/{election_id}/vote", {"candidate_id": str(candidate_id)},
+            {"Authorization": f"Bearer {token(voter_id)}"},
+        )
+
+    return {
+        "GET /territories/": lambda: ("GET", f"{api}/territories/", {"per_page": 50}, {}),
+        "GET /territories/{id}": lambda: (
+            "GET", f"{api}/territories/{rng.choice(polity.district_ids)}", {}, {},
+        ),
+        "GET /territories/{id}/ateulis": lambda: (
+            "GET", f"{api}/territories/{rng.choice(polity.district_ids)}/ateulis", {}, {},
+        ),
+        "GET /territories/{id}/statistics": lambda: (
+            "GET", f"{api}/territories/{rng.choice(polity.region_ids)}/statistics", {}, {},
+        ),
+        "GET /users/me": lambda: ("GET", f"{api}/users/me", {}, user_headers()),
+        "GET /users/search": lambda: (
+            "GET", f"{api}/users/search", {"q": rng.choice(polity.search_terms)}, user_headers(),
+        ),
+        "GET /endorsements/available-geders": lambda: (
+            "GET", f"{api}/endorsements/available-geders",
+            {"territory_id": str(rng.choice(polity.district_ids)), "sample": rng.random() < 0.5},
+            {},
+        ),
+        "GET /elections/": lambda: ("GET", f"{api}/elections/", {"per_page": 20}, {}),
+        "GET /elections/{id}/results": lambda: (
+            "GET", f"{api}/elections/{rng.choice(polity.election_ids)}/results", {}, {},
+        ),
+        "POST /elections/{id}/vote": vote,
+        "GET /sos/": lambda: ("GET", f"{api}/sos/", {"per_page": 20}, user_headers()),
+        "GET /initiatives/": lambda: ("GET", f"{api}/initiatives/", {"per_page": 20}, user_headers()),
+        "GET /notifications/": lambda: (
+            "GET", f"{api}/notifications/", {"per_page": 20}, user_headers(),
+        ),
+    }
+
+
+async def _drive(client, build: Callable, requests: int, warmup: int) -> list[tuple[float, int, int]]:
+    """
+    Issue requests one at a time; returns (seconds, statements, status) per
+    measured request.
+    """
+    samples = []
+    for i in range(warmup + requests):
+        spec = build()
+        if spec is None:
+            break
+        method, path, params, headers = spec
+        counter = [0]
+        token = _statements.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, headers=headers)
+        finally:
+            elapsed = time.perf_counter() - started
+            _statements.reset(token)
+        if i >= warmup:
+            samples.append((elapsed, counter[0], response.status_code))
+    return samples
+
+
+def _report(samples_by_endpoint: dict[str, list[tuple[float, int, int]]]) -> dict[str, Any]:
+    endpoints = {}
+    by_query_count: dict[int, list[float]] = defaultdict(list)
+    for name, samples in samples_by_endpoint.items():
+        if not samples:
+            continue
+        statements = sorted(s[1] for s in samples)
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": sum(1 for s in samples if s[2] >= 400),
+            "status_codes": sorted({s[2] for s in samples}),
+            **_percentiles([s[0] for s in samples]),
+            "queries": {
+                "min": statements[0],
+                "p50": statements[len(statements) // 2],
+                "max": statements[-1],
+            },
+        }
+        for elapsed, count, _ in samples:
+            by_query_count[count].append(elapsed)
+    return {
+        "endpoints": endpoints,
+        "by_query_count": {
+            str(count): {"requests": len(samples), **_percentiles(samples)}
+            for count, samples in sorted(by_query_count.items())
+        },
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[str]:
+    """
+    Endpoints whose p95 or median statement count got worse than the
+    baseline by more than `tolerance` (a fraction).
+    """
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if now["queries"]["p50"] > before["queries"]["p50"]:
+            regressions.append(
+                f"{name}: queries {before['queries']['p50']} -> {now['queries']['p50']}"
+            )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    # The app reads its database URL at import time.
+    os.environ["DATABASE_URL"] = args.database_url
+
+    import httpx
+    from fastapi import FastAPI
+    from sqlalchemy import event
+
+    from benchmarks import sqlite_compat  # noqa: F401
+    from benchmarks.polity import PolityScale, generate_polity
+    from app.api.v1 import api_router
+    from app.config import settings
+    from app.core import security
+    from app.core.audit import audit_sink
+    from app.core.database import AsyncSessionLocal, engine, read_engine
+
+    def count_statement(*_):
+        counter = _statements.get()
+        if counter is not None:
+            counter[0] += 1
+
+    for db_engine in {engine, read_engine}:
+        event.listen(db_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    scale = PolityScale(
+        regions=args.regions,
+        districts_per_region=args.districts_per_region,
+        users=args.users,
+        elections=args.elections,
+    )
+    started = time.perf_counter()
+    polity = await generate_polity(engine, AsyncSessionLocal, scale, seed=args.seed)
+    generate_seconds = time.perf_counter() - started
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    audit_sink.start(AsyncSessionLocal)
+
+    rng = random.Random(args.seed)
+    tokens: dict = {}
+
+    def token(user_id) -> str:
+        if user_id not in tokens:
+            tokens[user_id] = security.create_access_token(user_id)
+        return tokens[user_id]
+
+    scenarios = _scenarios(polity, rng, token)
+    selected = [s for s in scenarios if not args.only or any(o in s for o in args.only)]
+    samples = {}
+    # Unhandled errors become 500s and are counted, as a server would.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        if args.elections and not polity.election_ids:
+            # Elections are held in full Ateulis, and only GeDers are placed.
+            raise SystemExit(f"No Ateuli filled up with {args.users} users; use more --users")
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name in selected:
+                samples[name] = await _drive(client, scenarios[name], args.requests, args.warmup)
+    finally:
+        await audit_sink.stop()
+        await engine.dispose()
+        if read_engine is not engine:
+            await read_engine.dispose()
+
+    return {
+        "meta": {
+            "commit": _commit(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "scale": vars(scale),
+            "requests_per_endpoint": args.requests,
+            "warmup": args.warmup,
+            "generate_seconds": round(generate_seconds, 2),
+        },
+        **_report(samples),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///benchmark.db")
+    parser.add_argument("--regions", type=int, default=5)
+    parser.add_argument("--districts-per-region", type=int, default=4)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--elections", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="Run endpoints whose name contains any of these")
+    parser.add_argument("--output", help="Write the JSON report here as well")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
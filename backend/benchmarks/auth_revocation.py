@@ -0,0 +1,83 @@
+"""
+Micro-benchmark for the token revocation check.
+
+Measures authenticate() for a cached principal with an empty revocation
+index and with `--revoked` families in it, and the bare is_revoked() probe,
+so the overhead the check adds to every authenticated request is visible.
+Run from the backend directory:
+
+    python -m benchmarks.auth_revocation --revoked 100000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+from benchmarks import environment  # noqa: F401
+
+from app import dependencies
+from app.core import security
+from app.core.principal import Principal, cache_principal
+from app.core.pubsub import InMemoryPubSub
+from app.core.revocation import RevocationIndex
+from app.utils.enums import UserRole, UserStatus
+
+
+async def _time_authenticate(tokens, rounds):
+    samples = []
+    for i in range(rounds):
+        token = tokens[i % len(tokens)]
+        started = time.perf_counter()
+        await dependencies.authenticate(None, token)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    }
+
+
+def _time_probe(index, family_ids, rounds):
+    started = time.perf_counter()
+    for i in range(rounds):
+        index.is_revoked(family_ids[i % len(family_ids)])
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+async def main(rounds: int, users: int, revoked: int) -> dict:
+    tokens, families = [], []
+    for _ in range(users):
+        user_id, family_id = uuid.uuid4(), uuid.uuid4()
+        await cache_principal(Principal(user_id, UserRole.GEDER, UserStatus.ACTIVE, None, None))
+        tokens.append(security.create_access_token(user_id, family_id=family_id))
+        families.append(str(family_id))
+
+    index = dependencies.revocations = RevocationIndex(InMemoryPubSub())
+    empty = await _time_authenticate(tokens, rounds)
+    empty_probe = _time_probe(index, families, rounds)
+
+    await index.revoke((uuid.uuid4() for _ in range(revoked)), datetime.now(timezone.utc))
+    full = await _time_authenticate(tokens, rounds)
+    return {
+        "rounds": rounds,
+        "users": users,
+        "revoked_families": revoked,
+        "probe_empty_us": empty_probe,
+        "probe_full_us": _time_probe(index, families, rounds),
+        "authenticate_empty": empty,
+        "authenticate_full": full,
+        "overhead_us": full["mean_us"] - empty["mean_us"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--revoked", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.rounds, args.users, args.revoked)), indent=2))
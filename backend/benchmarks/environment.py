@@ -0,0 +1,24 @@
+"""
+Settings the benchmarks run with unless the environment says otherwise:
+in-memory backends instead of Redis, and quotas high enough that every
+request is allowed and fully processed.
+
+Settings are read when app.config is imported, so import this module before
+anything from app.
+"""
+import os
+
+DEFAULTS = {
+    "SECRET_KEY": "benchmark",
+    **{
+        backend: "memory"
+        for backend in ("CACHE_BACKEND", "PUBSUB_BACKEND", "RATE_LIMIT_BACKEND", "RANKING_BACKEND")
+    },
+    **{
+        f"RATE_LIMIT_{tier}_PER_HOUR": str(10**9)
+        for tier in ("ANONYMOUS", "AUTHENTICATED", "LEADER")
+    },
+}
+
+for name, value in DEFAULTS.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,138 @@
+"""
+Benchmark for leaderboard reads.
+
+On a synthetic polity, compares answering a territory's top-K GeDers by
+endorsements plus a user's own rank the old way (GROUP BY over approved
+endorsements in the territory's subtree, ORDER BY the count, a window rank
+for the user) against the precomputed boards (two sorted-set lookups). Also
+times the full rebuild and checks the boards' top-K scores match the
+aggregate. Run from the backend directory:
+
+    python -m benchmarks.leaderboard --users 20000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks import environment  # noqa: F401
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks import sqlite_compat  # noqa: F401
+from benchmarks.polity import PolityScale, generate_polity
+from app.models import Endorsement, User
+from app.services.leaderboard import leaderboards, user_board
+from app.services.territories import subtree_ids_select, territory_snapshot
+from app.utils.enums import EndorsementStatus, LeaderboardMetric
+
+
+def _aggregate(territory_path: str):
+    return (
+        select(
+            Endorsement.geder_id.label("member"),
+            func.count().label("score"),
+        )
+        .join(User, User.id == Endorsement.geder_id)
+        .where(
+            Endorsement.status == EndorsementStatus.APPROVED,
+            User.territory_id.in_(subtree_ids_select(territory_path)),
+        )
+        .group_by(Endorsement.geder_id)
+    )
+
+
+async def _aggregate_read(db, territory_path: str, user_id, limit: int):
+    counts = _aggregate(territory_path).subquery()
+    top = (await db.execute(
+        select(counts.c.member, counts.c.score)
+        .order_by(counts.c.score.desc(), counts.c.member.desc())
+        .limit(limit)
+    )).all()
+    ranked = select(
+        counts.c.member,
+        func.rank().over(order_by=counts.c.score.desc()).label("rank"),
+    ).subquery()
+    own = (await db.execute(select(ranked.c.rank).where(ranked.c.member == user_id))).scalar()
+    return top, own
+
+
+async def _board_read(key: str, user_id, limit: int):
+    top = await leaderboards.top(key, 0, limit)
+    own = await leaderboards.standing(key, user_id, 2)
+    return top, own
+
+
+async def main(args: argparse.Namespace) -> dict:
+    engine = create_async_engine(args.database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        scale = PolityScale(
+            regions=args.regions,
+            districts_per_region=args.districts_per_region,
+            users=args.users,
+            elections=0,
+            sos_signals=0,
+            initiatives=args.initiatives,
+            notifications_per_user=0,
+        )
+        polity = await generate_polity(engine, session_factory, scale, seed=args.seed)
+
+        started = time.perf_counter()
+        boards = await leaderboards.rebuild(session_factory)
+        rebuild_seconds = time.perf_counter() - started
+
+        rng = random.Random(args.seed)
+        territory_ids = polity.region_ids + polity.district_ids
+        samples = [(rng.choice(territory_ids), rng.choice(polity.user_ids)) for _ in range(args.rounds)]
+
+        aggregate_ms, board_ms, mismatches = [], [], 0
+        async with session_factory() as db:
+            snapshot = await territory_snapshot.get(db)
+            for territory_id, user_id in samples:
+                path = snapshot.get(territory_id).path
+
+                started = time.perf_counter()
+                top, _ = await _aggregate_read(db, path, user_id, args.limit)
+                aggregate_ms.append((time.perf_counter() - started) * 1000)
+
+                key = user_board(LeaderboardMetric.ENDORSEMENTS, territory_id)
+                started = time.perf_counter()
+                entries, _ = await _board_read(key, user_id, args.limit)
+                board_ms.append((time.perf_counter() - started) * 1000)
+
+                if [score for _, score in top] != [e["score"] for e in entries]:
+                    mismatches += 1
+
+        aggregate = sum(aggregate_ms) / len(aggregate_ms)
+        board = sum(board_ms) / len(board_ms)
+        return {
+            "users": args.users,
+            "territories": len(territory_ids),
+            "boards": boards,
+            "rebuild_seconds": round(rebuild_seconds, 3),
+            "rounds": args.rounds,
+            "limit": args.limit,
+            "aggregate_ms": round(aggregate, 3),
+            "board_ms": round(board, 4),
+            "speedup": round(aggregate / board, 1),
+            "top_k_mismatches": mismatches,
+        }
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///leaderboard.db")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--regions", type=int, default=5)
+    parser.add_argument("--districts-per-region", type=int, default=4)
+    parser.add_argument("--initiatives", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args)), indent=2))
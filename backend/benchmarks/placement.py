@@ -0,0 +1,113 @@
+"""
+Benchmark for the Ateuli placement engine.
+
+Seeds a scratch database with GeDers queued for placement, spread over
+territories, times place_unassigned_users() and checks the result: everyone
+placed, no Ateuli over 10 members, counters matching the rows. Run from the backend directory
+against a database that may be wiped:
+
+    python -m benchmarks.placement --database-url postgresql+asyncpg://.../scratch --users 1000000
+
+SQLite works as a stand-in (`sqlite+aiosqlite:///placement.db`).
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from benchmarks import sqlite_compat  # noqa: F401
+from app.models import Base, Territory, User, Ateuli, Ormotsdaateuli, Aseuli, Ataseuli
+from app.services import placement
+from app.services.group_counters import find_drift
+from app.utils.enums import TerritoryType, UserRole
+
+SEED_BATCH = 10_000
+
+
+async def _seed(session_factory, users: int, territories: int) -> None:
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        territory_ids = []
+        for i in range(territories):
+            territory = Territory(name=f"District {i}", type=TerritoryType.ELECTORAL_DISTRICT)
+            db.add(territory)
+            await db.flush()
+            territory_ids.append(territory.id)
+        await db.commit()
+
+        for start in range(0, users, SEED_BATCH):
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "phone_number": f"+9955{n:08d}",
+                    "personal_id_hash": f"bench-{n}",
+                    "role": UserRole.GEDER,
+                    "placement_requested_at": now,
+                    "territory_id": territory_ids[n % territories],
+                }
+                for n in range(start, min(start + SEED_BATCH, users))
+            ]
+            await db.execute(insert(User.__table__), rows)
+            await db.commit()
+
+
+async def _check(session_factory) -> dict:
+    async with session_factory() as db:
+        unplaced = await db.scalar(
+            select(func.count()).where(User.placement_requested_at.is_not(None))
+        )
+        overfull = await db.scalar(select(func.count()).where(Ateuli.member_count > 10))
+        groups = {
+            model.__tablename__: await db.scalar(select(func.count()).select_from(model))
+            for model in (Ateuli, Ormotsdaateuli, Aseuli, Ataseuli)
+        }
+        drift = await find_drift(db)
+    return {"unplaced": unplaced, "overfull_ateulis": overfull, "drifted_groups": len(drift), "groups": groups}
+
+
+async def main(database_url: str, users: int, territories: int, chunk_size: int) -> dict:
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    await _seed(session_factory, users, territories)
+    seed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    placed = await placement.place_unassigned_users(session_factory, chunk_size)
+    place_seconds = time.perf_counter() - started
+
+    results = {
+        "database": engine.dialect.name,
+        "users": users,
+        "territories": territories,
+        "chunk_size": chunk_size,
+        "seed_seconds": round(seed_seconds, 2),
+        "placed": placed,
+        "place_seconds": round(place_seconds, 2),
+        "users_per_second": round(placed / place_seconds) if place_seconds else None,
+        **await _check(session_factory),
+    }
+    await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--territories", type=int, default=73)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(
+        asyncio.run(main(args.database_url, args.users, args.territories, args.chunk_size)),
+        indent=2,
+    ))
@@ -0,0 +1,357 @@
+"""
+Synthetic polity for the benchmarks: territories, users with endorsements,
+the four-level group hierarchy, elections with votes, SOS signals,
+initiatives with their supporters and notifications, at a configurable
+scale.
+
+Groups are formed by the real placement engine, which places the GeDers;
+everything else is bulk inserted. Generation wipes the target database.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, text
+
+from app.config import settings
+from app.core.security import hash_phone_number
+from app.models import (
+    Ateuli,
+    Base,
+    Election,
+    ElectionCandidate,
+    Endorsement,
+    GeDerCapacity,
+    Initiative,
+    InitiativeSupport,
+    Notification,
+    SOSSignal,
+    Territory,
+    User,
+    Vote,
+)
+from app.services import placement
+from app.utils.enums import (
+    ElectionScopeType,
+    ElectionStatus,
+    ElectionType,
+    EndorsementStatus,
+    InitiativeCategory,
+    InitiativeStatus,
+    TerritoryType,
+    UserRole,
+    UserStatus,
+)
+from app.utils.transliteration import normalize_search_text
+
+BATCH = 5000
+GEDER_EVERY = 7
+CANDIDATES_PER_ELECTION = 3
+VOTERS_PER_ELECTION = 6
+
+FIRST_NAMES = (
+    "გიორგი", "ნინო", "დავით", "მარიამ", "ლევან", "ანა", "ირაკლი", "თამარ",
+    "Giorgi", "Nino", "Davit", "Mariam", "Levan", "Ana", "Irakli", "Tamar",
+)
+LAST_NAMES = (
+    "ბერიძე", "კაპანაძე", "გელაშვილი", "მაისურაძე", "ლომიძე", "ჯაფარიძე",
+    "Beridze", "Kapanadze", "Gelashvili", "Maisuradze", "Lomidze", "Japaridze",
+)
+
+
+@dataclass
+class PolityScale:
+    regions: int = 5
+    districts_per_region: int = 4
+    users: int = 10_000
+    elections: int = 100
+    sos_signals: int = 500
+    initiatives: int = 500
+    notifications_per_user: int = 30
+    sample_users: int = 200
+
+
+@dataclass
+class Polity:
+    """
+    Ids the benchmark scenarios draw their requests from.
+    """
+
+    scale: PolityScale
+    region_ids: list[uuid.UUID] = field(default_factory=list)
+    district_ids: list[uuid.UUID] = field(default_factory=list)
+    user_ids: list[uuid.UUID] = field(default_factory=list)
+    election_ids: list[uuid.UUID] = field(default_factory=list)
+    # (election id, candidate id, voter id) for votes not cast yet
+    open_ballots: list[tuple[uuid.UUID, uuid.UUID, uuid.UUID]] = field(default_factory=list)
+    search_terms: list[str] = field(default_factory=list)
+
+
+def _batches(rows: list, size: int = BATCH):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def reset_schema(engine) -> None:
+    """
+    Drop and recreate every table, with what the migrations add on Postgres.
+    """
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # drop_all cannot order the cycle between users and the groups
+            # they lead, whose foreign keys are unnamed.
+            await conn.execute(text("DROP SCHEMA public CASCADE"))
+            await conn.execute(text("CREATE SCHEMA public"))
+            # What the migrations would add on top of the models.
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        else:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS notifications_default "
+                "PARTITION OF notifications DEFAULT"
+            ))
+
+
+async def _territories(db, polity: Polity) -> None:
+    scale = polity.scale
+    for r in range(scale.regions):
+        region = Territory(name=f"რეგიონი {r}", name_en=f"Region {r}", type=TerritoryType.REGION)
+        db.add(region)
+        await db.flush()
+        polity.region_ids.append(region.id)
+        for d in range(scale.districts_per_region):
+            district = Territory(
+                name=f"ოლქი {r}-{d}",
+                name_en=f"District {r}-{d}",
+                type=TerritoryType.ELECTORAL_DISTRICT,
+                parent_id=region.id,
+            )
+            db.add(district)
+            await db.flush()
+            polity.district_ids.append(district.id)
+    await db.commit()
+
+
+async def _users(db, polity: Polity, rng: random.Random) -> None:
+    """
+    Users spread over the districts; every GEDER_EVERY-th is a GeDer and
+    the rest are supporters endorsed by a GeDer of their district.
+    """
+    now = datetime.now(timezone.utc)
+    users, endorsements = [], []
+    geders: dict[uuid.UUID, list[list]] = {d: [] for d in polity.district_ids}
+
+    for n in range(polity.scale.users):
+        district = polity.district_ids[n % len(polity.district_ids)]
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        phone = f"+9955{n:08d}"
+        row = {
+            "id": uuid.uuid4(),
+            "phone_number": phone,
+            "phone_hash": hash_phone_number(phone),
+            "personal_id_hash": f"polity-{n}",
+            "full_name": name,
+            "search_name": normalize_search_text(name),
+            "status": UserStatus.ACTIVE,
+            "territory_id": district,
+            "phone_verified_at": now,
+            # Every row carries the same keys: executemany takes its columns
+            # from the first one
+            "tavdebi_id": None,
+            "placement_requested_at": None,
+        }
+        # [geder id, approved count]
+        open_geders = [g for g in geders[district] if g[1] < settings.ENDORSEMENT_LIMIT_PER_GEDER]
+        if n % GEDER_EVERY == 0 or not open_geders:
+            row["role"] = UserRole.GEDER
+            row["placement_requested_at"] = now
+            geders[district].append([row["id"], 0])
+        else:
+            geder = open_geders[0]
+            geder[1] += 1
+            row["role"] = UserRole.SUPPORTER
+            row["tavdebi_id"] = geder[0]
+            endorsements.append({
+                "id": uuid.uuid4(),
+                "geder_id": geder[0],
+                "supporter_id": row["id"],
+                "status": EndorsementStatus.APPROVED,
+                "requested_at": now,
+                "approved_at": now,
+                "penalty_applied": False,
+            })
+        users.append(row)
+
+    for batch in _batches(users):
+        await db.execute(insert(User.__table__), batch)
+    for batch in _batches(endorsements):
+        await db.execute(insert(Endorsement.__table__), batch)
+    capacities = [
+        {
+            "id": uuid.uuid4(),
+            "geder_id": geder_id,
+            "territory_id": district,
+            "approved_count": approved,
+            "pending_count": 0,
+            "remaining": settings.ENDORSEMENT_LIMIT_PER_GEDER - approved,
+            "penalized": False,
+            "sample_key": rng.random(),
+        }
+        for district, rows in geders.items()
+        for geder_id, approved in rows
+    ]
+    for batch in _batches(capacities):
+        await db.execute(insert(GeDerCapacity.__table__), batch)
+    await db.commit()
+
+    polity.user_ids = [row["id"] for row in rng.sample(users, min(polity.scale.sample_users, len(users)))]
+    polity.search_terms = sorted({row["full_name"].split()[1] for row in users})
+    polity.search_terms += [term[:2] for term in polity.search_terms[:4]]
+
+
+async def _elections(db, polity: Polity, rng: random.Random) -> None:
+    """
+    Atistavi elections in full Ateulis, each with a few votes already cast
+    and the remaining members' ballots left open for the vote scenario.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(Ateuli.id).where(Ateuli.member_count == 10).limit(polity.scale.elections)
+    )
+    ateuli_ids = list(result.scalars())
+    members: dict[uuid.UUID, list[uuid.UUID]] = {a: [] for a in ateuli_ids}
+    for batch in _batches(ateuli_ids, 1000):
+        result = await db.execute(select(User.ateuli_id, User.id).where(User.ateuli_id.in_(batch)))
+        for ateuli_id, user_id in result:
+            members[ateuli_id].append(user_id)
+
+    elections, candidates, votes = [], [], []
+    for i, ateuli_id in enumerate(ateuli_ids):
+        active = i % 2 == 0
+        election_id = uuid.uuid4()
+        elections.append({
+            "id": election_id,
+            "election_type": ElectionType.ATISTAVI,
+            "scope_type": ElectionScopeType.ATEULI,
+            "scope_id": ateuli_id,
+            "title": f"Atistavi election {i}",
+            "starts_at": now - timedelta(days=1 if active else 10),
+            "ends_at": now + timedelta(days=7) if active else now - timedelta(days=3),
+            "status": ElectionStatus.ACTIVE if active else ElectionStatus.COMPLETED,
+            "total_votes": VOTERS_PER_ELECTION,
+        })
+        voters = members[ateuli_id]
+        rng.shuffle(voters)
+        election_candidates = []
+        for user_id in voters[:CANDIDATES_PER_ELECTION]:
+            election_candidates.append({
+                "id": uuid.uuid4(),
+                "election_id": election_id,
+                "user_id": user_id,
+                "vote_count": 0,
+                "registered_at": now - timedelta(days=2),
+            })
+        for voter_id in voters[:VOTERS_PER_ELECTION]:
+            candidate = rng.choice(election_candidates)
+            candidate["vote_count"] += 1
+            votes.append({
+                "id": uuid.uuid4(),
+                "election_id": election_id,
+                "voter_id": voter_id,
+                "candidate_id": candidate["id"],
+                "vote_hash": uuid.uuid4().hex,
+                "cast_at": now,
+                "tallied": True,
+            })
+        candidates.extend(election_candidates)
+        if active:
+            polity.open_ballots.extend(
+                (election_id, rng.choice(election_candidates)["id"], voter_id)
+                for voter_id in voters[VOTERS_PER_ELECTION:]
+            )
+        polity.election_ids.append(election_id)
+
+    for table, rows in ((Election, elections), (ElectionCandidate, candidates), (Vote, votes)):
+        for batch in _batches(rows):
+            await db.execute(insert(table.__table__), batch)
+    await db.commit()
+    rng.shuffle(polity.open_ballots)
+
+
+async def _activity(db, polity: Polity, rng: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    scale = polity.scale
+    signals = [
+        {
+            "id": uuid.uuid4(),
+            "reporter_id": rng.choice(polity.user_ids),
+            "title": f"Signal {i}",
+            "description": "Synthetic SOS signal",
+            "moral_filter_response": "yes",
+            "created_at": now - timedelta(minutes=i),
+        }
+        for i in range(scale.sos_signals)
+    ]
+    initiatives, supports = [], []
+    for i in range(scale.initiatives):
+        initiative = {
+            "id": uuid.uuid4(),
+            "creator_id": rng.choice(polity.user_ids),
+            "title": f"Initiative {i}",
+            "description": "Synthetic initiative",
+            "category": rng.choice(list(InitiativeCategory)),
+            "scope_type": ElectionScopeType.NATIONAL,
+            "target_support": 100,
+            "current_support": rng.randrange(min(100, len(polity.user_ids))),
+            "status": InitiativeStatus.ACTIVE,
+            "created_at": now - timedelta(minutes=i),
+        }
+        initiatives.append(initiative)
+        supports.extend(
+            {
+                "id": uuid.uuid4(),
+                "initiative_id": initiative["id"],
+                "supporter_id": supporter_id,
+                "supported_at": now - timedelta(minutes=i),
+            }
+            for supporter_id in rng.sample(polity.user_ids, initiative["current_support"])
+        )
+    notifications = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "type": "synthetic",
+            "title": f"Notification {i}",
+            "message": "Synthetic notification",
+            "created_at": now - timedelta(minutes=i),
+            "read_at": now if i % 3 else None,
+        }
+        for user_id in polity.user_ids
+        for i in range(scale.notifications_per_user)
+    ]
+    for table, rows in (
+        (SOSSignal, signals),
+        (Initiative, initiatives),
+        (InitiativeSupport, supports),
+        (Notification, notifications),
+    ):
+        for batch in _batches(rows):
+            await db.execute(insert(table.__table__), batch)
+    await db.commit()
+
+
+async def generate_polity(engine, session_factory, scale: PolityScale, seed: int = 0) -> Polity:
+    rng = random.Random(seed)
+    polity = Polity(scale=scale)
+    await reset_schema(engine)
+    async with session_factory() as db:
+        await _territories(db, polity)
+        await _users(db, polity, rng)
+    await placement.place_unassigned_users(session_factory)
+    async with session_factory() as db:
+        await _elections(db, polity, rng)
+        await _activity(db, polity, rng)
+    return polity
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark for the rate limiter.
+
+Measures the per-request cost of RateLimitMiddleware with the in-memory store,
+for anonymous, authenticated and leader requests, against the same ASGI app
+without the middleware. Run from the backend directory:
+
+    RATE_LIMIT_BACKEND=memory python -m benchmarks.rate_limit
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from benchmarks import environment  # noqa: F401
+
+from app.core import security
+from app.core.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitMiddleware,
+)
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def _scope(token=None, client="10.0.0.1"):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "path": "/api/v1/elections/", "headers": headers, "client": (client, 1234)}
+
+
+async def _time_calls(app, scopes, rounds):
+    samples = []
+    for i in range(rounds):
+        scope = scopes[i % len(scopes)]
+        started = time.perf_counter()
+        await app(scope, _receive, _send)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    }
+
+
+async def _time_store(store, rounds):
+    rate = RateLimit(10**9, 3600)
+    started = time.perf_counter()
+    for i in range(rounds):
+        await store.hit(f"user:{i % 10000}", rate)
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+async def main(rounds: int, clients: int) -> dict:
+    middleware = RateLimitMiddleware(_app, limiter=RateLimiter(InMemoryRateLimitStore()))
+
+    anonymous = [_scope(client=f"10.0.{i // 256}.{i % 256}") for i in range(clients)]
+    authenticated = [_scope(token=security.create_access_token(uuid.uuid4())) for _ in range(clients)]
+    leaders = [
+        _scope(token=security.create_access_token(uuid.uuid4(), is_leader=True)) for _ in range(clients)
+    ]
+
+    baseline = await _time_calls(_app, anonymous, rounds)
+    results = {
+        "rounds": rounds,
+        "clients": clients,
+        "store_hit_us": await _time_store(InMemoryRateLimitStore(), rounds),
+        "baseline": baseline,
+        "anonymous": await _time_calls(middleware, anonymous, rounds),
+        "authenticated": await _time_calls(middleware, authenticated, rounds),
+        "leader": await _time_calls(middleware, leaders, rounds),
+    }
+    for tier in ("anonymous", "authenticated", "leader"):
+        results[tier]["overhead_us"] = results[tier]["mean_us"] - baseline["mean_us"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.rounds, args.clients)), indent=2))
@@ -0,0 +1,131 @@
+"""
+Benchmark for response serialization.
+
+Compares the old path of list endpoints (load ORM entities, turn each into a
+dict of all its columns, jsonable_encoder, JSONResponse) with the current one
+(select the response schema's columns, map rows to dicts, FastJSONResponse),
+for elections at several page sizes. `fetch` times the query plus encoding,
+`encode` only the encoding of rows already fetched. Run from the backend
+directory:
+
+    python -m benchmarks.serialization --rows 500
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import environment  # noqa: F401
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks import sqlite_compat  # noqa: F401
+from app.core.serialization import FastJSONResponse, columns, row_dicts
+from app.models import Base, Election
+from app.schemas import ElectionOut
+from app.utils.enums import ElectionScopeType, ElectionStatus, ElectionType
+
+
+def _entity_dict(obj) -> dict:
+    # What Base.dict() did for every row
+    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+
+
+def _encode_entities(entities) -> bytes:
+    return JSONResponse(jsonable_encoder([_entity_dict(e) for e in entities])).body
+
+
+def _encode_rows(rows) -> bytes:
+    return FastJSONResponse(row_dicts(rows)).body
+
+
+async def _seed(session_factory, rows: int) -> None:
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        await db.execute(insert(Election), [
+            {
+                "id": uuid.uuid4(),
+                "election_type": ElectionType.ATISTAVI,
+                "scope_type": ElectionScopeType.ATEULI,
+                "scope_id": uuid.uuid4(),
+                "title": f"Atistavi election {i}",
+                "description": "Synthetic election " * 4,
+                "starts_at": now - timedelta(days=1),
+                "ends_at": now + timedelta(days=7),
+                "status": ElectionStatus.ACTIVE,
+                "total_votes": i,
+            }
+            for i in range(rows)
+        ])
+        await db.commit()
+
+
+def _time(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+async def _atime(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+async def main(args: argparse.Namespace) -> dict:
+    engine = create_async_engine(args.database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await _seed(session_factory, args.rows)
+
+        results = {"rows": args.rows, "rounds": args.rounds, "page_sizes": {}}
+        async with session_factory() as db:
+            for size in args.page_sizes:
+                entity_query = select(Election).limit(size)
+                row_query = select(*columns(ElectionOut, Election)).limit(size)
+
+                async def fetch_entities():
+                    db.expunge_all()
+                    _encode_entities((await db.execute(entity_query)).scalars().all())
+
+                async def fetch_rows():
+                    _encode_rows((await db.execute(row_query)).all())
+
+                entities = (await db.execute(entity_query)).scalars().all()
+                rows = (await db.execute(row_query)).all()
+                old = {
+                    "fetch_ms": await _atime(fetch_entities, args.rounds),
+                    "encode_ms": _time(lambda: _encode_entities(entities), args.rounds),
+                }
+                new = {
+                    "fetch_ms": await _atime(fetch_rows, args.rounds),
+                    "encode_ms": _time(lambda: _encode_rows(rows), args.rounds),
+                }
+                results["page_sizes"][size] = {
+                    "orm_dict_jsonable": {k: round(v, 3) for k, v in old.items()},
+                    "rows_orjson": {k: round(v, 3) for k, v in new.items()},
+                    "speedup": {k: round(old[k] / new[k], 1) for k in old},
+                }
+    finally:
+        await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///serialization.db")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--page-sizes", type=int, nargs="*", default=[20, 100, 500])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args)), indent=2))
@@ -0,0 +1,18 @@
+"""
+Lets the benchmarks run on SQLite as a stand-in for Postgres: the models use
+the Postgres UUID and INET types, which SQLite has no DDL for.
+
+Importing this module registers the DDL; it changes nothing on Postgres.
+"""
+from sqlalchemy.dialects.postgresql import INET, UUID
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(UUID, "sqlite")
+def _uuid(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(INET, "sqlite")
+def _inet(type_, compiler, **kw):
+    return "VARCHAR(45)"
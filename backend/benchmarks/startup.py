@@ -0,0 +1,171 @@
+"""
+Startup benchmark: time to first request of a fresh worker.
+
+Generates a synthetic polity once (see benchmarks.polity), then boots the
+real app.main in fresh interpreters and times importing it, the lifespan
+startup, and the first and second call of a few endpoints. Each trial runs
+"warm" (the lifespan warm-up phases, as a deployed worker does) and "cold"
+(background jobs only, so mapper configuration, connecting and the
+territory snapshot land on the first request). Run from the backend
+directory:
+
+    python -m benchmarks.startup --trials 5
+
+Background jobs are disabled in the workers so they do not compete with
+the measured requests.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import environment
+
+_JOBS = (
+    "GROUP_COUNTER_RECONCILE_SECONDS",
+    "ELECTION_TALLY_FOLD_SECONDS",
+    "ELECTION_RESULTS_REFRESH_SECONDS",
+    "NOTIFICATION_PARTITION_CHECK_SECONDS",
+    "ATEULI_PLACEMENT_SECONDS",
+    "SOS_ESCALATION_RESYNC_SECONDS",
+    "LEADERBOARD_REBUILD_SECONDS",
+    "TOKEN_REVOCATION_RESYNC_SECONDS",
+    "REFRESH_TOKEN_PURGE_SECONDS",
+)
+
+
+def _environment(database_url: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update({job: "0" for job in _JOBS})
+    for name, value in environment.DEFAULTS.items():
+        env.setdefault(name, value)
+    env["DATABASE_URL"] = database_url
+    return env
+
+
+async def _worker(mode: str, user_id: str, territory_id: str) -> dict:
+    """
+    One fresh worker: import, start up, then serve each request twice.
+    """
+    started = time.perf_counter()
+    from benchmarks import sqlite_compat  # noqa: F401
+    from app import main
+    imported = time.perf_counter()
+
+    import httpx
+    from app.core import security
+
+    headers = {"Authorization": f"Bearer {security.create_access_token(user_id)}"}
+    requests = [
+        ("GET /users/me", "/api/v1/users/me", headers),
+        ("GET /territories/{id}", f"/api/v1/territories/{territory_id}", {}),
+    ]
+
+    if mode == "warm":
+        lifespan = main.app.router.lifespan_context(main.app)
+        await lifespan.__aenter__()
+    else:
+        await main.start_background_jobs()
+    ready = time.perf_counter()
+
+    timings = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, path, request_headers in requests:
+            calls = []
+            for _ in range(2):
+                call_started = time.perf_counter()
+                response = await client.get(path, headers=request_headers)
+                calls.append(time.perf_counter() - call_started)
+                response.raise_for_status()
+            timings[name] = {"first_ms": calls[0] * 1000, "second_ms": calls[1] * 1000}
+
+    if mode == "warm":
+        await lifespan.__aexit__(None, None, None)
+    else:
+        await main.stop_background_jobs()
+    await main.engine.dispose()
+    return {
+        "import_s": imported - started,
+        "startup_s": ready - imported,
+        "requests": timings,
+        "boot": main.boot.stats()["phases"] if mode == "warm" else {},
+        # From the first import until the first response is out
+        "time_to_first_request_s": ready - started + timings[requests[0][0]]["first_ms"] / 1000,
+    }
+
+
+def _median(values: list[float]) -> float:
+    return round(statistics.median(values), 4)
+
+
+def _summary(runs: list[dict]) -> dict:
+    summary = {
+        key: _median([run[key] for run in runs])
+        for key in ("import_s", "startup_s", "time_to_first_request_s")
+    }
+    summary["requests"] = {
+        name: {
+            field: _median([run["requests"][name][field] for run in runs])
+            for field in ("first_ms", "second_ms")
+        }
+        for name in runs[0]["requests"]
+    }
+    if runs[0]["boot"]:
+        summary["boot_phases_s"] = {
+            phase: _median([run["boot"][phase] for run in runs]) for phase in runs[0]["boot"]
+        }
+    return summary
+
+
+async def _generate(args: argparse.Namespace) -> tuple[str, str]:
+    os.environ.update(_environment(args.database_url))
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from benchmarks import sqlite_compat  # noqa: F401
+    from benchmarks.polity import PolityScale, generate_polity
+
+    engine = create_async_engine(args.database_url)
+    try:
+        scale = PolityScale(users=args.users, elections=0, sos_signals=0, initiatives=0,
+                            notifications_per_user=0)
+        polity = await generate_polity(engine, async_sessionmaker(engine), scale, seed=0)
+    finally:
+        await engine.dispose()
+    return str(polity.user_ids[0]), str(polity.district_ids[0])
+
+
+def main(args: argparse.Namespace) -> dict:
+    user_id, territory_id = asyncio.run(_generate(args))
+    env = _environment(args.database_url)
+    results = {}
+    for mode in ("cold", "warm"):
+        runs = []
+        for _ in range(args.trials):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--worker", mode,
+                 "--user-id", user_id, "--territory-id", territory_id],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        results[mode] = _summary(runs)
+    return {"trials": args.trials, "users": args.users, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///startup.db")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--worker", choices=("cold", "warm"), help=argparse.SUPPRESS)
+    parser.add_argument("--user-id", help=argparse.SUPPRESS)
+    parser.add_argument("--territory-id", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(asyncio.run(_worker(args.worker, args.user_id, args.territory_id))))
+    else:
+        print(json.dumps(main(args), indent=2))
@@ -0,0 +1,41 @@
+# First: keeps the tests off Redis, as the benchmarks run
+from benchmarks import environment  # noqa: F401
+
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks import sqlite_compat  # noqa: F401
+from benchmarks.polity import reset_schema
+from app.models import Base
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """
+    A fresh SQLite database per test, standing in for Postgres the way the
+    benchmarks do.
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", connect_args={"timeout": 60}
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def pg_session_factory():
+    """
+    The Postgres database at TEST_DATABASE_URL, for tests that depend on its
+    row locking. The database is wiped. Skipped when the variable is unset.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(url)
+    await reset_schema(engine)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
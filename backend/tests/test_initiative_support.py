@@ -0,0 +1,104 @@
+"""
+Scaled-down benchmarks.initiative_support: every supporter supports the same
+initiative several times at once, and the counter, the support rows and the
+threshold transition must all agree afterwards.
+
+On SQLite, which runs one writer at a time, this only checks the logic. The
+row locking it relies on, between INSERT ... ON CONFLICT DO NOTHING and the
+counter's UPDATE ... RETURNING, is only exercised by the Postgres variant,
+which runs when TEST_DATABASE_URL points at a scratch database.
+"""
+import asyncio
+import random
+import uuid
+
+from sqlalchemy import func, insert, select
+
+from app.models import Initiative, InitiativeSupport, User
+from app.services import initiative_support
+from app.utils.enums import ElectionScopeType, InitiativeCategory, InitiativeStatus, UserStatus
+
+SUPPORTERS = 40
+REPEATS = 3
+TARGET = SUPPORTERS // 2
+CONCURRENCY = 10
+
+
+async def _seed(session_factory) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    user_ids = [uuid.uuid4() for _ in range(SUPPORTERS + 1)]
+    async with session_factory() as db:
+        await db.execute(insert(User), [
+            {
+                "id": user_id,
+                "phone_number": f"+9957{n:08d}",
+                "personal_id_hash": f"test-{n}",
+                "status": UserStatus.ACTIVE,
+            }
+            for n, user_id in enumerate(user_ids)
+        ])
+        initiative_id = uuid.uuid4()
+        await db.execute(insert(Initiative).values(
+            id=initiative_id,
+            creator_id=user_ids[0],
+            title="Test initiative",
+            description="Synthetic initiative",
+            category=InitiativeCategory.OTHER,
+            scope_type=ElectionScopeType.NATIONAL,
+            target_support=TARGET,
+            current_support=0,
+            status=InitiativeStatus.ACTIVE,
+        ))
+        await db.commit()
+    return initiative_id, user_ids[1:]
+
+
+async def _support_concurrently(session_factory) -> None:
+    initiative_id, supporter_ids = await _seed(session_factory)
+    attempts = [s for s in supporter_ids for _ in range(REPEATS)]
+    random.Random(0).shuffle(attempts)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    outcomes = {"accepted": 0, "already_supported": 0, "closed": 0}
+    thresholds: list[int] = []
+
+    async def attempt(supporter_id: uuid.UUID) -> None:
+        async with semaphore, session_factory() as db:
+            try:
+                result = await initiative_support.support_initiative(db, initiative_id, supporter_id)
+            except initiative_support.AlreadySupportedError:
+                outcomes["already_supported"] += 1
+                await db.rollback()
+            except initiative_support.InitiativeClosedError:
+                outcomes["closed"] += 1
+                await db.rollback()
+            else:
+                await db.commit()
+                outcomes["accepted"] += 1
+                if result.threshold_reached:
+                    thresholds.append(result.current_support)
+
+    await asyncio.gather(*(attempt(s) for s in attempts))
+
+    async with session_factory() as db:
+        initiative = await db.get(Initiative, initiative_id)
+        rows, distinct = (await db.execute(
+            select(func.count(), func.count(InitiativeSupport.supporter_id.distinct()))
+            .where(InitiativeSupport.initiative_id == initiative_id)
+        )).one()
+
+    assert initiative.current_support == rows
+    assert rows == distinct == len(supporter_ids)
+    assert outcomes == {
+        "accepted": len(supporter_ids),
+        "already_supported": len(attempts) - len(supporter_ids),
+        "closed": 0,
+    }
+    assert thresholds == [TARGET]
+    assert initiative.status == InitiativeStatus.ACHIEVED
+
+
+async def test_concurrent_support_is_counted_exactly_once(session_factory):
+    await _support_concurrently(session_factory)
+
+
+async def test_concurrent_support_is_counted_exactly_once_on_postgres(pg_session_factory):
+    await _support_concurrently(pg_session_factory)
@@ -0,0 +1,98 @@
+"""
+Scaled-down benchmarks.placement: queued GeDers are packed into Ateulis of
+their territory, parents are made as needed and every counter agrees with
+the rows afterwards.
+"""
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, select
+
+from app.models import Ateuli, Aseuli, Ataseuli, Ormotsdaateuli, Territory, User
+from app.services import group_counters, placement
+from app.utils.enums import GroupStatus, TerritoryType, UserRole
+
+QUEUED = 23
+# Chunks smaller than a territory, so a pass resumes within one
+CHUNK_SIZE = 5
+
+
+async def _seed(session_factory) -> list[uuid.UUID]:
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        territory_ids = []
+        for i in range(2):
+            territory = Territory(name=f"District {i}", type=TerritoryType.ELECTORAL_DISTRICT)
+            db.add(territory)
+            await db.flush()
+            territory_ids.append(territory.id)
+
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "phone_number": f"+9956{n:08d}",
+                "personal_id_hash": f"placement-{n}",
+                "role": UserRole.GEDER,
+                "territory_id": territory_ids[n % 2],
+                "placement_requested_at": now,
+            }
+            for n in range(QUEUED)
+        ]
+        # Never placed: not queued, or not allowed to join
+        rows.append({
+            "id": uuid.uuid4(), "phone_number": "+995600000100", "personal_id_hash": "placement-idle",
+            "role": UserRole.GEDER, "territory_id": territory_ids[0], "placement_requested_at": None,
+        })
+        rows.append({
+            "id": uuid.uuid4(), "phone_number": "+995600000101", "personal_id_hash": "placement-supporter",
+            "role": UserRole.SUPPORTER, "territory_id": territory_ids[0], "placement_requested_at": now,
+        })
+        await db.execute(insert(User), rows)
+        await db.commit()
+    return territory_ids
+
+
+async def test_queued_geders_are_packed_into_ateulis(session_factory):
+    territory_ids = await _seed(session_factory)
+
+    assert await placement.place_unassigned_users(session_factory, CHUNK_SIZE) == QUEUED
+
+    async with session_factory() as db:
+        for territory_id, members in zip(territory_ids, (12, 11)):
+            result = await db.execute(
+                select(Ateuli.member_count, Ateuli.status)
+                .where(Ateuli.territory_id == territory_id)
+                .order_by(Ateuli.member_count.desc())
+            )
+            assert result.all() == [(10, GroupStatus.ACTIVE), (members - 10, GroupStatus.FORMING)]
+            for model, children in ((Ormotsdaateuli, 2), (Aseuli, 1), (Ataseuli, 1)):
+                result = await db.execute(
+                    select(model.member_count, getattr(model, group_counters.CHILD_COUNT[model]))
+                    .where(model.territory_id == territory_id)
+                )
+                assert result.all() == [(members, children)]
+        assert await group_counters.find_drift(db) == []
+        assert await db.scalar(
+            select(func.count()).where(User.placement_requested_at.is_not(None))
+        ) == 1  # the supporter
+        assert await db.scalar(select(func.count()).where(User.ateuli_id.is_not(None))) == QUEUED
+
+    assert await placement.place_unassigned_users(session_factory, CHUNK_SIZE) == 0
+
+
+async def test_members_who_left_are_not_placed_again(session_factory):
+    await _seed(session_factory)
+    await placement.place_unassigned_users(session_factory, CHUNK_SIZE)
+
+    async with session_factory() as db:
+        user = await db.scalar(select(User).where(User.ateuli_id.is_not(None)).limit(1))
+        # What POST /ateulis/{id}/leave does
+        await group_counters.apply_member_delta(db, user.ateuli_id, -1)
+        user.ateuli_id = None
+        await db.commit()
+        user_id = user.id
+
+    assert await placement.place_unassigned_users(session_factory, CHUNK_SIZE) == 0
+    async with session_factory() as db:
+        assert await db.scalar(select(User.ateuli_id).where(User.id == user_id)) is None
+        assert await group_counters.find_drift(db) == []
@@ -0,0 +1,130 @@
+"""
+Refresh token rotation and reuse detection, logout of one session or all,
+and the revocation index that turns a revoked family away on every request.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+
+from app import dependencies
+from app.core.principal import Principal, cache_principal
+from app.core.pubsub import InMemoryPubSub
+from app.core.revocation import RevocationIndex
+from app.models import RefreshToken, User
+from app.services import refresh_tokens
+from app.utils.enums import UserRole, UserStatus
+
+
+async def _user(session_factory) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    async with session_factory() as db:
+        await db.execute(insert(User).values(
+            id=user_id,
+            phone_number="+995500000001",
+            personal_id_hash="refresh-1",
+            role=UserRole.GEDER,
+            status=UserStatus.ACTIVE,
+        ))
+        await db.commit()
+    return user_id
+
+
+async def _login(session_factory, user_id: uuid.UUID) -> refresh_tokens.IssuedTokens:
+    async with session_factory() as db:
+        tokens = await refresh_tokens.issue(db, user_id)
+        await db.commit()
+    return tokens
+
+
+async def _revoked(session_factory, family_id: uuid.UUID) -> list[bool]:
+    async with session_factory() as db:
+        result = await db.execute(
+            select(RefreshToken.revoked_at).where(RefreshToken.family_id == family_id)
+        )
+        return [revoked_at is not None for revoked_at in result.scalars()]
+
+
+async def test_reused_refresh_token_revokes_its_family(session_factory):
+    user_id = await _user(session_factory)
+    first = await _login(session_factory, user_id)
+
+    async with session_factory() as db:
+        second = await refresh_tokens.rotate(db, first.refresh_token)
+        await db.commit()
+    assert second.family_id == first.family_id
+
+    # A copy of the rotated token comes back
+    async with session_factory() as db:
+        with pytest.raises(refresh_tokens.RefreshTokenReuseError) as reused:
+            await refresh_tokens.rotate(db, first.refresh_token)
+        await db.commit()
+    assert reused.value.family_id == first.family_id
+    assert await _revoked(session_factory, first.family_id) == [True, True]
+
+    # The legitimate holder's latest token died with the family
+    async with session_factory() as db:
+        with pytest.raises(refresh_tokens.InvalidRefreshTokenError):
+            await refresh_tokens.rotate(db, second.refresh_token)
+
+
+async def test_logout_revokes_one_session_or_all(session_factory):
+    user_id = await _user(session_factory)
+    phone, laptop, tablet = [await _login(session_factory, user_id) for _ in range(3)]
+
+    async with session_factory() as db:
+        assert await refresh_tokens.revoke_family(db, phone.family_id) == [phone.family_id]
+        await db.commit()
+    assert await _revoked(session_factory, phone.family_id) == [True]
+    assert await _revoked(session_factory, laptop.family_id) == [False]
+
+    async with session_factory() as db:
+        with pytest.raises(refresh_tokens.InvalidRefreshTokenError):
+            await refresh_tokens.rotate(db, phone.refresh_token)
+        laptop = await refresh_tokens.rotate(db, laptop.refresh_token)
+        await db.commit()
+
+    async with session_factory() as db:
+        families = await refresh_tokens.revoke_user(db, user_id)
+        await db.commit()
+    # Only the sessions still live are reported
+    assert sorted(families) == sorted([laptop.family_id, tablet.family_id])
+    for tokens in (laptop, tablet):
+        assert all(await _revoked(session_factory, tokens.family_id))
+
+
+async def test_revocation_index_rejects_revoked_family_without_database(
+    session_factory, monkeypatch
+):
+    user_id = await _user(session_factory)
+    kept, revoked = [await _login(session_factory, user_id) for _ in range(2)]
+    async with session_factory() as db:
+        families = await refresh_tokens.revoke_family(db, revoked.family_id)
+        await db.commit()
+
+    # Another worker hears of it over pub/sub
+    pubsub = InMemoryPubSub()
+    index, peer = RevocationIndex(pubsub), RevocationIndex(pubsub)
+    listener = asyncio.create_task(peer._listen())
+    await asyncio.sleep(0)
+    await index.revoke(families, datetime.now(timezone.utc))
+    listener.cancel()
+    assert peer.is_revoked(str(revoked.family_id))
+
+    # A worker that missed the broadcast catches up from the database
+    restarted = RevocationIndex(InMemoryPubSub())
+    async with session_factory() as db:
+        assert await restarted.load(db) == 1
+    assert restarted.is_revoked(str(revoked.family_id))
+    assert not restarted.is_revoked(str(kept.family_id))
+
+    # No session: any query would fail, so both outcomes come from memory
+    monkeypatch.setattr(dependencies, "revocations", restarted)
+    await cache_principal(Principal(user_id, UserRole.GEDER, UserStatus.ACTIVE, None, None))
+    with pytest.raises(HTTPException) as rejected:
+        await dependencies.authenticate(None, revoked.access_token)
+    assert rejected.value.detail == "Token has been revoked"
+    assert (await dependencies.authenticate(None, kept.access_token)).id == user_id